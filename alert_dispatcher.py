@@ -0,0 +1,277 @@
+"""Alert dispatcher for the College Internship Tracker.
+
+Long-running worker that drains due reminders from the Alerts table (the
+"external cron job" the schema's is_sent column was waiting for). Each
+worker thread repeatedly claims a batch of due alerts with
+SELECT ... FOR UPDATE SKIP LOCKED, hands them to a sender, and marks the
+whole batch sent with one UPDATE in the same transaction. If sending fails
+the transaction rolls back and the batch is retried on a later poll, so
+several workers or processes can run side by side without double-claiming.
+
+Usage:
+    python alert_dispatcher.py [--batch-size 200] [--workers 4] [--sender file:alerts_outbox.jsonl]
+    python alert_dispatcher.py --once        # drain what is due now and exit (status 1 if a batch fails)
+
+Requires MySQL 8.0+ or MariaDB 10.6+ for SKIP LOCKED.
+"""
+import argparse
+import importlib
+import json
+import logging
+import os
+import signal
+import smtplib
+import sys
+import threading
+import time
+from datetime import date
+from email.message import EmailMessage
+
+from mysql.connector import Error
+
+from db import pooled_connection
+
+logger = logging.getLogger('alert_dispatcher')
+
+# Uses the (is_sent, reminder_date) index; only Alerts rows are locked
+CLAIM_DUE_ALERTS = """
+    SELECT alert_id, student_id, application_id, alert_type, alert_date, reminder_date, message
+    FROM Alerts
+    WHERE reminder_date <= CURDATE() AND is_sent = FALSE
+    ORDER BY reminder_date, alert_id
+    LIMIT %s
+    FOR UPDATE SKIP LOCKED
+"""
+
+
+# Senders
+class FileSender:
+    """Appends alerts as JSON lines to a local outbox file (stand-in for tests and development).
+
+    Deliveries are keyed on (alert_id, reminder_date), so a batch that is
+    retried after a crash between sending and committing is not written twice.
+    A rescheduled alert (new reminder_date) is delivered again, as intended.
+    """
+
+    def __init__(self, path='alerts_outbox.jsonl'):
+        self.path = path
+        self._lock = threading.Lock()
+        self._delivered = set()
+        if os.path.exists(path):
+            with open(path) as outbox:
+                for line in outbox:
+                    record = json.loads(line)
+                    self._delivered.add((record['alert_id'], record['reminder_date']))
+
+    def send(self, alerts):
+        with self._lock:
+            with open(self.path, 'a') as outbox:
+                for alert in alerts:
+                    key = (alert['alert_id'], str(alert['reminder_date']))
+                    if key in self._delivered:
+                        continue
+                    outbox.write(json.dumps(alert, default=str) + '\n')
+                    self._delivered.add(key)
+
+
+class SmtpSender:
+    """Sends one email per alert through an SMTP relay configured by SMTP_* environment variables"""
+
+    def __init__(self, host=None, port=None):
+        self.host = host or os.getenv('SMTP_HOST', 'localhost')
+        self.port = int(port or os.getenv('SMTP_PORT', '25'))
+        self.user = os.getenv('SMTP_USER')
+        self.password = os.getenv('SMTP_PASSWORD')
+        self.sender = os.getenv('SMTP_FROM', 'internships@college.edu')
+
+    def send(self, alerts):
+        with smtplib.SMTP(self.host, self.port) as smtp:
+            if self.user:
+                smtp.starttls()
+                smtp.login(self.user, self.password)
+            for alert in alerts:
+                message = EmailMessage()
+                message['From'] = self.sender
+                message['To'] = alert['email']
+                message['Subject'] = alert['message']
+                # Lets receiving systems drop duplicates if a batch is retried
+                message['Message-ID'] = f"<alert-{alert['alert_id']}-{alert['reminder_date']}@internship-tracker>"
+                message.set_content(
+                    f"Hi {alert['name']},\n\n{alert['message']} on {alert['alert_date']}.\n"
+                )
+                smtp.send_message(message)
+
+
+SENDERS = {'file': FileSender, 'smtp': SmtpSender}
+
+
+def load_sender(spec):
+    """Build a sender from 'file[:path]', 'smtp[:host]' or 'package.module:ClassName'"""
+    name, _, arg = spec.partition(':')
+    if name in SENDERS:
+        return SENDERS[name](arg) if arg else SENDERS[name]()
+    module = importlib.import_module(name)
+    return getattr(module, arg)()
+
+
+# Metrics
+class DispatchMetrics:
+    """Throughput and lag counters shared by all worker threads"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.monotonic()
+        self.sent = 0
+        self.batches = 0
+        self.failed_batches = 0
+        self.max_lag_days = 0
+
+    def record_batch(self, alerts):
+        today = date.today()
+        with self._lock:
+            self.sent += len(alerts)
+            self.batches += 1
+            lag = max((today - alert['reminder_date']).days for alert in alerts)
+            self.max_lag_days = max(self.max_lag_days, lag)
+
+    def record_failure(self):
+        with self._lock:
+            self.failed_batches += 1
+
+    def snapshot(self):
+        with self._lock:
+            elapsed = time.monotonic() - self.started
+            return {
+                'sent': self.sent,
+                'batches': self.batches,
+                'failed_batches': self.failed_batches,
+                'alerts_per_sec': self.sent / elapsed if elapsed > 0 else 0.0,
+                'max_lag_days': self.max_lag_days,
+            }
+
+
+def pending_backlog():
+    """Number of due, unsent alerts and the oldest reminder_date among them"""
+    with pooled_connection() as connection:
+        cursor = connection.cursor()
+        try:
+            cursor.execute("""
+                SELECT COUNT(*), MIN(reminder_date) FROM Alerts
+                WHERE reminder_date <= CURDATE() AND is_sent = FALSE
+            """)
+            count, oldest = cursor.fetchone()
+        finally:
+            cursor.close()
+    return count, oldest
+
+
+def dispatch_batch(sender, batch_size, metrics):
+    """Claim, send and mark one batch. Returns the number of alerts sent."""
+    with pooled_connection() as connection:
+        cursor = connection.cursor(dictionary=True)
+        try:
+            cursor.execute(CLAIM_DUE_ALERTS, (batch_size,))
+            alerts = cursor.fetchall()
+            if not alerts:
+                connection.rollback()
+                return 0
+
+            # Recipient details, read without locking Users
+            student_ids = sorted({alert['student_id'] for alert in alerts})
+            placeholders = ', '.join(['%s'] * len(student_ids))
+            cursor.execute(f"SELECT user_id, name, email FROM Users WHERE user_id IN ({placeholders})", student_ids)
+            recipients = {row['user_id']: row for row in cursor.fetchall()}
+            for alert in alerts:
+                recipient = recipients.get(alert['student_id'], {})
+                alert['name'] = recipient.get('name')
+                alert['email'] = recipient.get('email')
+
+            sender.send(alerts)
+
+            ids = [alert['alert_id'] for alert in alerts]
+            placeholders = ', '.join(['%s'] * len(ids))
+            cursor.execute(f"UPDATE Alerts SET is_sent = TRUE WHERE alert_id IN ({placeholders})", ids)
+            connection.commit()
+        except Exception:
+            # Releases the row locks; the batch is claimed again on a later poll
+            connection.rollback()
+            metrics.record_failure()
+            raise
+        finally:
+            cursor.close()
+
+    metrics.record_batch(alerts)
+    return len(alerts)
+
+
+def worker(sender, batch_size, poll_interval, retry_delay, metrics, stop, once, failed):
+    while not stop.is_set():
+        try:
+            sent = dispatch_batch(sender, batch_size, metrics)
+        except Exception as e:
+            if once:
+                # A one-shot run gives up on the first failure so cron sees it instead of a job that never exits
+                logger.error(f"Batch failed: {e}")
+                failed.set()
+                stop.set()
+                return
+            logger.warning(f"Batch failed, retrying in {retry_delay:.0f}s: {e}")
+            stop.wait(retry_delay)
+            continue
+        if sent == 0:
+            if once:
+                return
+            stop.wait(poll_interval)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Send due alerts from the Alerts table")
+    parser.add_argument('--batch-size', type=int, default=int(os.getenv('ALERT_BATCH_SIZE', '200')))
+    parser.add_argument('--workers', type=int, default=int(os.getenv('ALERT_WORKERS', '2')))
+    parser.add_argument('--sender', default=os.getenv('ALERT_SENDER', 'file'))
+    parser.add_argument('--poll-interval', type=float, default=30.0, help="seconds to sleep when nothing is due")
+    parser.add_argument('--retry-delay', type=float, default=10.0, help="seconds to wait after a failed batch")
+    parser.add_argument('--metrics-interval', type=float, default=60.0)
+    parser.add_argument('--once', action='store_true',
+                        help="drain the current backlog and exit; a failed batch is not retried and exits with status 1")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(name)s %(levelname)s %(message)s')
+
+    sender = load_sender(args.sender)
+    metrics = DispatchMetrics()
+    stop = threading.Event()
+    failed = threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+
+    threads = [
+        threading.Thread(
+            target=worker,
+            args=(sender, args.batch_size, args.poll_interval, args.retry_delay, metrics, stop, args.once, failed),
+            name=f"dispatcher-{i}",
+            daemon=True,
+        )
+        for i in range(args.workers)
+    ]
+    for thread in threads:
+        thread.start()
+
+    while any(thread.is_alive() for thread in threads):
+        for thread in threads:
+            thread.join(timeout=args.metrics_interval / len(threads))
+        stats = metrics.snapshot()
+        try:
+            backlog, oldest = pending_backlog()
+        except Error as e:
+            backlog, oldest = '?', f"unknown ({e})"
+        logger.info(
+            f"sent={stats['sent']} batches={stats['batches']} failed={stats['failed_batches']} "
+            f"rate={stats['alerts_per_sec']:.1f}/s max_lag={stats['max_lag_days']}d "
+            f"backlog={backlog} oldest_due={oldest}"
+        )
+    return 1 if failed.is_set() else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,399 @@
+"""JSON HTTP API for the College Internship Tracker.
+
+A small ASGI (Starlette) service for mobile clients and integrations such as
+the placement cell's portal. It serves the same operations as the Streamlit
+dashboards by calling the same functions in queries.py, so pooling, caching,
+replica routing and query instrumentation behave exactly as in the UI.
+The data functions block, so each request runs them in Starlette's thread
+pool while the event loop keeps accepting connections.
+
+Clients exchange their login for a bearer token at POST /auth/token and send
+it as `Authorization: Bearer <token>`. List endpoints return an ETag and
+answer a matching If-None-Match with 304 Not Modified; the calendar feed also
+honours If-Modified-Since and is served from a rendered-feed cache, so repeat
+polls do no database work.
+
+Usage:
+    python api.py [--host 127.0.0.1] [--port 8000] [--workers 1]
+    uvicorn api:app --port 8000
+
+Endpoints:
+    POST /auth/token                         {"email", "password"} -> {"token", "expires_at", "user"}
+    GET  /jobs                               student feed page (?company, role, status, deadline_within,
+                                             after_deadline, after_id)
+    GET  /deadlines                          student's upcoming deadlines
+    POST /jobs/{job_id}/apply                apply to a job
+    GET  /applications/{application_id}/notes  an application's notes, newest first (?before_created_at,
+                                             before_id)
+    POST /applications/{application_id}/notes {"text"} add a note to one of the student's applications
+    GET  /faculty/jobs                       every posting with application counts (faculty, admin)
+    GET  /analytics                          analytics datasets (faculty, admin; ?include_archived=1)
+    GET  /calendar/link                      subscription URL for the caller's calendar feed
+    GET  /calendar.ics                       iCalendar feed: a student's alerts, or every posting's dates
+                                             for faculty and admin (?token= from /calendar/link)
+"""
+import argparse
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import os
+import secrets
+import sys
+import time
+from contextlib import asynccontextmanager
+from datetime import date, datetime
+from decimal import Decimal
+from email.utils import format_datetime, parsedate_to_datetime
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from mysql.connector import errorcode, errors
+
+from db import set_error_reporter, set_session, last_error, CONNECTION_ERRORS
+from queries import (
+    FEED_STATUS_FILTERS, find_user, student_owns_application, get_available_jobs, get_upcoming_deadlines,
+    apply_to_job, add_note, get_application_notes, get_all_jobs, get_analytics_data, get_student_calendar, get_faculty_calendar
+)
+
+logger = logging.getLogger('api')
+
+# Tokens are signed with API_SECRET; without it a per-process secret is used and tokens die with the process
+API_SECRET = os.getenv('API_SECRET', '').encode() or secrets.token_bytes(32)
+API_TOKEN_TTL = int(os.getenv('API_TOKEN_TTL', str(12 * 3600)))
+# Calendar subscription tokens ride in the feed URL and only open the calendar feed
+CALENDAR_TOKEN_TTL = int(os.getenv('CALENDAR_TOKEN_TTL', str(365 * 24 * 3600)))
+
+STUDENT_ROLES = ('student',)
+STAFF_ROLES = ('faculty', 'admin')
+
+
+class ApiError(Exception):
+    """Raised inside a handler to answer with an error status and message"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+# Tokens: base64url(JSON claims) + '.' + base64url(HMAC-SHA256 of the claims)
+def _b64encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode()
+
+
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+
+
+def issue_token(user, scope='api', ttl=API_TOKEN_TTL):
+    """Signed token for a row from find_user (or token claims), valid for `ttl` seconds in `scope`"""
+    claims = {'sub': user.get('user_id', user.get('sub')), 'role': user['role'], 'name': user['name'],
+              'scope': scope, 'exp': int(time.time()) + ttl}
+    payload = _b64encode(json.dumps(claims, separators=(',', ':')).encode())
+    signature = _b64encode(hmac.new(API_SECRET, payload.encode(), hashlib.sha256).digest())
+    return f"{payload}.{signature}", claims
+
+
+def verify_token(token):
+    """Claims of a valid, unexpired token, or None"""
+    payload, _, signature = token.partition('.')
+    expected = _b64encode(hmac.new(API_SECRET, payload.encode(), hashlib.sha256).digest())
+    if not signature or not hmac.compare_digest(signature, expected):
+        return None
+    try:
+        claims = json.loads(_b64decode(payload))
+    except ValueError:
+        return None
+    if claims.get('exp', 0) < time.time():
+        return None
+    return claims
+
+
+def authenticate(request, roles, scopes=('api',)):
+    """Claims for the request's token; raises ApiError unless it has one of `scopes` and the user one of `roles`.
+
+    The token comes from the Authorization header or, for the calendar feed, the `token` query parameter.
+    """
+    scheme, _, token = request.headers.get('authorization', '').partition(' ')
+    if scheme.lower() != 'bearer':
+        token = request.query_params.get('token', '') if 'calendar' in scopes else ''
+    claims = verify_token(token.strip())
+    if claims is None or claims.get('scope', 'api') not in scopes:
+        raise ApiError(401, "missing or invalid bearer token")
+    if claims['role'] not in roles:
+        raise ApiError(403, f"this endpoint is for {' or '.join(roles)} accounts")
+    # Per-user session id, so a client's reads after its own writes are served by the primary
+    set_session(f"api-user-{claims['sub']}")
+    return claims
+
+
+# Responses
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def json_response(data, status=200):
+    return Response(json.dumps(data, default=_json_default), status_code=status, media_type='application/json')
+
+
+def cached_json_response(request, data):
+    """JSON response with an ETag; answers 304 when the client already holds this body"""
+    body = json.dumps(data, default=_json_default, sort_keys=True).encode()
+    etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+    if_none_match = request.headers.get('if-none-match', '')
+    if if_none_match.strip() == '*' or etag in [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]:
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type='application/json', headers=headers)
+
+
+async def run_query(function, *args):
+    """Call a query function in the threadpool; returns (result, the database error if it failed)"""
+    def call():
+        return function(*args), last_error()
+    return await run_in_threadpool(call)
+
+
+def database_error(error, not_found="not found", conflict="already exists"):
+    """ApiError for a failed query: 4xx when the database rejected the request, 503 only when it is unreachable"""
+    if error is None or isinstance(error, (errors.PoolError,) + CONNECTION_ERRORS):
+        return ApiError(503, "database unavailable")
+    if isinstance(error, errors.IntegrityError):
+        if error.errno in (errorcode.ER_NO_REFERENCED_ROW, errorcode.ER_NO_REFERENCED_ROW_2):
+            return ApiError(404, not_found)
+        return ApiError(409, conflict)
+    if error.sqlstate == '45000':
+        # SIGNALled by a stored procedure or trigger rule
+        return ApiError(400, error.msg)
+    return ApiError(500, "database error")
+
+
+async def read_json(request):
+    try:
+        body = await request.json()
+    except ValueError:
+        raise ApiError(400, "request body must be JSON")
+    if not isinstance(body, dict):
+        raise ApiError(400, "request body must be a JSON object")
+    return body
+
+
+def int_param(request, name, default=None):
+    value = request.query_params.get(name)
+    if value is None or value == '':
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ApiError(400, f"{name} must be an integer")
+
+
+# Handlers
+async def create_token(request):
+    body = await read_json(request)
+    if not body.get('email') or not body.get('password'):
+        raise ApiError(400, "email and password are required")
+    users, error = await run_query(find_user, body['email'], body['password'])
+    if users is None:
+        raise database_error(error)
+    if not users:
+        raise ApiError(401, "invalid email or password")
+    token, claims = issue_token(users[0])
+    user = {key: users[0][key] for key in ('user_id', 'name', 'email', 'role')}
+    return json_response({'token': token, 'expires_at': claims['exp'], 'user': user})
+
+
+async def list_jobs(request):
+    claims = authenticate(request, STUDENT_ROLES)
+    status = request.query_params.get('status', 'All')
+    if status not in FEED_STATUS_FILTERS:
+        raise ApiError(400, f"status must be one of: {', '.join(FEED_STATUS_FILTERS)}")
+    filters = {
+        'company': request.query_params.get('company', '').strip(),
+        'role': request.query_params.get('role', '').strip(),
+        'status': status,
+        'deadline_within': int_param(request, 'deadline_within'),
+    }
+    after = None
+    if request.query_params.get('after_deadline'):
+        try:
+            after = (date.fromisoformat(request.query_params['after_deadline']), int_param(request, 'after_id', 0))
+        except ValueError:
+            raise ApiError(400, "after_deadline must be a YYYY-MM-DD date")
+
+    (jobs, next_cursor), error = await run_query(get_available_jobs, claims['sub'], filters, after)
+    if jobs is None:
+        raise database_error(error)
+    if next_cursor is not None:
+        next_cursor = {'after_deadline': next_cursor[0], 'after_id': next_cursor[1]}
+    return cached_json_response(request, {'jobs': jobs, 'next': next_cursor})
+
+
+async def list_deadlines(request):
+    claims = authenticate(request, STUDENT_ROLES)
+    deadlines, error = await run_query(get_upcoming_deadlines, claims['sub'])
+    if deadlines is None:
+        raise database_error(error)
+    return cached_json_response(request, {'deadlines': deadlines})
+
+
+async def apply(request):
+    claims = authenticate(request, STUDENT_ROLES)
+    job_id = request.path_params['job_id']
+    applied, error = await run_query(apply_to_job, claims['sub'], job_id)
+    if not applied:
+        raise database_error(error, not_found="no such job", conflict="already applied to this job")
+    return json_response({'job_id': job_id, 'status': 'applied'})
+
+
+async def create_note(request):
+    claims = authenticate(request, STUDENT_ROLES)
+    application_id = request.path_params['application_id']
+    body = await read_json(request)
+    text = str(body.get('text', '')).strip()
+    if not text:
+        raise ApiError(400, "text is required")
+
+    owned, error = await run_query(student_owns_application, claims['sub'], application_id)
+    if owned is None:
+        raise database_error(error)
+    if not owned:
+        raise ApiError(404, "no such application")
+    folder_id, error = await run_query(add_note, application_id, claims['sub'], text)
+    if not folder_id:
+        raise database_error(error, not_found="no such application")
+    return json_response({'application_id': application_id, 'folder_id': folder_id, 'text': text}, status=201)
+
+
+async def list_notes(request):
+    claims = authenticate(request, STUDENT_ROLES)
+    application_id = request.path_params['application_id']
+    before = None
+    if request.query_params.get('before_created_at'):
+        try:
+            before = (datetime.fromisoformat(request.query_params['before_created_at']),
+                      int_param(request, 'before_id', 0))
+        except ValueError:
+            raise ApiError(400, "before_created_at must be an ISO 8601 timestamp")
+
+    # Only the caller's notes are read, so another student's application simply has none
+    (notes, next_cursor), error = await run_query(get_application_notes, application_id, claims['sub'], before)
+    if notes is None:
+        raise database_error(error)
+    if next_cursor is not None:
+        next_cursor = {'before_created_at': next_cursor[0], 'before_id': next_cursor[1]}
+    return cached_json_response(request, {'notes': notes, 'next': next_cursor})
+
+
+async def list_all_jobs(request):
+    authenticate(request, STAFF_ROLES)
+    jobs, error = await run_query(get_all_jobs)
+    if jobs is None:
+        raise database_error(error)
+    return cached_json_response(request, {'jobs': jobs})
+
+
+async def analytics(request):
+    claims = authenticate(request, STAFF_ROLES)
+    include_archived = request.query_params.get('include_archived', '') in ('1', 'true')
+    data = await run_in_threadpool(get_analytics_data, claims['sub'], include_archived)
+    # Each dataset is its own concurrent query; one that failed or timed out comes back as None
+    failed = [name for name, rows in data.items() if rows is None]
+    if failed:
+        raise ApiError(500, f"analytics queries failed: {', '.join(failed)}")
+    return cached_json_response(request, data)
+
+
+def calendar_response(request, feed):
+    """text/calendar response with ETag and Last-Modified; 304 when the client's copy is current"""
+    headers = {'ETag': feed['etag'], 'Last-Modified': format_datetime(feed['last_modified'], usegmt=True),
+               'Cache-Control': 'private, no-cache'}
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match is not None:
+        current = if_none_match.strip() == '*' or feed['etag'] in [
+            tag.strip().removeprefix('W/') for tag in if_none_match.split(',')
+        ]
+    else:
+        try:
+            current = parsedate_to_datetime(request.headers['if-modified-since']) >= feed['last_modified']
+        except (KeyError, TypeError, ValueError):
+            current = False
+    if current:
+        return Response(status_code=304, headers=headers)
+    return Response(feed['body'], media_type='text/calendar; charset=utf-8', headers=headers)
+
+
+async def calendar_link(request):
+    claims = authenticate(request, STUDENT_ROLES + STAFF_ROLES)
+    token, _ = issue_token(claims, scope='calendar', ttl=CALENDAR_TOKEN_TTL)
+    return json_response({'url': str(request.url_for('calendar_feed').include_query_params(token=token))})
+
+
+async def calendar_feed(request):
+    claims = authenticate(request, STUDENT_ROLES + STAFF_ROLES, scopes=('api', 'calendar'))
+    if claims['role'] in STUDENT_ROLES:
+        feed, error = await run_query(get_student_calendar, claims['sub'])
+    else:
+        feed, error = await run_query(get_faculty_calendar)
+    if feed is None:
+        raise database_error(error)
+    return calendar_response(request, feed)
+
+
+async def api_error(request, exc):
+    return JSONResponse({'error': exc.message}, status_code=exc.status)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # Database errors are logged here; handlers turn failed results into error statuses (database_error)
+    set_error_reporter(logger.error)
+    yield
+
+
+app = Starlette(
+    routes=[
+        Route('/auth/token', create_token, methods=['POST']),
+        Route('/jobs', list_jobs),
+        Route('/deadlines', list_deadlines),
+        Route('/jobs/{job_id:int}/apply', apply, methods=['POST']),
+        Route('/applications/{application_id:int}/notes', list_notes, methods=['GET']),
+        Route('/applications/{application_id:int}/notes', create_note, methods=['POST']),
+        Route('/faculty/jobs', list_all_jobs),
+        Route('/analytics', analytics),
+        Route('/calendar/link', calendar_link),
+        Route('/calendar.ics', calendar_feed, name='calendar_feed'),
+    ],
+    exception_handlers={ApiError: api_error},
+    lifespan=lifespan,
+)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="College Internship Tracker JSON API")
+    parser.add_argument('--host', default=os.getenv('API_HOST', '127.0.0.1'))
+    parser.add_argument('--port', type=int, default=int(os.getenv('API_PORT', '8000')))
+    parser.add_argument('--workers', type=int, default=1, help="worker processes (each has its own pool)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(name)s %(levelname)s %(message)s')
+    if not os.getenv('API_SECRET'):
+        if args.workers > 1:
+            parser.error("set API_SECRET when running several workers, so they accept each other's tokens")
+        logger.warning("API_SECRET is not set: tokens are signed with a per-process key")
+    uvicorn.run('api:app' if args.workers > 1 else app, host=args.host, port=args.port, workers=args.workers)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
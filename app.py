@@ -1,14 +1,25 @@
 import streamlit as st
-import mysql.connector
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 from mysql.connector import Error
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import plotly.express as px
 import plotly.graph_objects as go
 import os
-from dotenv import load_dotenv
-
-load_dotenv()
+import json
+import logging
+from db import (
+    get_server_info, pool_stats, set_error_reporter, set_session, cache_stats, replica_stats,
+    query_summary, slow_queries, reset_query_stats, SLOW_QUERY_MS, QUERY_LOG_PATH
+)
+from migrations import migrate
+from queries import (
+    FEED_STATUS_FILTERS, FEED_DEADLINE_WINDOWS, JOBS_PAGE_SIZE, SEARCH_MODES, DELTA_SYNC, find_user,
+    load_student_dashboard, sync_student_dashboard, search_jobs, boolean_search_error, set_application_statuses, apply_to_job, ignore_job, mark_as_done, add_note,
+    get_note_folders, get_application_notes, get_folder_notes, get_all_jobs, sync_all_jobs, get_job_funnel, create_job_posting, update_job_posting, delete_job_posting,
+    read_job_import_file, validate_job_import, import_job_postings, EXPORTS, EXPORT_FORMATS, export_to_file,
+    iter_analytics_data, get_student_calendar, get_faculty_calendar
+)
 
 # Page configuration
 st.set_page_config(
@@ -42,35 +53,42 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
-# Database Configuration - EDIT THESE VALUES
-DB_CONFIG = {
-    'host': os.getenv('DB_HOST'),
-    'database': os.getenv('DB_NAME'),
-    'user': os.getenv('DB_USER'),
-    'password': os.getenv('DB_PASSWORD')
-}
+# Surface data-access errors in the UI
+def show_db_error(message):
+    # Queries run on worker threads have no script context to draw into; db.py still logs them
+    if get_script_run_ctx(suppress_warning=True) is not None:
+        st.error(message)
 
-# Database connection function
-@st.cache_resource
+set_error_reporter(show_db_error)
+
+# Tie this run's queries to the browser session, so its reads see its own writes
+set_session(get_script_run_ctx().session_id)
+
+# Database connection check
 def get_database_connection():
-    """Create and return a database connection"""
+    """Check that the database is reachable and return the server version"""
     try:
-        connection = mysql.connector.connect(**DB_CONFIG)
-        if connection.is_connected():
-            db_info = connection.get_server_info()
-            st.sidebar.success(f"✅ Connected to MySQL Server {db_info}")
-            return connection
+        db_info = get_server_info()
+        st.sidebar.success(f"✅ Connected to MySQL Server {db_info}")
+        return db_info
     except Error as e:
         st.error(f"❌ Error connecting to MySQL Database: {e}")
         st.info("""
         **Troubleshooting Tips:**
         1. Make sure MySQL is running
-        2. Check your password in the DB_CONFIG (line 47)
+        2. Check your password in the `.env` file
         3. Verify database name: `college_internship_tracker`
         4. Run: `mysql -u root -p` in terminal to test connection
         """)
         return None
 
+# Schema migrations run once per server process (set AUTO_MIGRATE=0 to manage them from the CLI)
+@st.cache_resource
+def apply_schema_migrations():
+    """Apply pending schema migrations and return the versions applied"""
+    # Progress goes to the server log, not the Streamlit process's stdout
+    return migrate(log=logging.getLogger('migrations').info)
+
 # Initialize session state
 if 'logged_in' not in st.session_state:
     st.session_state.logged_in = False
@@ -81,53 +99,13 @@ if 'user_role' not in st.session_state:
 if 'user_name' not in st.session_state:
     st.session_state.user_name = None
 
-# Database query functions
-def execute_query(query, params=None, fetch=True):
-    """Execute a query and return results"""
-    connection = get_database_connection()
-    if connection is None:
-        return None
-    
-    try:
-        cursor = connection.cursor(dictionary=True)
-        cursor.execute(query, params or ())
-        
-        if fetch:
-            result = cursor.fetchall()
-            cursor.close()
-            return result
-        else:
-            connection.commit()
-            cursor.close()
-            return True
-    except Error as e:
-        st.error(f"Database query error: {e}")
-        return None
-
-def call_procedure(proc_name, params):
-    """Call a stored procedure"""
-    connection = get_database_connection()
-    if connection is None:
-        return False
-    
-    try:
-        cursor = connection.cursor()
-        cursor.callproc(proc_name, params)
-        connection.commit()
-        cursor.close()
-        return True
-    except Error as e:
-        st.error(f"Procedure error: {e}")
-        return False
-
 # Authentication functions
 def login_user(email, password):
     """Authenticate user"""
     # Debug: Check what we're searching for
     st.write(f"DEBUG - Searching for email: '{email}' with password: '{password}'")
     
-    query = "SELECT user_id, name, email, role FROM Users WHERE email = %s AND password_hash = %s"
-    result = execute_query(query, (email, password))
+    result = find_user(email, password)
     
     # Debug: Show query result
     st.write(f"DEBUG - Query returned {len(result) if result else 0} results")
@@ -153,181 +131,16 @@ def logout_user():
     st.session_state.user_id = None
     st.session_state.user_role = None
     st.session_state.user_name = None
-
-# Student Dashboard Functions
-def get_student_stats(student_id):
-    """Get statistics for student dashboard"""
-    stats = {
-        'total_jobs': 0,
-        'applied': 0,
-        'done': 0,
-        'to_apply': 0
-    }
-    
-    # Total available jobs
-    query = "SELECT COUNT(*) as count FROM Job_Postings WHERE deadline_date >= CURDATE()"
-    result = execute_query(query)
-    if result:
-        stats['total_jobs'] = result[0]['count']
-    
-    # Student applications by status
-    query = """
-        SELECT status, COUNT(*) as count 
-        FROM Applications 
-        WHERE student_id = %s 
-        GROUP BY status
-    """
-    result = execute_query(query, (student_id,))
-    if result:
-        for row in result:
-            stats[row['status']] = row['count']
-    
-    return stats
-
-def get_upcoming_deadlines(student_id):
-    """Get upcoming deadlines for student"""
-    query = """
-        SELECT 
-            a.application_id,
-            j.company_name,
-            j.role,
-            j.deadline_date,
-            j.oa_date,
-            j.interview_date,
-            a.status,
-            DATEDIFF(j.deadline_date, CURDATE()) as days_until
-        FROM Applications a
-        JOIN Job_Postings j ON a.job_id = j.job_id
-        WHERE a.student_id = %s 
-        AND a.status IN ('applied', 'to_apply')
-        AND j.deadline_date >= CURDATE()
-        ORDER BY j.deadline_date ASC
-    """
-    return execute_query(query, (student_id,))
-
-def get_available_jobs(student_id):
-    """Get all available jobs with application status"""
-    query = """
-        SELECT 
-            j.*,
-            a.application_id,
-            a.status as app_status,
-            a.applied_on,
-            COALESCE(
-                (SELECT note_text FROM Notes 
-                 WHERE application_id = a.application_id 
-                 ORDER BY created_at DESC LIMIT 1), 
-                ''
-            ) as latest_note
-        FROM Job_Postings j
-        LEFT JOIN Applications a ON j.job_id = a.job_id AND a.student_id = %s
-        WHERE j.deadline_date >= CURDATE()
-        ORDER BY j.deadline_date ASC
-    """
-    return execute_query(query, (student_id,))
-
-def apply_to_job(student_id, job_id):
-    """Apply to a job"""
-    return call_procedure('Set_Application_Status', [student_id, job_id, 'applied'])
-
-def ignore_job(student_id, job_id):
-    """Ignore a job"""
-    return call_procedure('Set_Application_Status', [student_id, job_id, 'ignored'])
-
-def mark_as_done(student_id, job_id):
-    """Mark application as done"""
-    return call_procedure('Set_Application_Status', [student_id, job_id, 'done'])
-
-def add_note(application_id, student_id, note_text):
-    """Add a note to an application"""
-    # Get or create a default folder
-    query = "SELECT folder_id FROM Note_Folders WHERE student_id = %s LIMIT 1"
-    result = execute_query(query, (student_id,))
-    
-    if not result:
-        # Create default folder
-        query = "INSERT INTO Note_Folders (student_id, folder_name) VALUES (%s, 'General Notes')"
-        execute_query(query, (student_id,), fetch=False)
-        query = "SELECT folder_id FROM Note_Folders WHERE student_id = %s LIMIT 1"
-        result = execute_query(query, (student_id,))
-    
-    folder_id = result[0]['folder_id']
-    
-    query = "INSERT INTO Notes (application_id, student_id, folder_id, note_text) VALUES (%s, %s, %s, %s)"
-    return execute_query(query, (application_id, student_id, folder_id, note_text), fetch=False)
-
-# Faculty Dashboard Functions
-def get_all_jobs():
-    """Get all job postings"""
-    query = """
-        SELECT 
-            j.*,
-            u.name as posted_by_name,
-            (SELECT COUNT(*) FROM Applications WHERE job_id = j.job_id) as total_apps
-        FROM Job_Postings j
-        LEFT JOIN Users u ON j.posted_by = u.user_id
-        ORDER BY j.deadline_date DESC
-    """
-    return execute_query(query)
-
-def create_job_posting(company_name, role, description, jd_link, deadline, oa_date, interview_date, posted_by):
-    """Create a new job posting"""
-    return call_procedure('Create_Job_Posting', [
-        company_name, role, description, jd_link, deadline, oa_date, interview_date, posted_by
-    ])
-
-def update_job_posting(job_id, company_name, role, description, jd_link, deadline, oa_date, interview_date):
-    """Update an existing job posting"""
-    query = """
-        UPDATE Job_Postings 
-        SET company_name = %s, role = %s, description = %s, jd_link = %s,
-            deadline_date = %s, oa_date = %s, interview_date = %s
-        WHERE job_id = %s
-    """
-    return execute_query(query, (company_name, role, description, jd_link, deadline, oa_date, interview_date, job_id), fetch=False)
-
-def delete_job_posting(job_id):
-    """Delete a job posting"""
-    query = "DELETE FROM Job_Postings WHERE job_id = %s"
-    return execute_query(query, (job_id,), fetch=False)
-
-# Analytics Functions
-def get_analytics_data(user_id):
-    """Get analytics data for faculty/admin"""
-    analytics = {}
-    
-    # Applications by company
-    query = """
-        SELECT j.company_name, COUNT(a.application_id) as app_count
-        FROM Job_Postings j
-        LEFT JOIN Applications a ON j.job_id = a.job_id
-        GROUP BY j.company_name
-        ORDER BY app_count DESC
-        LIMIT 10
-    """
-    analytics['by_company'] = execute_query(query)
-    
-    # Application status distribution
-    query = """
-        SELECT status, COUNT(*) as count
-        FROM Applications
-        GROUP BY status
-    """
-    analytics['by_status'] = execute_query(query)
-    
-    # Timeline data
-    query = """
-        SELECT 
-            DATE_FORMAT(applied_on, '%Y-%m') as month,
-            COUNT(*) as count
-        FROM Applications
-        WHERE applied_on IS NOT NULL
-        GROUP BY DATE_FORMAT(applied_on, '%Y-%m')
-        ORDER BY month
-    """
-    analytics['timeline'] = execute_query(query)
-    
-    return analytics
+    st.session_state.pop('application_sync', None)
+    st.session_state.pop('job_sync', None)
+    st.session_state.pop('pending_card_writes', None)
+    st.session_state.pop('card_errors', None)
+    st.session_state.pop('note_folder_id', None)
+    st.session_state.pop('notes_history', None)
+    
+    export_file = st.session_state.pop('export_file', None)
+    if export_file is not None:
+        export_file.discard()
 
 # Login Page
 def show_login_page():
@@ -375,40 +188,53 @@ USE college_internship_tracker;
 SHOW TABLES;
 SELECT * FROM Users;
 
-# Update password in app.py line 47:
-DB_CONFIG = {
-    'host': 'localhost',
-    'database': 'college_internship_tracker',
-    'user': 'root',
-    'password': 'YOUR_ACTUAL_PASSWORD'
-}
+# Update credentials in the .env file:
+DB_HOST=localhost
+DB_NAME=college_internship_tracker
+DB_USER=root
+DB_PASSWORD=YOUR_ACTUAL_PASSWORD
             """)
 
 # Student Dashboard
-def show_student_dashboard():
-    st.title(f"👨‍🎓 Welcome, {st.session_state.user_name}")
-    
-    # Get statistics
-    stats = get_student_stats(st.session_state.user_id)
-    
-    # Display metrics
-    col1, col2, col3, col4 = st.columns(4)
-    with col1:
-        st.metric("Total Jobs", stats['total_jobs'], delta="Available")
-    with col2:
-        st.metric("Applied", stats['applied'], delta="In Progress")
-    with col3:
-        st.metric("Completed", stats['done'], delta="Success")
-    with col4:
-        st.metric("To Apply", stats['to_apply'], delta="Pending")
-    
-    st.markdown("---")
-    
-    # Upcoming Deadlines
-    st.subheader("📅 Upcoming Deadlines")
-    deadlines = get_upcoming_deadlines(st.session_state.user_id)
-    
-    if deadlines:
+def feed_limit():
+    """How many feed jobs to show: one page, plus one more for every "Load more" click"""
+    return (st.session_state.get('feed_page', 0) + 1) * JOBS_PAGE_SIZE
+
+def load_dashboard(filters):
+    """Stats, deadlines and the feed jobs loaded so far for the student dashboard.
+
+    In delta-sync mode the session keeps its applications between reruns and
+    only fetches what changed. Returns None if the load failed.
+    """
+    if DELTA_SYNC:
+        dashboard = sync_student_dashboard(
+            st.session_state.user_id, st.session_state.get('application_sync'), filters, limit=feed_limit()
+        )
+        if dashboard is not None:
+            st.session_state.application_sync = dashboard['sync']
+        return dashboard
+    return load_student_dashboard(st.session_state.user_id, filters, limit=feed_limit())
+
+def draw_metrics():
+    """(Re)draw the metric row into its placeholder from the session's current stats"""
+    stats = st.session_state.student_stats
+    with st.session_state.student_panels['metrics'].container():
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Total Jobs", stats['total_jobs'], delta="Available")
+        with col2:
+            st.metric("Applied", stats.get('applied', 0), delta="In Progress")
+        with col3:
+            st.metric("Completed", stats.get('done', 0), delta="Success")
+        with col4:
+            st.metric("To Apply", stats.get('to_apply', 0), delta="Pending")
+
+def draw_deadlines():
+    """(Re)draw the upcoming deadline list into its placeholder from the session's current deadlines"""
+    deadlines = st.session_state.student_deadlines
+    with st.session_state.student_panels['deadlines'].container():
+        if not deadlines:
+            st.info("No upcoming deadlines. Apply to jobs to track them!")
         for deadline in deadlines:
             days_left = deadline['days_until']
             color = "🔴" if days_left <= 3 else "🟡" if days_left <= 7 else "🟢"
@@ -421,77 +247,352 @@ def show_student_dashboard():
                 with col2:
                     st.markdown(f"{color} **{days_left} days left**")
                 st.markdown("---")
-    else:
-        st.info("No upcoming deadlines. Apply to jobs to track them!")
+
+@st.fragment
+def deadline_panel(filters):
+    """Upcoming deadlines; Refresh reruns only this panel (and redraws the metrics)"""
+    col1, col2, col3 = st.columns([3, 1, 1])
+    with col1:
+        st.subheader("📅 Upcoming Deadlines")
+    with col2:
+        refresh = st.button("🔄 Refresh", key="refresh_deadlines", use_container_width=True)
+    with col3:
+        # Rendered once and cached until the student's alerts change
+        calendar = get_student_calendar(st.session_state.user_id)
+        if calendar is not None:
+            st.download_button("📅 Calendar", calendar['body'], file_name="internship_deadlines.ics",
+                               mime="text/calendar", use_container_width=True,
+                               help="Deadlines, OAs and interviews as an .ics file for your calendar app")
+    
+    if refresh:
+        dashboard = load_dashboard(filters)
+        if dashboard is not None:
+            st.session_state.student_stats = dashboard['stats']
+            st.session_state.student_deadlines = dashboard['deadlines']
+            draw_metrics()
+    
+    st.session_state.student_panels['deadlines'] = st.empty()
+    draw_deadlines()
+
+# Card actions update the session's copy first and write afterwards, so the card redraws at once
+CARD_WRITES = {'applied': apply_to_job, 'ignored': ignore_job, 'done': mark_as_done}
+
+def _card_state(job):
+    """Copy of everything an optimistic card update touches, for rolling it back"""
+    return dict(job), dict(st.session_state.student_stats), list(st.session_state.student_deadlines)
+
+def _roll_back(job, saved):
+    job.clear()
+    job.update(saved[0])
+    st.session_state.student_stats = saved[1]
+    st.session_state.student_deadlines = saved[2]
+
+def queue_status_change(job_id, status):
+    """Button callback: show the new status on the card, metrics and deadlines, and queue the write"""
+    job = st.session_state.feed_jobs[job_id]
+    saved = _card_state(job)
+    
+    stats = st.session_state.student_stats
+    if job['app_status']:
+        stats[job['app_status']] = stats.get(job['app_status'], 0) - 1
+    stats[status] = stats.get(status, 0) + 1
+    
+    deadlines = [deadline for deadline in st.session_state.student_deadlines if deadline['job_id'] != job_id]
+    days_until = (job['deadline_date'] - date.today()).days
+    if status in ('applied', 'to_apply') and days_until >= 0:
+        deadlines.append({
+            'application_id': job['application_id'], 'job_id': job_id, 'company_name': job['company_name'],
+            'role': job['role'], 'deadline_date': job['deadline_date'], 'oa_date': job['oa_date'],
+            'interview_date': job['interview_date'], 'status': status, 'days_until': days_until,
+        })
+        deadlines.sort(key=lambda deadline: deadline['deadline_date'])
+    st.session_state.student_deadlines = deadlines
+    
+    job['app_status'] = status
+    st.session_state.pending_card_writes[job_id] = (
+        lambda: CARD_WRITES[status](st.session_state.user_id, job_id), saved
+    )
+
+def queue_note(job_id):
+    """Button callback: show the note as the card's latest note and queue the write"""
+    job = st.session_state.feed_jobs[job_id]
+    note = st.session_state.get(f"note_{job['application_id']}", '').strip()
+    if not note:
+        return
+    saved = _card_state(job)
+    job['latest_note'] = note
+    st.session_state[f"note_{job['application_id']}"] = ''
+    st.session_state.pending_card_writes[job_id] = (lambda: save_note(job['application_id'], note), saved)
+
+def save_note(application_id, note):
+    """Write a note under the session's cached default folder, remembering the folder the database used"""
+    folder_id = add_note(application_id, st.session_state.user_id, note, st.session_state.get('note_folder_id'))
+    if folder_id:
+        st.session_state.note_folder_id = folder_id
+        # Loaded history pages no longer start at the newest note
+        st.session_state.pop('notes_history', None)
+    return folder_id
+
+# Notes history pages loaded so far, per (kind, id); older pages are fetched on request
+NOTES_LOADERS = {'application': get_application_notes, 'folder': get_folder_notes}
+
+def load_older_notes(kind, owner_id):
+    """Button callback: append the next page of notes to the loaded history"""
+    history = st.session_state.notes_history[(kind, owner_id)]
+    notes, next_cursor = NOTES_LOADERS[kind](owner_id, st.session_state.user_id, before=history['next'])
+    if notes is not None:
+        history['notes'].extend(notes)
+        history['next'] = next_cursor
+
+def notes_history(kind, owner_id, show_job=False):
+    """Loaded notes newest first, with a button for the next page"""
+    histories = st.session_state.setdefault('notes_history', {})
+    if (kind, owner_id) not in histories:
+        notes, next_cursor = NOTES_LOADERS[kind](owner_id, st.session_state.user_id)
+        if notes is None:
+            return
+        histories[(kind, owner_id)] = {'notes': notes, 'next': next_cursor}
+    history = histories[(kind, owner_id)]
+    
+    if not history['notes']:
+        st.caption("No notes yet.")
+    for note in history['notes']:
+        where = f"{note['company_name']} - {note['role']}" if show_job else note['folder_name']
+        st.caption(f"{note['created_at']} · {where}")
+        st.write(note['note_text'])
+    if history['next'] is not None:
+        st.button("Older notes", key=f"older_{kind}_{owner_id}", on_click=load_older_notes, args=(kind, owner_id))
+
+@st.fragment
+def job_card(job_id):
+    """One feed card; its buttons rerun only this card, not the dashboard"""
+    job = st.session_state.feed_jobs[job_id]
+    
+    col1, col2 = st.columns([3, 1])
+    
+    with col1:
+        st.markdown(f"### {job['company_name']}")
+        st.markdown(f"**{job['role']}**")
+        st.write(job['description'])
+        st.caption(f"⏰ Deadline: {job['deadline_date']} | 📝 OA: {job['oa_date']} | 🎤 Interview: {job['interview_date']}")
+        
+        if job['jd_link']:
+            st.markdown(f"[View Job Description]({job['jd_link']})")
+        
+        # A toggle rather than an expander, so cards only query their history when it is open
+        if job['application_id'] and job['latest_note']:
+            if st.toggle("📚 Notes history", key=f"history_{job['application_id']}"):
+                notes_history('application', job['application_id'])
+    
+    with col2:
+        status = job['app_status']
+        error = st.session_state.card_errors.pop(job_id, None)
+        if error:
+            st.error(error)
+        
+        if status == 'applied':
+            st.success("✅ Applied")
+            st.button("Mark as Done", key=f"done_{job_id}", on_click=queue_status_change, args=(job_id, 'done'))
+            
+            # A brand-new application has no id until the write lands; notes open up on the next run
+            if job['application_id']:
+                with st.expander("Add Note"):
+                    st.text_area("Note", key=f"note_{job['application_id']}")
+                    st.button("Save Note", key=f"save_{job['application_id']}", on_click=queue_note, args=(job_id,))
+            
+            if job['latest_note']:
+                st.info(f"📝 {job['latest_note']}")
+        
+        elif status == 'done':
+            st.success("🎉 Completed")
+        
+        elif status == 'ignored':
+            st.warning("🚫 Ignored")
+        
+        else:
+            st.button("Apply", key=f"apply_{job_id}", use_container_width=True,
+                      on_click=queue_status_change, args=(job_id, 'applied'))
+            st.button("Ignore", key=f"ignore_{job_id}", use_container_width=True,
+                      on_click=queue_status_change, args=(job_id, 'ignored'))
+    
+    st.markdown("---")
+    
+    # On a card rerun the optimistic state is already on screen; now write it, and undo it if the write fails
+    pending = st.session_state.pending_card_writes.pop(job_id, None)
+    if pending:
+        write, saved = pending
+        draw_metrics()
+        draw_deadlines()
+        with st.spinner("Saving..."):
+            saved_ok = write()
+        if saved_ok:
+            st.toast("Saved")
+        else:
+            _roll_back(job, saved)
+            st.session_state.card_errors[job_id] = "❌ Could not save that change; it has been undone."
+            draw_metrics()
+            draw_deadlines()
+            st.rerun(scope="fragment")
+
+def show_student_dashboard():
+    st.title(f"👨‍🎓 Welcome, {st.session_state.user_name}")
+    
+    # Feed filters come from last run's widget state so the whole page loads in one round trip
+    filters = {
+        'company': st.session_state.get('feed_company', '').strip(),
+        'role': st.session_state.get('feed_role', '').strip(),
+        'status': st.session_state.get('feed_status', 'All'),
+        'deadline_within': FEED_DEADLINE_WINDOWS[st.session_state.get('feed_window', 'Any time')],
+    }
+    search_text = st.session_state.get('feed_search', '').strip()
+    search_mode = st.session_state.get('feed_search_mode', 'Natural language')
+    
+    # "Load more" grows the feed by a page; it starts again from one page whenever the filters or search change
+    if st.session_state.get('feed_filters') != (filters, search_text, search_mode):
+        st.session_state.feed_filters = (filters, search_text, search_mode)
+        st.session_state.feed_page = 0
+    
+    # A card write queued just before a full rerun lands before the reload, so the page shows it
+    st.session_state.setdefault('pending_card_writes', {})
+    st.session_state.setdefault('card_errors', {})
+    for job_id, (write, _) in list(st.session_state.pending_card_writes.items()):
+        del st.session_state.pending_card_writes[job_id]
+        if not write():
+            st.session_state.card_errors[job_id] = "❌ Could not save that change."
+    
+    dashboard = load_dashboard(filters)
+    if dashboard is None:
+        st.stop()
+    
+    # Session copies the card fragments update optimistically between full reruns
+    st.session_state.student_stats = dashboard['stats']
+    st.session_state.student_deadlines = dashboard['deadlines']
+    st.session_state.student_panels = {'metrics': st.empty()}
+    draw_metrics()
+    
+    st.markdown("---")
+    
+    deadline_panel(filters)
     
     # Available Jobs
     st.subheader("💼 Available Internships")
-    jobs = get_available_jobs(st.session_state.user_id)
+    
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        st.text_input("Search", key="feed_search", placeholder="Search company, role or description")
+    with col2:
+        st.selectbox("Match", list(SEARCH_MODES), key="feed_search_mode",
+                     help="Boolean mode supports +required -excluded \"exact phrase\" prefix*")
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.text_input("Company", key="feed_company")
+    with col2:
+        st.text_input("Role", key="feed_role")
+    with col3:
+        st.selectbox("Status", list(FEED_STATUS_FILTERS), key="feed_status")
+    with col4:
+        st.selectbox("Deadline", list(FEED_DEADLINE_WINDOWS), key="feed_window")
+    
+    # A search replaces the feed page with ranked matches under the same filters; a search
+    # that cannot run leaves the unfiltered feed in place under an inline message
+    jobs = None
+    if search_text:
+        problem = boolean_search_error(search_text) if search_mode == 'Boolean' else None
+        if problem:
+            st.warning(f"Search not run: {problem}. Showing all internships instead.")
+        else:
+            jobs, has_more = search_jobs(st.session_state.user_id, search_text, search_mode, filters, limit=feed_limit())
+            if jobs is None:
+                st.warning("Search failed. Showing all internships instead.")
+    if jobs is None:
+        search_text = ''
+        jobs, has_more = dashboard['jobs'], dashboard['next_cursor'] is not None
+    
+    # Cards edit their own copies, never the rows held by the query cache
+    st.session_state.feed_jobs = {job['job_id']: dict(job) for job in jobs or []}
     
     if jobs:
+        if search_text:
+            st.caption(f"Showing {len(jobs)} best matches for “{search_text}”")
+        else:
+            st.caption(f"Showing the {len(jobs)} internships with the nearest deadlines")
+        
+        # Selection mode: tick several jobs and change their status in one transaction
+        selecting = st.checkbox("Select multiple", key="feed_select_mode")
+        if selecting:
+            selected = [job['job_id'] for job in jobs if st.session_state.get(f"select_{job['job_id']}")]
+            bulk_actions = {"Apply to selected": 'applied', "Ignore selected": 'ignored', "Mark selected as done": 'done'}
+            
+            st.caption(f"{len(selected)} selected")
+            for col, (label, bulk_status) in zip(st.columns(len(bulk_actions)), bulk_actions.items()):
+                with col:
+                    if st.button(label, disabled=not selected, use_container_width=True):
+                        if set_application_statuses(st.session_state.user_id, selected, bulk_status):
+                            for job_id in selected:
+                                del st.session_state[f"select_{job_id}"]
+                            st.rerun()
+        
         for job in jobs:
-            with st.container():
-                col1, col2 = st.columns([3, 1])
-                
-                with col1:
-                    st.markdown(f"### {job['company_name']}")
-                    st.markdown(f"**{job['role']}**")
-                    st.write(job['description'])
-                    st.caption(f"⏰ Deadline: {job['deadline_date']} | 📝 OA: {job['oa_date']} | 🎤 Interview: {job['interview_date']}")
-                    
-                    if job['jd_link']:
-                        st.markdown(f"[View Job Description]({job['jd_link']})")
-                
-                with col2:
-                    status = job['app_status']
-                    
-                    if status == 'applied':
-                        st.success("✅ Applied")
-                        if st.button("Mark as Done", key=f"done_{job['job_id']}"):
-                            if mark_as_done(st.session_state.user_id, job['job_id']):
-                                st.success("Marked as done!")
-                                st.rerun()
-                        
-                        with st.expander("Add Note"):
-                            note = st.text_area("Note", key=f"note_{job['application_id']}")
-                            if st.button("Save Note", key=f"save_{job['application_id']}"):
-                                if add_note(job['application_id'], st.session_state.user_id, note):
-                                    st.success("Note added!")
-                                    st.rerun()
-                        
-                        if job['latest_note']:
-                            st.info(f"📝 {job['latest_note']}")
-                    
-                    elif status == 'done':
-                        st.success("🎉 Completed")
-                    
-                    elif status == 'ignored':
-                        st.warning("🚫 Ignored")
-                    
-                    else:
-                        if st.button("Apply", key=f"apply_{job['job_id']}", use_container_width=True):
-                            if apply_to_job(st.session_state.user_id, job['job_id']):
-                                st.success("Applied successfully!")
-                                st.rerun()
-                        
-                        if st.button("Ignore", key=f"ignore_{job['job_id']}", use_container_width=True):
-                            if ignore_job(st.session_state.user_id, job['job_id']):
-                                st.info("Job ignored")
-                                st.rerun()
-                
-                st.markdown("---")
+            # Outside the card fragment, so ticking a job updates the selection count above
+            if selecting:
+                st.checkbox(f"Select {job['company_name']} - {job['role']}", key=f"select_{job['job_id']}")
+            job_card(job['job_id'])
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.session_state.feed_page > 0:
+                if st.button("⏫ Show fewer", use_container_width=True):
+                    st.session_state.feed_page = 0
+                    st.rerun()
+        with col2:
+            if has_more:
+                if st.button("Load more", use_container_width=True):
+                    st.session_state.feed_page += 1
+                    st.rerun()
+    elif search_text:
+        st.info(f"No open internships match “{search_text}”.")
     else:
         st.info("No jobs available at the moment.")
+    
+    st.markdown("---")
+    notes_panel()
+
+@st.fragment
+def notes_panel():
+    """The student's notes, one Note_Folders folder at a time"""
+    st.subheader("🗂️ My Notes")
+    if not st.toggle("Browse notes by folder", key="notes_browser"):
+        return
+    
+    folders = get_note_folders(st.session_state.user_id)
+    if not folders:
+        if folders is not None:
+            st.info("No notes yet. Notes you save on applied jobs appear here.")
+        return
+    
+    labels = {folder['folder_id']: f"{folder['folder_name']} ({folder['note_count']})" for folder in folders}
+    folder_id = st.selectbox("Folder", list(labels), key="notes_folder", format_func=labels.get)
+    notes_history('folder', folder_id, show_job=True)
 
 # Faculty Dashboard
 def show_faculty_dashboard():
     st.title(f"👨‍🏫 Faculty Dashboard - {st.session_state.user_name}")
     
-    tab1, tab2 = st.tabs(["📋 Manage Jobs", "➕ Post New Job"])
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(
+        ["📋 Manage Jobs", "➕ Post New Job", "📤 Bulk Import", "📦 Export", "📈 Job Funnel"]
+    )
     
     with tab1:
         st.subheader("Posted Job Openings")
-        jobs = get_all_jobs()
+        if DELTA_SYNC:
+            sync = sync_all_jobs(st.session_state.get('job_sync'))
+            jobs = None
+            if sync is not None:
+                st.session_state.job_sync = sync
+                jobs = sorted(sync['rows'].values(), key=lambda job: job['deadline_date'], reverse=True)
+        else:
+            jobs = get_all_jobs()
         
         if jobs:
             for job in jobs:
@@ -571,26 +672,130 @@ def show_faculty_dashboard():
                         st.rerun()
                 else:
                     st.error("Please fill all required fields.")
+    
+    with tab3:
+        st.subheader("Import Internships from a Spreadsheet")
+        st.caption(
+            "CSV or XLSX with columns: company_name, role, description, jd_link (optional), "
+            "deadline_date, oa_date, interview_date. Dates must satisfy deadline ≤ OA ≤ interview."
+        )
+        
+        uploaded_file = st.file_uploader("Job postings file", type=['csv', 'xlsx'])
+        if uploaded_file is not None:
+            try:
+                df = read_job_import_file(uploaded_file)
+            except (ValueError, ImportError) as e:
+                st.error(f"Could not read file: {e}")
+                df = None
+            
+            if df is not None:
+                valid_rows, errors = validate_job_import(df)
+                
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.metric("Valid rows", len(valid_rows))
+                with col2:
+                    st.metric("Rows with errors", errors['row'].nunique())
+                
+                if not errors.empty:
+                    st.warning("These rows will be skipped:")
+                    st.dataframe(errors, use_container_width=True, hide_index=True)
+                
+                if len(valid_rows) > 0:
+                    st.dataframe(valid_rows.head(20), use_container_width=True, hide_index=True)
+                    if st.button(f"Import {len(valid_rows)} valid postings", use_container_width=True):
+                        created = import_job_postings(valid_rows, st.session_state.user_id)
+                        if created is not None:
+                            st.success(f"✅ Imported {created} job postings!")
+    
+    with tab4:
+        st.subheader("Export Data")
+        st.caption("Rows are streamed from the database in chunks and written straight to a file, so exports of any size are safe.")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            export = st.selectbox("Dataset", list(EXPORTS))
+        with col2:
+            file_format = st.radio("Format", list(EXPORT_FORMATS), horizontal=True)
+        
+        if st.button("Prepare export", use_container_width=True):
+            progress = st.progress(0.0, text="Starting export…")
+            
+            def show_progress(written, total):
+                progress.progress(min(written / total, 1.0) if total else 1.0, text=f"{written:,} of {total:,} rows written")
+            
+            try:
+                export_file = export_to_file(export, file_format, show_progress)
+            except ImportError:
+                st.error("Parquet export needs pyarrow: pip install pyarrow")
+            except Error as e:
+                st.error(f"Export failed: {e}")
+            else:
+                # Only the latest export is kept on disk for this session
+                previous = st.session_state.get('export_file')
+                if previous is not None:
+                    previous.discard()
+                st.session_state.export_file = export_file
+                progress.progress(1.0, text=f"{export_file.rows:,} rows written")
+        
+        export_file = st.session_state.get('export_file')
+        if export_file is not None and export_file.exists():
+            # Passing the read method defers loading the file until the button is clicked, not every rerun
+            st.download_button(
+                f"⬇️ Download {export_file.name} ({export_file.rows:,} rows)", export_file.read,
+                file_name=export_file.name, mime=export_file.mime, use_container_width=True
+            )
+        
+        st.markdown("---")
+        st.subheader("Calendar")
+        st.caption("Every posting's deadline, OA and interview dates with how many students track each. "
+                   "Calendar apps can subscribe to the same feed through the API's /calendar.ics.")
+        calendar = get_faculty_calendar()
+        if calendar is not None:
+            st.download_button("📅 Download calendar (.ics)", calendar['body'], file_name="internship_calendar.ics",
+                               mime="text/calendar", use_container_width=True)
+    
+    with tab5:
+        st.subheader("Application Funnel by Job")
+        st.caption("Click a column header to sort. Success ratio is completed applications as a share of all tracked ones.")
+        funnel = get_job_funnel()
+        
+        if funnel:
+            df_funnel = pd.DataFrame(funnel)
+            df_funnel['success_ratio'] = df_funnel['success_ratio'].astype(float)  # DECIMAL from MySQL
+            st.dataframe(
+                df_funnel,
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    'job_id': st.column_config.NumberColumn("Job ID"),
+                    'company_name': "Company",
+                    'role': "Role",
+                    'deadline_date': st.column_config.DateColumn("Deadline"),
+                    'total_apps': "Tracked",
+                    'to_apply': "To Apply",
+                    'applied': "Applied",
+                    'done': "Completed",
+                    'ignored': "Ignored",
+                    'success_ratio': st.column_config.ProgressColumn(
+                        "Success Ratio", format="%.1f%%", min_value=0, max_value=100
+                    ),
+                },
+            )
+        else:
+            st.info("No job postings yet.")
 
 # Analytics Dashboard
 def show_analytics_dashboard():
     st.title(f"📊 Analytics Dashboard")
+    include_archived = st.toggle("Include archived seasons", key="analytics_include_archived",
+                                 help="Also count applications to postings moved to the archive")
     
-    analytics = get_analytics_data(st.session_state.user_id)
-    
-    # Summary metrics
+    # Lay out every slot first, then fill each one as its query finishes
     col1, col2, col3 = st.columns(3)
-    
-    total_apps = sum(item['count'] for item in analytics['by_status']) if analytics['by_status'] else 0
-    done_apps = next((item['count'] for item in analytics['by_status'] if item['status'] == 'done'), 0)
-    success_rate = (done_apps / total_apps * 100) if total_apps > 0 else 0
-    
-    with col1:
-        st.metric("Total Applications", total_apps, delta="Across all students")
-    with col2:
-        st.metric("Completed", done_apps, delta="Successful")
-    with col3:
-        st.metric("Success Rate", f"{success_rate:.1f}%", delta="Overall")
+    metric_slots = [col.empty() for col in (col1, col2, col3)]
+    for slot, label in zip(metric_slots, ["Total Applications", "Completed", "Success Rate"]):
+        slot.metric(label, "…")
     
     st.markdown("---")
     
@@ -599,37 +804,135 @@ def show_analytics_dashboard():
     
     with col1:
         st.subheader("Applications by Company")
-        if analytics['by_company']:
-            df_company = pd.DataFrame(analytics['by_company'])
+        company_slot = st.empty()
+    
+    with col2:
+        st.subheader("Application Status Distribution")
+        status_slot = st.empty()
+    
+    st.subheader("Application Timeline")
+    timeline_slot = st.empty()
+    
+    for slot in (company_slot, status_slot, timeline_slot):
+        slot.info("Loading…")
+    
+    def show_by_company(rows):
+        if rows:
+            df_company = pd.DataFrame(rows)
             fig = px.bar(df_company, x='company_name', y='app_count', 
                         labels={'company_name': 'Company', 'app_count': 'Applications'},
                         color='app_count', color_continuous_scale='Blues')
-            st.plotly_chart(fig, use_container_width=True)
+            company_slot.plotly_chart(fig, use_container_width=True)
         else:
-            st.info("No application data available.")
+            company_slot.info("No application data available.")
     
-    with col2:
-        st.subheader("Application Status Distribution")
-        if analytics['by_status']:
-            df_status = pd.DataFrame(analytics['by_status'])
+    def show_by_status(rows):
+        total_apps = sum(item['count'] for item in rows) if rows else 0
+        done_apps = next((item['count'] for item in rows if item['status'] == 'done'), 0) if rows else 0
+        success_rate = (done_apps / total_apps * 100) if total_apps > 0 else 0
+        
+        metric_slots[0].metric("Total Applications", total_apps, delta="Across all students")
+        metric_slots[1].metric("Completed", done_apps, delta="Successful")
+        metric_slots[2].metric("Success Rate", f"{success_rate:.1f}%", delta="Overall")
+        
+        if rows:
+            df_status = pd.DataFrame(rows)
             fig = px.pie(df_status, values='count', names='status', 
                         color_discrete_sequence=['#3b82f6', '#10b981', '#ef4444', '#f59e0b'])
-            st.plotly_chart(fig, use_container_width=True)
+            status_slot.plotly_chart(fig, use_container_width=True)
+        else:
+            status_slot.info("No status data available.")
+    
+    def show_timeline(rows):
+        if rows:
+            df_timeline = pd.DataFrame(rows)
+            fig = px.line(df_timeline, x='month', y='count', 
+                         labels={'month': 'Month', 'count': 'Applications'},
+                         markers=True)
+            timeline_slot.plotly_chart(fig, use_container_width=True)
         else:
-            st.info("No status data available.")
+            timeline_slot.info("No timeline data available.")
     
-    st.subheader("Application Timeline")
-    if analytics['timeline']:
-        df_timeline = pd.DataFrame(analytics['timeline'])
-        fig = px.line(df_timeline, x='month', y='count', 
-                     labels={'month': 'Month', 'count': 'Applications'},
-                     markers=True)
-        st.plotly_chart(fig, use_container_width=True)
+    renderers = {'by_company': show_by_company, 'by_status': show_by_status, 'timeline': show_timeline}
+    slots = {'by_company': company_slot, 'by_status': status_slot, 'timeline': timeline_slot}
+    
+    for name, rows in iter_analytics_data(st.session_state.user_id, include_archived=include_archived):
+        if rows is None:
+            slots[name].warning("This chart could not be loaded right now. Try refreshing the page.")
+        else:
+            renderers[name](rows)
+
+# Performance Dashboard (admin only)
+def show_performance_dashboard():
+    st.title("⚡ Performance")
+    st.caption(f"Statistics for this server process. Statements slower than {SLOW_QUERY_MS:.0f} ms are logged as slow.")
+    
+    pool = pool_stats()
+    cache = cache_stats()
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Pool In Use", f"{pool['in_use']} / {pool['pool_size']}", delta=f"{pool['checkout_failures']} failures", delta_color="inverse")
+    with col2:
+        st.metric("Pool Wait", f"{pool['avg_wait_ms']:.1f} ms", delta=f"max {pool['max_wait_ms']:.1f} ms", delta_color="off")
+    with col3:
+        st.metric("Cache Hit Rate", f"{cache['hit_rate']:.1f}%", delta=f"{cache['entries']} entries", delta_color="off")
+    with col4:
+        st.metric("Cache Hits / Misses", f"{cache['hits']} / {cache['misses']}", delta=f"{cache['invalidations']} invalidated", delta_color="off")
+    
+    replicas = replica_stats()
+    if replicas['replicas']:
+        routing = replicas['routing']
+        reads = routing['replica_reads'] + routing['primary_reads'] + routing['sticky_reads'] + routing['fallback_reads']
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Reads on Replicas", f"{routing['replica_reads'] / reads * 100 if reads else 0:.1f}%", delta=f"{reads} reads", delta_color="off")
+        with col2:
+            st.metric("Read-Your-Writes", routing['sticky_reads'], delta=f"{replicas['read_your_writes_s']:g}s window", delta_color="off")
+        with col3:
+            st.metric("Primary Fallbacks", routing['fallback_reads'], delta="replica unusable", delta_color="inverse")
+        with col4:
+            st.metric("Writes", routing['writes'], delta="primary", delta_color="off")
+        st.dataframe(pd.DataFrame(replicas['replicas']), use_container_width=True, hide_index=True)
+    
+    st.markdown("---")
+    
+    st.subheader("Top Queries by Total Time")
+    summary = query_summary()
+    if summary:
+        st.dataframe(pd.DataFrame(summary), use_container_width=True, hide_index=True)
     else:
-        st.info("No timeline data available.")
+        st.info("No queries recorded yet.")
+    
+    st.subheader("Recent Slow Queries")
+    slow = slow_queries()
+    if slow:
+        st.dataframe(pd.DataFrame(slow), use_container_width=True, hide_index=True)
+    else:
+        st.info("No slow queries recorded.")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        export = "\n".join(json.dumps(row) for row in summary)
+        st.download_button("Download summary (JSON lines)", export, file_name="query_stats.jsonl",
+                           mime="application/jsonl", use_container_width=True)
+    with col2:
+        if st.button("Reset statistics", use_container_width=True):
+            reset_query_stats()
+            st.rerun()
+    
+    if QUERY_LOG_PATH:
+        st.caption(f"Every statement is also appended to `{QUERY_LOG_PATH}`.")
+    else:
+        st.caption("Set `QUERY_LOG_PATH` to log every statement as JSON lines for offline analysis.")
 
 # Main Application
 def main():
+    if os.getenv('AUTO_MIGRATE', '1') == '1':
+        try:
+            apply_schema_migrations()
+        except (Error, RuntimeError) as e:
+            st.error(f"❌ Schema migration failed: {e}")
+    
     if not st.session_state.logged_in:
         show_login_page()
     else:
@@ -646,12 +949,20 @@ def main():
         # Show appropriate dashboard
         if st.session_state.user_role == 'student':
             show_student_dashboard()
-        elif st.session_state.user_role in ['faculty', 'admin']:
+        elif st.session_state.user_role == 'faculty':
             tab1, tab2 = st.tabs(["📋 Manage Jobs", "📊 Analytics"])
             with tab1:
                 show_faculty_dashboard()
             with tab2:
                 show_analytics_dashboard()
+        elif st.session_state.user_role == 'admin':
+            tab1, tab2, tab3 = st.tabs(["📋 Manage Jobs", "📊 Analytics", "⚡ Performance"])
+            with tab1:
+                show_faculty_dashboard()
+            with tab2:
+                show_analytics_dashboard()
+            with tab3:
+                show_performance_dashboard()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,224 @@
+"""Archival of expired job postings for the College Internship Tracker.
+
+Postings whose deadline, OA and interview dates all passed more than
+ARCHIVE_AFTER_DAYS ago are moved, with their applications, notes and
+alerts, into the *_Archive tables created by migration 12, so the live
+tables the dashboards scan only hold the current season.
+
+Work is done in batches of postings, each moved in one transaction (copy
+into the archive, add the applications to the archive summary tables,
+delete from the live tables), so an interrupted run loses at most the batch
+in flight. Progress is recorded in Archive_Runs; a run that did not finish
+is picked up again, with the same cutoff, the next time the job starts.
+
+Deleting archived applications fires Stats_On_Application_Delete, which
+takes them out of the live summary tables, and deleting a posting leaves a
+Deleted_Job_Postings tombstone, so delta-sync sessions drop it too. Each
+batch also prunes tombstones older than TOMBSTONE_RETENTION_HOURS, which no
+delta sync can still ask for (older snapshots are reloaded in full). After
+each batch the cached reads it affects (job lists, analytics and the
+affected students' feeds, dashboards and calendars) are invalidated in this
+process; other app processes pick the change up as their cached reads
+expire (QUERY_CACHE_TTL).
+
+Run from the command line:
+
+    python manage.py archive [--older-than-days 180] [--batch-size 100]
+"""
+import os
+from datetime import date, timedelta
+
+from mysql.connector import Error
+
+from db import pooled_connection, invalidate_cache
+from migrations import ARCHIVED_TABLES
+from queries import JOBS_TAG, APPLICATIONS_TAG, SYNC_MAX_AGE_HOURS, student_tag
+
+ARCHIVE_AFTER_DAYS = int(os.getenv('ARCHIVE_AFTER_DAYS', '180'))
+ARCHIVE_BATCH_SIZE = int(os.getenv('ARCHIVE_BATCH_SIZE', '100'))
+ARCHIVE_LOCK = 'college_internship_tracker_archive'
+# Delta-sync snapshots older than SYNC_MAX_AGE_HOURS are reloaded in full, so older tombstones are never read
+TOMBSTONE_RETENTION_HOURS = SYNC_MAX_AGE_HOURS + 1
+
+# Postings whose last event is before the cutoff; deadline_date is checked on its own first so
+# the range scan on idx_job_postings_deadline does the narrowing
+EXPIRED_POSTINGS = """
+    SELECT job_id FROM Job_Postings
+    WHERE deadline_date < %s
+    AND GREATEST(deadline_date, COALESCE(oa_date, deadline_date), COALESCE(interview_date, deadline_date)) < %s
+    ORDER BY job_id
+    LIMIT %s
+    FOR UPDATE
+"""
+
+# Rows belonging to a batch of postings, per table; {ids} is the placeholder list
+BATCH_ROWS = {
+    'Job_Postings': "job_id IN ({ids})",
+    'Applications': "job_id IN ({ids})",
+    'Notes': "application_id IN (SELECT application_id FROM Applications WHERE job_id IN ({ids}))",
+    'Alerts': "application_id IN (SELECT application_id FROM Applications WHERE job_id IN ({ids}))",
+}
+
+# The archived applications' analytics counts, mirroring REBUILD_STATS_STATEMENTS
+ARCHIVE_STATS_STATEMENTS = [
+    """INSERT INTO Application_Stats_By_Company_Archive (company_name, status, app_count)
+       SELECT j.company_name, a.status, COUNT(*)
+       FROM Applications a
+       JOIN Job_Postings j ON a.job_id = j.job_id
+       WHERE a.job_id IN ({ids})
+       GROUP BY j.company_name, a.status
+       ON DUPLICATE KEY UPDATE app_count = app_count + VALUES(app_count)""",
+    """INSERT INTO Application_Stats_By_Month_Archive (month, status, app_count)
+       SELECT DATE_FORMAT(applied_on, '%Y-%m'), status, COUNT(*)
+       FROM Applications
+       WHERE job_id IN ({ids}) AND applied_on IS NOT NULL
+       GROUP BY DATE_FORMAT(applied_on, '%Y-%m'), status
+       ON DUPLICATE KEY UPDATE app_count = app_count + VALUES(app_count)""",
+]
+
+
+def table_columns(cursor, table):
+    """Column names of a table, in table order"""
+    cursor.execute("""
+        SELECT column_name FROM information_schema.columns
+        WHERE table_schema = DATABASE() AND table_name = %s
+        ORDER BY ordinal_position
+    """, (table,))
+    return [row[0] for row in cursor.fetchall()]
+
+
+def archived_columns(cursor, table):
+    """The columns of a live table that its _Archive copy also has.
+
+    migrations.add_column() adds new columns of archived tables to both, so
+    normally that is all of them; a column the archive lacks is left out of
+    the copy instead of failing it. Returns (shared columns, left-out columns).
+    """
+    archive = set(table_columns(cursor, f"{table}_Archive"))
+    live = table_columns(cursor, table)
+    return [column for column in live if column in archive], [column for column in live if column not in archive]
+
+
+def start_run(cursor, cutoff):
+    """Resume the unfinished run if there is one, else record a new run. Returns (run_id, cutoff)."""
+    cursor.execute("SELECT run_id, cutoff_date FROM Archive_Runs WHERE finished_at IS NULL ORDER BY run_id LIMIT 1")
+    row = cursor.fetchone()
+    if row is not None:
+        return row
+    cursor.execute("INSERT INTO Archive_Runs (cutoff_date) VALUES (%s)", (cutoff,))
+    return cursor.lastrowid, cutoff
+
+
+def archive_batch(cursor, run_id, cutoff, batch_size, columns):
+    """Move one batch of expired postings.
+
+    Returns (rows moved per table, ids of the students whose applications
+    moved); both are empty when nothing is left.
+    """
+    cursor.execute(EXPIRED_POSTINGS, (cutoff, cutoff, batch_size))
+    job_ids = [row[0] for row in cursor.fetchall()]
+    if not job_ids:
+        return {}, []
+    ids = ', '.join(['%s'] * len(job_ids))
+    cursor.execute(f"SELECT DISTINCT student_id FROM Applications WHERE job_id IN ({ids})", job_ids)
+    student_ids = [row[0] for row in cursor.fetchall()]
+
+    moved = {}
+    for table in ARCHIVED_TABLES:
+        where = BATCH_ROWS[table].format(ids=ids)
+        column_list = ', '.join(columns[table])
+        cursor.execute(
+            f"INSERT INTO {table}_Archive ({column_list}) SELECT {column_list} FROM {table} WHERE {where}",
+            job_ids
+        )
+        moved[table] = cursor.rowcount
+    for statement in ARCHIVE_STATS_STATEMENTS:
+        cursor.execute(statement.format(ids=ids), job_ids)
+
+    # Children before parents, for the foreign keys
+    for table in reversed(ARCHIVED_TABLES):
+        cursor.execute(f"DELETE FROM {table} WHERE {BATCH_ROWS[table].format(ids=ids)}", job_ids)
+
+    cursor.execute("""
+        UPDATE Archive_Runs
+        SET postings = postings + %s, applications = applications + %s, notes = notes + %s, alerts = alerts + %s
+        WHERE run_id = %s
+    """, (moved['Job_Postings'], moved['Applications'], moved['Notes'], moved['Alerts'], run_id))
+    return moved, student_ids
+
+
+def prune_tombstones(cursor, limit):
+    """Delete up to `limit` Deleted_Job_Postings tombstones no delta sync can still need; returns how many"""
+    cursor.execute(
+        "DELETE FROM Deleted_Job_Postings WHERE deleted_at < NOW() - INTERVAL %s MINUTE LIMIT %s",
+        (int(TOMBSTONE_RETENTION_HOURS * 60), limit)
+    )
+    return cursor.rowcount
+
+
+def archive_expired(older_than_days=ARCHIVE_AFTER_DAYS, batch_size=ARCHIVE_BATCH_SIZE, max_batches=None, log=print):
+    """Archive postings whose last event is more than `older_than_days` old. Returns totals per table."""
+    totals = dict.fromkeys(ARCHIVED_TABLES, 0)
+    with pooled_connection() as connection:
+        cursor = connection.cursor()
+        try:
+            # One archiver at a time; a second one would only contend for the same rows
+            cursor.execute("SELECT GET_LOCK(%s, 0)", (ARCHIVE_LOCK,))
+            if cursor.fetchone()[0] != 1:
+                raise RuntimeError("Another archive run is in progress")
+            try:
+                columns = {}
+                for table in ARCHIVED_TABLES:
+                    columns[table], missing = archived_columns(cursor, table)
+                    if missing:
+                        log(f"Warning: {table}_Archive has no {', '.join(missing)} column(s); not archived")
+                run_id, cutoff = start_run(cursor, date.today() - timedelta(days=older_than_days))
+                connection.commit()
+                log(f"Archive run {run_id}: postings whose last event is before {cutoff}")
+
+                batches = 0
+                while max_batches is None or batches < max_batches:
+                    try:
+                        moved, student_ids = archive_batch(cursor, run_id, cutoff, batch_size, columns)
+                        pruned = prune_tombstones(cursor, batch_size)
+                        connection.commit()
+                    except Error:
+                        connection.rollback()
+                        raise
+                    if moved:
+                        # Same tags the write paths in queries.py drop when postings and applications change
+                        invalidate_cache(JOBS_TAG, APPLICATIONS_TAG, *map(student_tag, student_ids))
+                    if not moved and not pruned:
+                        cursor.execute("UPDATE Archive_Runs SET finished_at = NOW() WHERE run_id = %s", (run_id,))
+                        connection.commit()
+                        break
+                    batches += 1
+                    for table, count in moved.items():
+                        totals[table] += count
+                    log(f"  batch {batches}: " + ', '.join(
+                        [f"{count} {table}" for table, count in moved.items()] + [f"{pruned} old tombstones pruned"]
+                    ))
+            finally:
+                cursor.execute("SELECT RELEASE_LOCK(%s)", (ARCHIVE_LOCK,))
+                cursor.fetchall()
+        finally:
+            cursor.close()
+    return totals
+
+
+def archive_status():
+    """Recent archive runs, newest first, and the current row counts of live and archive tables"""
+    with pooled_connection() as connection:
+        cursor = connection.cursor(dictionary=True)
+        try:
+            cursor.execute("SELECT * FROM Archive_Runs ORDER BY run_id DESC LIMIT 10")
+            runs = cursor.fetchall()
+            counts = {}
+            for table in ARCHIVED_TABLES:
+                cursor.execute(f"""
+                    SELECT (SELECT COUNT(*) FROM {table}) as live, (SELECT COUNT(*) FROM {table}_Archive) as archived
+                """)
+                counts[table] = cursor.fetchone()
+        finally:
+            cursor.close()
+    return runs, counts
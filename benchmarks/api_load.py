@@ -0,0 +1,141 @@
+"""Throughput of the JSON API against the Streamlit rerun path for the same student read.
+
+Starts api.py's app under uvicorn in-process, logs in as a student and fires
+GET requests at one list endpoint from concurrent client threads, once
+unconditionally and once revalidating with If-None-Match (304s). It then
+renders the student dashboard with Streamlit's AppTest the same number of
+times, which is what every Streamlit interaction costs, and prints
+requests/sec and latency percentiles for each path.
+
+Read-only: runs against the database configured in .env.
+
+Usage:
+    python benchmarks/api_load.py [--email asha.sharma@student.college.edu --password STUDENT1]
+    python benchmarks/api_load.py --endpoint /deadlines --requests 2000 --concurrency 32 --reruns 100
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import uvicorn  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+import api  # noqa: E402
+
+
+def request(url, method='GET', body=None, headers=None):
+    """Send one request and return (status, headers, body); error statuses are returned, not raised"""
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(url, data=data, method=method, headers=headers or {})
+    try:
+        with urllib.request.urlopen(req) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+
+def summarize(samples, elapsed):
+    samples.sort()
+    return {
+        'per_sec': len(samples) / elapsed,
+        'p50': statistics.median(samples),
+        'p95': samples[int(len(samples) * 0.95) - 1],
+        'p99': samples[int(len(samples) * 0.99) - 1],
+    }
+
+
+def load(url, headers, requests, concurrency):
+    """Issue `requests` GETs from `concurrency` threads; returns (summary, status counts)"""
+    statuses = {}
+    lock = threading.Lock()
+
+    def one(_):
+        start = time.perf_counter()
+        status, _, _ = request(url, headers=headers)
+        with lock:
+            statuses[status] = statuses.get(status, 0) + 1
+        return (time.perf_counter() - start) * 1000
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        samples = list(pool.map(one, range(requests)))
+    return summarize(samples, time.perf_counter() - started), statuses
+
+
+def streamlit_reruns(user, reruns):
+    """Render the student dashboard `reruns` times through AppTest, as a signed-in session would"""
+    app = AppTest.from_file(os.path.join(ROOT, 'app.py'), default_timeout=60)
+    app.session_state.logged_in = True
+    app.session_state.user_id = user['user_id']
+    app.session_state.user_role = user['role']
+    app.session_state.user_name = user['name']
+
+    samples = []
+    started = time.perf_counter()
+    for _ in range(reruns):
+        start = time.perf_counter()
+        app.run()
+        samples.append((time.perf_counter() - start) * 1000)
+    if app.exception:
+        raise RuntimeError(f"dashboard raised: {app.exception[0].message}")
+    return summarize(samples, time.perf_counter() - started)
+
+
+def print_row(label, summary, note=''):
+    print(f"{label:<28} {summary['per_sec']:>9.1f}/s  p50={summary['p50']:7.2f} ms  "
+          f"p95={summary['p95']:7.2f} ms  p99={summary['p99']:7.2f} ms  {note}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--email', default='asha.sharma@student.college.edu')
+    parser.add_argument('--password', default='STUDENT1')
+    parser.add_argument('--endpoint', default='/jobs', choices=['/jobs', '/deadlines'])
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--reruns', type=int, default=50, help="Streamlit dashboard renders to time")
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args(argv)
+
+    server = uvicorn.Server(uvicorn.Config(api.app, host='127.0.0.1', port=args.port, log_level='warning'))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    base = f"http://127.0.0.1:{args.port}"
+
+    try:
+        status, _, body = request(f"{base}/auth/token", 'POST', {'email': args.email, 'password': args.password})
+        if status != 200:
+            print(f"Login failed ({status}): {body.decode()}")
+            return 1
+        login = json.loads(body)
+        headers = {'Authorization': f"Bearer {login['token']}"}
+        url = base + args.endpoint
+
+        # Warm the pool and the query cache, and pick up the ETag for the revalidation run
+        _, first_headers, _ = request(url, headers=headers)
+        print(f"{args.requests} requests to {args.endpoint}, {args.concurrency} concurrent clients\n")
+        summary, statuses = load(url, headers, args.requests, args.concurrency)
+        print_row("API GET", summary, f"statuses={statuses}")
+        revalidate = dict(headers, **{'If-None-Match': first_headers['ETag']})
+        summary, statuses = load(url, revalidate, args.requests, args.concurrency)
+        print_row("API GET If-None-Match", summary, f"statuses={statuses}")
+    finally:
+        server.should_exit = True
+
+    print_row("Streamlit dashboard rerun", streamlit_reruns(login['user'], args.reruns), "(one session, serial)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
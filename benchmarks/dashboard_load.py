@@ -0,0 +1,83 @@
+"""Student dashboard load latency: four separate queries vs the single-round-trip loader.
+
+Times get_student_stats + get_upcoming_deadlines + get_available_jobs (the
+original per-render path) against load_student_dashboard for one student,
+with the query cache cleared before every render so each one hits MySQL.
+Read-only: runs against the database configured in .env.
+
+Usage:
+    python benchmarks/dashboard_load.py [--student-id 1] [--renders 200]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import db  # noqa: E402
+import queries  # noqa: E402
+
+
+def count_round_trips(fn):
+    """Run fn once and return how many statements it sent to the server"""
+    calls = 0
+    original = db._run_query
+
+    def counting(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+        return original(*args, **kwargs)
+
+    db._run_query = counting
+    try:
+        db.query_cache.clear()
+        fn()
+    finally:
+        db._run_query = original
+    return calls
+
+
+def time_renders(fn, renders):
+    samples = []
+    for _ in range(renders):
+        db.query_cache.clear()
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        'p50': statistics.median(samples),
+        'p95': samples[int(len(samples) * 0.95) - 1],
+        'mean': statistics.fmean(samples),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--student-id', type=int, default=1)
+    parser.add_argument('--renders', type=int, default=200)
+    args = parser.parse_args(argv)
+
+    def separate():
+        queries.get_student_stats(args.student_id)
+        queries.get_upcoming_deadlines(args.student_id)
+        queries.get_available_jobs(args.student_id)
+
+    def consolidated():
+        queries.load_student_dashboard(args.student_id)
+
+    # Warm the pool so connection setup is not measured
+    consolidated()
+
+    print(f"{'path':<16}{'round trips':>13}{'p50 ms':>10}{'p95 ms':>10}{'mean ms':>10}")
+    for name, fn in (('separate', separate), ('consolidated', consolidated)):
+        trips = count_round_trips(fn)
+        timing = time_renders(fn, args.renders)
+        print(f"{name:<16}{trips:>13}{timing['p50']:>10.2f}{timing['p95']:>10.2f}{timing['mean']:>10.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,273 @@
+"""Reproducible synthetic dataset for the College Internship Tracker.
+
+Builds a scratch database from college_internship_tracker.sql (tables first,
+without the demo rows), bulk-loads seeded random users, job postings,
+applications, note folders, notes and alerts, then installs the stored
+programs and applies every migration so indexes, triggers and summary
+tables match a production install.
+
+Triggers are created only after the bulk load and alerts are derived with
+set-based INSERT ... SELECT, so loading millions of applications does not
+pay per-row trigger cost.
+
+Every date is drawn relative to a base date (default: today), so the same
+--seed and --base-date always produce the same rows; pass the base date of
+an earlier run to rebuild its dataset exactly.
+
+Usage:
+    python benchmarks/generate_data.py --students 50000 --jobs 10000 --applications 5000000
+    python benchmarks/generate_data.py --database internship_bench --seed 7 --base-date 2026-01-15
+
+The target database (default: <DB_NAME>_bench) is dropped and recreated.
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+import mysql.connector
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import db  # noqa: E402
+from migrations import migrate  # noqa: E402
+
+SCHEMA_FILE = os.path.join(ROOT, 'college_internship_tracker.sql')
+BATCH_SIZE = 5000
+
+COMPANIES = [
+    'InnovaTech', 'GreenAI', 'Acme', 'DataForge', 'CloudNine', 'ByteWorks', 'QuantumLeap', 'NovaSoft',
+    'BlueOrbit', 'PixelCraft', 'SecureNet', 'FinEdge', 'HealthSync', 'AgriSense', 'RoboCore', 'EduSpark',
+]
+ROLES = [
+    'Software Intern', 'ML Intern', 'Data Analyst Intern', 'Backend Intern', 'Frontend Intern',
+    'DevOps Intern', 'Security Intern', 'Product Intern', 'Research Intern', 'QA Intern',
+]
+STATUSES = ['to_apply', 'applied', 'done', 'ignored']
+STATUS_WEIGHTS = [0.35, 0.35, 0.1, 0.2]
+
+SQL_COMMENT = re.compile(r'(^|\s)--(\s.*)?$')
+
+# Statement kinds taken from the schema file; demo DML is skipped
+TABLE_STATEMENTS = re.compile(r'^\s*(CREATE\s+TABLE|ALTER\s+TABLE)', re.IGNORECASE)
+PROGRAM_STATEMENTS = re.compile(r'^\s*CREATE\s+(FUNCTION|PROCEDURE|TRIGGER|VIEW)', re.IGNORECASE)
+
+SCALES = {
+    'small': {'students': 1000, 'jobs': 200, 'applications': 20000},
+    'medium': {'students': 10000, 'jobs': 2000, 'applications': 500000},
+    'large': {'students': 50000, 'jobs': 10000, 'applications': 5000000},
+}
+
+
+def split_sql_script(text):
+    """Split a mysql client script into statements, honouring DELIMITER changes and -- comments"""
+    statements = []
+    delimiter = ';'
+    buffer = []
+    for line in text.splitlines():
+        line = SQL_COMMENT.sub('', line).rstrip()
+        stripped = line.strip()
+        if not stripped:
+            continue
+        if stripped.upper().startswith('DELIMITER '):
+            delimiter = stripped.split()[1]
+            continue
+        buffer.append(line)
+        if stripped.endswith(delimiter):
+            statement = '\n'.join(buffer).rstrip()[:-len(delimiter)].strip()
+            if statement:
+                statements.append(statement)
+            buffer = []
+    return statements
+
+
+def schema_statements():
+    with open(SCHEMA_FILE) as schema:
+        statements = split_sql_script(schema.read())
+    tables = [s for s in statements if TABLE_STATEMENTS.match(s)]
+    programs = [s for s in statements if PROGRAM_STATEMENTS.match(s)]
+    return tables, programs
+
+
+def insert_rows(cursor, query, rows):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            cursor.executemany(query, batch)
+            batch = []
+    if batch:
+        cursor.executemany(query, batch)
+
+
+def generate(database, students, jobs, applications, notes_per_application=0.5, seed=42, base_date=None, log=print):
+    """Create `database` and fill it with a seeded dataset of the given size, dated around
+    `base_date` (default: today). Returns row counts."""
+    rng = random.Random(seed)
+    today = base_date or date.today()
+    now = datetime.combine(today, datetime.min.time())
+    started = time.perf_counter()
+
+    config = {key: value for key, value in db.DB_CONFIG.items() if key != 'database'}
+    connection = mysql.connector.connect(**config)
+    cursor = connection.cursor()
+    cursor.execute(f"DROP DATABASE IF EXISTS `{database}`")
+    cursor.execute(f"CREATE DATABASE `{database}`")
+    cursor.execute(f"USE `{database}`")
+
+    tables, programs = schema_statements()
+    for statement in tables:
+        cursor.execute(statement)
+
+    cursor.execute("SET unique_checks = 0, foreign_key_checks = 0")
+
+    # Users: students, then faculty and one admin (ids are assigned in insert order)
+    faculty = max(1, students // 500)
+    log(f"Loading {students} students and {faculty} faculty...")
+    insert_rows(cursor, "INSERT INTO Users (name, email, role, password_hash) VALUES (%s, %s, %s, %s)", (
+        (f"Student {i}", f"student{i}@student.college.edu", 'student', f"STUDENT{i}") for i in range(1, students + 1)
+    ))
+    insert_rows(cursor, "INSERT INTO Users (name, email, role, password_hash) VALUES (%s, %s, %s, %s)", (
+        (f"Faculty {i}", f"faculty{i}@college.edu", 'faculty', f"FACULTY{i}") for i in range(1, faculty + 1)
+    ))
+    cursor.execute("INSERT INTO Users (name, email, role, password_hash) "
+                   "VALUES ('Admin Team', 'admin@college.edu', 'admin', 'ADMIN123')")
+    first_faculty = students + 1
+
+    log(f"Loading {jobs} job postings...")
+    job_dates = {}
+
+    def job_rows():
+        for job_id in range(1, jobs + 1):
+            deadline = today + timedelta(days=rng.randint(-365, 120))
+            oa_date = deadline + timedelta(days=rng.randint(0, 10))
+            interview_date = oa_date + timedelta(days=rng.randint(0, 14))
+            job_dates[job_id] = deadline
+            company = rng.choice(COMPANIES)
+            yield (company, rng.choice(ROLES), f"{company} internship #{job_id}. " * rng.randint(1, 8),
+                   f"https://example.com/jd/{job_id}", deadline, oa_date, interview_date,
+                   first_faculty + rng.randrange(faculty))
+
+    insert_rows(cursor, "INSERT INTO Job_Postings (company_name, role, description, jd_link, deadline_date, "
+                        "oa_date, interview_date, posted_by) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)", job_rows())
+
+    # Applications: each student tracks a distinct sample of jobs, sized around the requested mean
+    per_student = applications / students
+    log(f"Loading ~{applications} applications...")
+    created = 0
+
+    def application_rows():
+        nonlocal created
+        for student_id in range(1, students + 1):
+            remaining = applications - created
+            if remaining <= 0:
+                return
+            count = min(jobs, remaining, max(0, int(rng.gauss(per_student, per_student / 4))))
+            for job_id in rng.sample(range(1, jobs + 1), count):
+                status = rng.choices(STATUSES, STATUS_WEIGHTS)[0]
+                applied_on = None
+                if status in ('applied', 'done'):
+                    applied_on = datetime.combine(job_dates[job_id], datetime.min.time()) - timedelta(
+                        days=rng.randint(1, 30), minutes=rng.randint(0, 1439))
+                created += 1
+                yield (student_id, job_id, status, applied_on)
+
+    insert_rows(cursor, "INSERT INTO Applications (student_id, job_id, status, applied_on) "
+                        "VALUES (%s, %s, %s, %s)", application_rows())
+
+    log("Loading note folders and notes...")
+    insert_rows(cursor, "INSERT INTO Note_Folders (student_id, folder_name) VALUES (%s, 'General Notes')",
+                ((student_id,) for student_id in range(1, students + 1)))
+    reader = connection.cursor()
+
+    def app_owners():
+        # Keyset-paged, so only one batch of applications is held in memory at a time
+        last_id = 0
+        while True:
+            reader.execute("SELECT application_id, student_id FROM Applications WHERE application_id > %s "
+                           "ORDER BY application_id LIMIT %s", (last_id, BATCH_SIZE))
+            rows = reader.fetchall()
+            if not rows:
+                return
+            yield from rows
+            last_id = rows[-1][0]
+
+    # One folder per student, inserted in student order, so folder_id == student_id
+    def note_rows():
+        for application_id, student_id in app_owners():
+            for _ in range(int(rng.expovariate(1 / notes_per_application)) if notes_per_application else 0):
+                created_at = now - timedelta(minutes=rng.randint(0, 525600))
+                yield (application_id, student_id, student_id, f"Prep note for application {application_id}",
+                       created_at)
+
+    insert_rows(cursor, "INSERT INTO Notes (application_id, student_id, folder_id, note_text, created_at) "
+                        "VALUES (%s, %s, %s, %s, %s)", note_rows())
+    reader.close()
+
+    # Alerts exactly as Alert_Generator_Insert would have produced them, set-based
+    log("Deriving alerts...")
+    for alert_type, column, label, statuses in (
+        ('deadline', 'deadline_date', 'DEADLINE', "('to_apply', 'applied')"),
+        ('online_assessment', 'oa_date', 'OA', "('applied')"),
+        ('interview', 'interview_date', 'INTERVIEW', "('applied')"),
+    ):
+        cursor.execute(f"""
+            INSERT INTO Alerts (student_id, application_id, alert_type, alert_date, reminder_date, message, is_sent)
+            SELECT a.student_id, a.application_id, '{alert_type}', j.{column},
+                   DATE_SUB(j.{column}, INTERVAL 2 DAY), CONCAT('{label}: ', j.role, ' at ', j.company_name),
+                   DATE_SUB(j.{column}, INTERVAL 2 DAY) < %s
+            FROM Applications a
+            JOIN Job_Postings j ON a.job_id = j.job_id
+            WHERE a.status IN {statuses} AND j.{column} IS NOT NULL
+        """, (today,))
+    connection.commit()
+
+    cursor.execute("SET unique_checks = 1, foreign_key_checks = 1")
+    log("Installing functions, procedures, triggers and views...")
+    for statement in programs:
+        cursor.execute(statement)
+
+    counts = {}
+    for table in ('Users', 'Job_Postings', 'Applications', 'Notes', 'Alerts'):
+        cursor.execute(f"SELECT COUNT(*) FROM {table}")
+        counts[table] = cursor.fetchone()[0]
+    cursor.close()
+    connection.close()
+
+    # Indexes, summary tables and the latest-note pointer, as on a migrated install
+    db.DB_CONFIG['database'] = database
+    db.reset_pool()
+    migrate(log=log)
+
+    log(f"Generated {counts} in {time.perf_counter() - started:.1f}s")
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic College Internship Tracker dataset")
+    parser.add_argument('--scale', choices=sorted(SCALES), help="preset sizes (overridden by explicit counts)")
+    parser.add_argument('--students', type=int)
+    parser.add_argument('--jobs', type=int)
+    parser.add_argument('--applications', type=int)
+    parser.add_argument('--notes-per-application', type=float, default=0.5)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--base-date', type=date.fromisoformat, help="YYYY-MM-DD the dates are drawn around (default: today)")
+    parser.add_argument('--database', default=f"{db.DB_CONFIG['database']}_bench")
+    args = parser.parse_args(argv)
+
+    sizes = dict(SCALES[args.scale or 'small'])
+    for key in sizes:
+        if getattr(args, key) is not None:
+            sizes[key] = getattr(args, key)
+
+    generate(args.database, notes_per_application=args.notes_per_application, seed=args.seed,
+             base_date=args.base_date, **sizes)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
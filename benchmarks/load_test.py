@@ -0,0 +1,337 @@
+"""End-to-end load test: concurrent scripted sessions driving app.py.
+
+Each simulated user is a worker process that runs app.py through Streamlit's
+AppTest against a scratch database built by generate_data.py. That is the
+same script, session state and widget callbacks a browser session
+exercises, without the websocket. AppTest keeps one runtime per process,
+so sessions cannot share one. Each session therefore has its own
+connection pool and query cache, like one app.py server per user, and the
+database work per rerun reported here is an upper bound. AppTest also
+reruns the whole script where a browser would rerun only a fragment
+(a feed card, the deadline panel), so card clicks are timed as full
+dashboard reruns.
+
+Scenarios:
+    login          the login page, then submitting student credentials
+    browse         student dashboard: reload, next feed page, search, status filter, notes by folder
+    apply_burst    student: Apply / Ignore on the open cards of a feed page, one click per rerun
+    faculty_edit   faculty: open a posting's edit form and save it with the deadline moved by a day
+    analytics      faculty: the Analytics tab, live and with archived seasons
+
+Each scenario runs at every concurrency level: all sessions log in, wait on
+a barrier, then run it `--iterations` times each. The report gives, per
+scenario and level, reruns/sec across all sessions, p50/p95/p99 rerun
+latency, and the statements each rerun sent to MySQL and served from the
+query cache. Results can be written as JSON to compare one change with
+the next.
+
+apply_burst changes application statuses for good, so it only runs with
+--scale, and the dataset is generated again from the seed after every
+apply_burst level: each level, and each run, starts from the same rows.
+Without --scale it is left out of the default scenarios. faculty_edit
+moves deadlines back and forth, so it leaves them where they were. Run
+this against the scratch database only.
+
+Usage:
+    python benchmarks/generate_data.py --students 1000 --jobs 200 --applications 20000
+    python benchmarks/load_test.py --concurrency 1 4 16 --iterations 5
+    python benchmarks/load_test.py --scale small --base-date 2026-01-15 --output load.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import sys
+import time
+import traceback
+from datetime import date, datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+import db  # noqa: E402
+from generate_data import SCALES, generate  # noqa: E402
+from run_benchmarks import percentile  # noqa: E402
+
+APP_PATH = os.path.join(ROOT, 'app.py')
+APP_TIMEOUT = 120
+SEARCH_TERMS = ['software intern', 'data analyst', 'security', 'backend']
+
+
+def statement_counts():
+    """(statements sent to MySQL, cache hits, errors) recorded by this process so far"""
+    summary = db.query_summary()
+    return (
+        sum(row['calls'] - row['cache_hits'] for row in summary),
+        sum(row['cache_hits'] for row in summary),
+        sum(row['errors'] for row in summary),
+    )
+
+
+def find(widgets, label, form_id=None):
+    """The first widget with this label (inside `form_id` if given), or None"""
+    for widget in widgets:
+        if widget.label == label and (form_id is None or widget.form_id == form_id):
+            return widget
+    return None
+
+
+class Session:
+    """One simulated user: an AppTest of app.py and the cost of every rerun it triggered"""
+
+    def __init__(self, samples):
+        self.app = AppTest.from_file(APP_PATH, default_timeout=APP_TIMEOUT)
+        self.samples = samples
+
+    def rerun(self):
+        """Rerun the script with the widget changes made since the last run, and record the cost"""
+        before = statement_counts()
+        started = time.perf_counter()
+        self.app.run()
+        elapsed = (time.perf_counter() - started) * 1000
+        after = statement_counts()
+        errors = after[2] - before[2] + len(self.app.exception)
+        self.samples.append((elapsed, after[0] - before[0], after[1] - before[1], errors))
+
+    def buttons(self, prefix):
+        return [button.key for button in self.app.button if button.key and button.key.startswith(prefix)]
+
+
+def log_in(session, user):
+    session.rerun()
+    if find(session.app.text_input, "Email") is None:
+        errors = '; '.join(error.value for error in session.app.error)
+        raise RuntimeError(f"login page did not render: {errors}")
+    find(session.app.text_input, "Email").input(user['email'])
+    find(session.app.text_input, "Password").input(user['password'])
+    find(session.app.button, "Login").click()
+    session.rerun()
+    if not session.app.session_state.logged_in:
+        raise RuntimeError(f"could not log in as {user['email']}")
+
+
+# Scenarios whose writes are not undone; they need a freshly generated dataset per level
+DESTRUCTIVE_SCENARIOS = {'apply_burst'}
+
+# Scenarios: one iteration each; `step` is unique per session and iteration
+def login(session, user, step):
+    log_in(Session(session.samples), user)
+
+
+def browse(session, user, step):
+    app = session.app
+    session.rerun()
+    more = find(app.button, "Load more")
+    if more is not None:
+        more.click()
+        session.rerun()
+    app.text_input(key='feed_search').input(SEARCH_TERMS[step % len(SEARCH_TERMS)])
+    session.rerun()
+    app.text_input(key='feed_search').input('')
+    session.rerun()
+    app.selectbox(key='feed_status').select('Not applied')
+    session.rerun()
+    app.selectbox(key='feed_status').select('All')
+    session.rerun()
+    app.toggle(key='notes_browser').set_value(True)
+    session.rerun()
+    app.toggle(key='notes_browser').set_value(False)
+    session.rerun()
+
+
+def apply_burst(session, user, step, burst=6):
+    app = session.app
+    session.rerun()
+    job_ids = [key.split('_')[1] for key in session.buttons('apply_')]
+    if not job_ids:
+        # Everything on this page is decided; move on to the next one
+        more = find(app.button, "Load more")
+        if more is not None:
+            more.click()
+            session.rerun()
+            job_ids = [key.split('_')[1] for key in session.buttons('apply_')]
+    for n, job_id in enumerate(job_ids[:burst]):
+        app.button(key=f"{'apply' if n % 2 == 0 else 'ignore'}_{job_id}").click()
+        session.rerun()
+
+
+def faculty_edit(session, user, step):
+    app = session.app
+    session.rerun()
+    keys = session.buttons('edit_')
+    if not keys:
+        return
+    key = keys[step % len(keys)]
+    app.button(key=key).click()
+    session.rerun()
+
+    # Alternate the direction on each visit to a posting, so repeated runs leave the dates where they were
+    form_id = f"edit_form_{key.split('_')[1]}"
+    shift = timedelta(days=1 if (step // len(keys)) % 2 == 0 else -1)
+    deadline = find(app.date_input, "Deadline", form_id)
+    deadline.set_value(deadline.value + shift)
+    find(app.button, "Update", form_id).click()
+    session.rerun()
+
+
+def analytics(session, user, step):
+    app = session.app
+    session.rerun()
+    app.toggle(key='analytics_include_archived').set_value(True)
+    session.rerun()
+    app.toggle(key='analytics_include_archived').set_value(False)
+    session.rerun()
+
+
+SCENARIOS = {
+    'login': (login, 'student'),
+    'browse': (browse, 'student'),
+    'apply_burst': (apply_burst, 'student'),
+    'faculty_edit': (faculty_edit, 'faculty'),
+    'analytics': (analytics, 'faculty'),
+}
+
+
+def worker(scenario, user, index, iterations, start, results):
+    """Log in, wait for every session to be ready, then run the scenario; reports through `results`"""
+    try:
+        run, _ = SCENARIOS[scenario]
+        session = Session([])
+        log_in(session, user)
+        session.samples = []
+        start.wait()
+        started = time.perf_counter()
+        for iteration in range(iterations):
+            run(session, user, index * iterations + iteration)
+        results.put({'samples': session.samples, 'elapsed': time.perf_counter() - started})
+    except Exception:
+        start.abort()
+        results.put({'error': f"session {index} ({user['email']}):\n{traceback.format_exc()}"})
+
+
+def users(role, count):
+    """Credentials of the first `count` generated users with this role, cycling if there are fewer"""
+    prefix, domain, password = {
+        'student': ('student', 'student.college.edu', 'STUDENT'),
+        'faculty': ('faculty', 'college.edu', 'FACULTY'),
+    }[role]
+    available = db.execute_query("SELECT COUNT(*) as users FROM Users WHERE role = %s", (role,))[0]['users']
+    return [
+        {'email': f"{prefix}{n % available + 1}@{domain}", 'password': f"{password}{n % available + 1}"}
+        for n in range(count)
+    ]
+
+
+def run_level(context, scenario, concurrency, iterations):
+    """Run `concurrency` sessions of a scenario side by side and summarize their reruns"""
+    start = context.Barrier(concurrency)
+    results = context.Queue()
+    processes = [
+        context.Process(target=worker, args=(scenario, user, index, iterations, start, results))
+        for index, user in enumerate(users(SCENARIOS[scenario][1], concurrency))
+    ]
+    for process in processes:
+        process.start()
+    reports = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    failures = [report['error'] for report in reports if 'error' in report]
+    if failures:
+        raise RuntimeError(failures[0])
+
+    samples = [sample for report in reports for sample in report['samples']]
+    if not samples:
+        raise RuntimeError(f"{scenario} triggered no reruns")
+    latencies = sorted(sample[0] for sample in samples)
+    return {
+        'sessions': concurrency,
+        'reruns': len(samples),
+        'reruns_per_sec': round(len(samples) / max(report['elapsed'] for report in reports), 2),
+        'p50_ms': round(statistics.median(latencies), 2),
+        'p95_ms': round(percentile(latencies, 95), 2),
+        'p99_ms': round(percentile(latencies, 99), 2),
+        'queries_per_rerun': round(sum(sample[1] for sample in samples) / len(samples), 2),
+        'cache_hits_per_rerun': round(sum(sample[2] for sample in samples) / len(samples), 2),
+        'errors': sum(sample[3] for sample in samples),
+    }
+
+
+def print_row(scenario, result):
+    print(f"  {scenario:<13} {result['sessions']:>4}  {result['reruns']:>6}  {result['reruns_per_sec']:>9.2f}  "
+          f"{result['p50_ms']:>9.1f}  {result['p95_ms']:>9.1f}  {result['p99_ms']:>9.1f}  "
+          f"{result['queries_per_rerun']:>9.2f}  {result['cache_hits_per_rerun']:>9.2f}  {result['errors']:>6}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scenarios', nargs='+', choices=list(SCENARIOS),
+                        help="default: all, without apply_burst unless --scale is given")
+    parser.add_argument('--concurrency', nargs='+', type=int, default=[1, 4, 16],
+                        help="simultaneous sessions; each level is run separately")
+    parser.add_argument('--iterations', type=int, default=5, help="scenario runs per session")
+    parser.add_argument('--database', default=f"{db.DB_CONFIG['database']}_bench")
+    parser.add_argument('--scale', choices=sorted(SCALES),
+                        help="generate --database at this scale first (default: use it as it is)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--base-date', type=date.fromisoformat,
+                        help="YYYY-MM-DD the generated dates are drawn around (default: today)")
+    parser.add_argument('--output', help="write results as JSON to this file")
+    args = parser.parse_args(argv)
+    if args.scenarios is None:
+        args.scenarios = [name for name in SCENARIOS if args.scale or name not in DESTRUCTIVE_SCENARIOS]
+    elif not args.scale and DESTRUCTIVE_SCENARIOS & set(args.scenarios):
+        parser.error("apply_burst changes application statuses for good; it needs --scale to regenerate the dataset")
+
+    def generate_dataset():
+        print(f"Generating '{args.scale}' dataset {SCALES[args.scale]}...")
+        generate(args.database, seed=args.seed, base_date=args.base_date, log=lambda message: None,
+                 **SCALES[args.scale])
+        db.reset_pool()
+
+    if args.scale:
+        generate_dataset()
+    db.DB_CONFIG['database'] = args.database
+    db.reset_pool()
+
+    # Sessions are fresh processes that configure themselves from the environment, as app.py would
+    os.environ['DB_NAME'] = args.database
+    os.environ['AUTO_MIGRATE'] = '0'
+    context = multiprocessing.get_context('spawn')
+
+    report = {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'server': db.get_server_info(),
+        'database': args.database,
+        'iterations': args.iterations,
+        'results': {},
+    }
+    print(f"Load test against '{args.database}', {args.iterations} iterations per session\n")
+    print(f"  {'scenario':<13} {'sess':>4}  {'reruns':>6}  {'reruns/s':>9}  {'p50 ms':>9}  {'p95 ms':>9}  "
+          f"{'p99 ms':>9}  {'queries':>9}  {'cached':>9}  {'errors':>6}")
+    dirty = False
+    for scenario in args.scenarios:
+        report['results'][scenario] = []
+        for concurrency in args.concurrency:
+            # Whatever runs after an apply_burst level gets the seeded dataset back first
+            if dirty:
+                generate_dataset()
+            dirty = scenario in DESTRUCTIVE_SCENARIOS
+            result = run_level(context, scenario, concurrency, args.iterations)
+            report['results'][scenario].append(result)
+            print_row(scenario, result)
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=2)
+        print(f"\nWrote {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
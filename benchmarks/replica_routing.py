@@ -0,0 +1,102 @@
+"""Read/write splitting check for db.py's replica routing.
+
+Routes a burst of reads, then writes a token row on the primary and reads it
+straight back: the read must be pinned to the primary (read-your-writes) and
+see the token. It then waits until a replica serves the token too, which
+gives the observed replication delay, and prints the routing counters and
+per-replica state from replica_stats().
+
+Works against two local MySQL instances set up as primary and replica, or
+with the primary itself standing in as a replica (the default), which
+exercises the routing without real replication.
+
+Usage:
+    python benchmarks/replica_routing.py                          # DB_REPLICA_HOSTS or DB_HOST as stand-in
+    python benchmarks/replica_routing.py --replica 127.0.0.1:3307 --reads 200
+
+The check creates and drops a scratch table, Replica_Routing_Check, in the
+configured database.
+"""
+import argparse
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import db  # noqa: E402
+
+CHECK_TABLE = 'Replica_Routing_Check'
+
+
+def read_token(token):
+    return db.execute_query(f"SELECT token FROM {CHECK_TABLE} WHERE token = %s", (token,))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--replica', action='append', help="host[:port] of a read replica (repeatable)")
+    parser.add_argument('--reads', type=int, default=100)
+    parser.add_argument('--max-wait', type=float, default=30.0, help="seconds to wait for a replica to catch up")
+    args = parser.parse_args(argv)
+
+    def raise_error(message):
+        raise RuntimeError(message)
+
+    db.set_error_reporter(raise_error)
+    db.configure_replicas(args.replica or db.REPLICA_HOSTS or [db.DB_CONFIG['host']])
+    db.set_session(f"replica-check-{uuid.uuid4().hex}")
+
+    failures = []
+    db.execute_query(f"CREATE TABLE IF NOT EXISTS {CHECK_TABLE} (token CHAR(32) PRIMARY KEY)", fetch=False)
+    try:
+        # Let the table creation age out of the read-your-writes window before measuring routing
+        time.sleep(db.READ_YOUR_WRITES_SECONDS)
+        before = db.replica_stats()['routing']
+        for _ in range(args.reads):
+            db.execute_query("SELECT 1")
+        after = db.replica_stats()['routing']
+        routed = after['replica_reads'] - before['replica_reads']
+        print(f"{routed} of {args.reads} reads served by replicas")
+        if routed == 0:
+            failures.append("no reads reached a replica")
+
+        token = uuid.uuid4().hex
+        db.execute_query(f"INSERT INTO {CHECK_TABLE} (token) VALUES (%s)", (token,), fetch=False)
+        sticky_before = db.replica_stats()['routing']['sticky_reads']
+        if not read_token(token):
+            failures.append("read straight after the write did not see it")
+        if db.replica_stats()['routing']['sticky_reads'] == sticky_before:
+            failures.append("read straight after the write was not pinned to the primary")
+        print("Read-your-writes: token visible on the pinned read")
+
+        # Outside the window reads go back to replicas; poll until one of them has the row
+        time.sleep(db.READ_YOUR_WRITES_SECONDS)
+        written = time.monotonic()
+        while not read_token(token):
+            if time.monotonic() - written > args.max_wait:
+                failures.append(f"replicas did not see the write within {args.max_wait:.0f}s")
+                break
+            time.sleep(0.1)
+        else:
+            print(f"Replicas caught up within {time.monotonic() - written:.1f}s of the window closing")
+    finally:
+        db.execute_query(f"DROP TABLE IF EXISTS {CHECK_TABLE}", fetch=False)
+
+    stats = db.replica_stats()
+    print(f"\nRouting: {stats['routing']}")
+    for replica in stats['replicas']:
+        print(f"  {replica['replica']:<25} state={replica['state']:<10} lag={replica['lag_s']}s "
+              f"reads={replica['reads']} failures={replica['failures']}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,287 @@
+"""Query benchmark suite for the College Internship Tracker at realistic scale.
+
+For each requested scale, generates a seeded dataset with generate_data.py
+(or reuses an existing one with --reuse), then times every query path the
+app uses against it: the student feed, search and dashboard reads, the
+faculty and analytics reads, Set_Application_Status (which fires the alert triggers),
+View_Job_Analytics, note inserts (Notes_Latest_Pointer) and job date edits
+(Update_Alerts_On_Job_Update). The query cache is cleared before every call
+so each sample hits MySQL.
+
+Results are written as JSON; pass an earlier file with --compare to flag
+operations whose p50 regressed beyond --threshold. A comparison run
+regenerates its datasets with the baseline's base date
+(unless --base-date is given), so both runs time the same rows.
+
+Usage:
+    python benchmarks/run_benchmarks.py --scales small medium --output baseline.json
+    python benchmarks/run_benchmarks.py --scales large --compare baseline.json
+    python benchmarks/run_benchmarks.py --reuse --database internship_bench --output run.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import db  # noqa: E402
+import queries  # noqa: E402
+from generate_data import SCALES, generate  # noqa: E402
+
+
+class Workload:
+    """Random but reproducible arguments drawn from the benchmark database"""
+
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+        self.students = [row['user_id'] for row in db.execute_query(
+            "SELECT user_id FROM Users WHERE role = 'student' ORDER BY user_id")]
+        self.faculty_id = db.execute_query(
+            "SELECT user_id FROM Users WHERE role = 'faculty' ORDER BY user_id LIMIT 1")[0]['user_id']
+        self.jobs = [row['job_id'] for row in db.execute_query("SELECT job_id FROM Job_Postings ORDER BY job_id")]
+        # The most-tracked job is the worst case for the job update trigger
+        self.busiest_job = db.execute_query("""
+            SELECT job_id, COUNT(*) AS apps FROM Applications
+            GROUP BY job_id ORDER BY apps DESC LIMIT 1
+        """)[0]
+
+    def student(self):
+        return self.rng.choice(self.students)
+
+    def job(self):
+        return self.rng.choice(self.jobs)
+
+    def application(self):
+        student_id = self.student()
+        rows = db.execute_query(
+            "SELECT application_id, job_id FROM Applications WHERE student_id = %s LIMIT 1", (student_id,))
+        if not rows:
+            return self.application()
+        return student_id, rows[0]['application_id'], rows[0]['job_id']
+
+
+def view_job_analytics(user_id, job_id):
+    """CALL View_Job_Analytics and read its result set, as a reporting client would"""
+    with db.pooled_connection() as connection:
+        cursor = connection.cursor(dictionary=True)
+        try:
+            cursor.callproc('View_Job_Analytics', [user_id, job_id])
+            return [result.fetchall() for result in cursor.stored_results()]
+        finally:
+            cursor.close()
+
+
+def move_job_dates(job_id, days):
+    """Shift every date on a job so Update_Alerts_On_Job_Update rewrites all of its alerts"""
+    job = db.execute_query("SELECT * FROM Job_Postings WHERE job_id = %s", (job_id,))[0]
+    shift = timedelta(days=days)
+    return queries.update_job_posting(
+        job_id, job['company_name'], job['role'], job['description'], job['jd_link'],
+        job['deadline_date'] + shift,
+        job['oa_date'] + shift if job['oa_date'] else None,
+        job['interview_date'] + shift if job['interview_date'] else None,
+    )
+
+
+def operations(workload):
+    """(name, setup) pairs; setup draws arguments untimed and returns the call to time"""
+    statuses = ['to_apply', 'applied', 'done', 'ignored']
+    flip = iter(range(sys.maxsize))
+
+    def feed_first_page():
+        student_id = workload.student()
+        return lambda: queries.get_available_jobs(student_id)
+
+    def feed_filtered():
+        student_id = workload.student()
+        filters = {'company': 'Tech', 'status': 'Not applied', 'deadline_within': 30}
+        return lambda: queries.get_available_jobs(student_id, filters)
+
+    def search():
+        student_id = workload.student()
+        text = workload.rng.choice(['software intern', 'data analyst', 'security'])
+        return lambda: queries.search_jobs(student_id, text)
+
+    def dashboard():
+        student_id = workload.student()
+        return lambda: queries.load_student_dashboard(student_id)
+
+    def student_stats():
+        student_id = workload.student()
+        return lambda: queries.get_student_stats(student_id)
+
+    def upcoming_deadlines():
+        student_id = workload.student()
+        return lambda: queries.get_upcoming_deadlines(student_id)
+
+    def all_jobs():
+        return queries.get_all_jobs
+
+    def analytics():
+        return lambda: queries.get_analytics_data(workload.faculty_id)
+
+    def status_update():
+        student_id, _, job_id = workload.application()
+        status = statuses[next(flip) % len(statuses)]
+        return lambda: queries.set_application_status(student_id, job_id, status)
+
+    def status_insert():
+        student_id = workload.student()
+        rows = db.execute_query("""
+            SELECT j.job_id FROM Job_Postings j
+            LEFT JOIN Applications a ON a.job_id = j.job_id AND a.student_id = %s
+            WHERE a.application_id IS NULL
+            LIMIT 1
+        """, (student_id,))
+        job_id = rows[0]['job_id'] if rows else workload.job()
+        return lambda: queries.set_application_status(student_id, job_id, 'applied')
+
+    def job_analytics():
+        job_id = workload.job()
+        return lambda: view_job_analytics(workload.faculty_id, job_id)
+
+    def note_insert():
+        student_id, application_id, _ = workload.application()
+        return lambda: queries.add_note(application_id, student_id, "Benchmark note")
+
+    def job_date_edit():
+        days = 1 if next(flip) % 2 else -1
+        return lambda: move_job_dates(workload.busiest_job['job_id'], days)
+
+    return [
+        ('get_available_jobs', feed_first_page),
+        ('get_available_jobs (filtered)', feed_filtered),
+        ('search_jobs', search),
+        ('load_student_dashboard', dashboard),
+        ('get_student_stats', student_stats),
+        ('get_upcoming_deadlines', upcoming_deadlines),
+        ('get_all_jobs', all_jobs),
+        ('get_job_funnel', lambda: queries.get_job_funnel),
+        ('get_analytics_data', analytics),
+        ('View_Job_Analytics', job_analytics),
+        ('Set_Application_Status (update triggers)', status_update),
+        ('Set_Application_Status (insert triggers)', status_insert),
+        ('add_note (latest note trigger)', note_insert),
+        ('Update_Alerts_On_Job_Update', job_date_edit),
+    ]
+
+
+def percentile(samples, pct):
+    return samples[min(len(samples) - 1, max(0, int(round(len(samples) * pct / 100)) - 1))]
+
+
+def time_operation(setup, iterations):
+    samples = []
+    for _ in range(iterations):
+        call = setup()
+        db.query_cache.clear()
+        start = time.perf_counter()
+        call()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        'iterations': iterations,
+        'p50_ms': round(statistics.median(samples), 3),
+        'p95_ms': round(percentile(samples, 95), 3),
+        'max_ms': round(samples[-1], 3),
+        'mean_ms': round(statistics.fmean(samples), 3),
+    }
+
+
+def run_suite(iterations, seed, log=print):
+    workload = Workload(seed)
+    db.execute_query("SELECT 1")  # warm the pool so connection setup is not measured
+    results = {}
+    for name, setup in operations(workload):
+        results[name] = time_operation(setup, iterations)
+        log(f"  {name:<45}p50 {results[name]['p50_ms']:>9.2f} ms   p95 {results[name]['p95_ms']:>9.2f} ms")
+    return results
+
+
+def compare(baseline, current, threshold):
+    """List (scale, operation, old p50, new p50) where p50 grew by more than `threshold` times"""
+    regressions = []
+    for scale, run in current['scales'].items():
+        previous = baseline.get('scales', {}).get(scale)
+        if not previous:
+            continue
+        for name, timing in run['results'].items():
+            old = previous['results'].get(name)
+            if old and old['p50_ms'] > 0 and timing['p50_ms'] > old['p50_ms'] * threshold:
+                regressions.append((scale, name, old['p50_ms'], timing['p50_ms']))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the app's queries against synthetic data")
+    parser.add_argument('--scales', nargs='+', choices=sorted(SCALES), default=['small'])
+    parser.add_argument('--reuse', action='store_true', help="benchmark --database as is instead of generating it")
+    parser.add_argument('--database', default=f"{db.DB_CONFIG['database']}_bench")
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--base-date', type=date.fromisoformat,
+                        help="YYYY-MM-DD the generated dates are drawn around (default: the --compare baseline's, else today)")
+    parser.add_argument('--output', help="write results as JSON to this file")
+    parser.add_argument('--compare', help="earlier JSON results to check for regressions")
+    parser.add_argument('--threshold', type=float, default=1.25, help="p50 ratio counted as a regression")
+    args = parser.parse_args(argv)
+
+    # Benchmark failures should stop the run, not be swallowed as UI errors
+    def raise_error(message):
+        raise RuntimeError(message)
+
+    db.set_error_reporter(raise_error)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as previous:
+            baseline = json.load(previous)
+    base_date = args.base_date
+    if base_date is None:
+        base_date = date.fromisoformat(baseline['base_date']) if baseline and baseline.get('base_date') else date.today()
+
+    scales = ['existing'] if args.reuse else args.scales
+    report = {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'seed': args.seed,
+        'base_date': base_date.isoformat(),
+        'iterations': args.iterations,
+        'scales': {},
+    }
+    for scale in scales:
+        if args.reuse:
+            db.DB_CONFIG['database'] = args.database
+            db.reset_pool()
+            counts = None
+        else:
+            print(f"Generating '{scale}' dataset {SCALES[scale]}...")
+            counts = generate(args.database, seed=args.seed, base_date=base_date, log=lambda message: None,
+                              **SCALES[scale])
+        report['server'] = db.get_server_info()
+        print(f"Benchmarking '{scale}' ({args.database}):")
+        report['scales'][scale] = {'rows': counts, 'results': run_suite(args.iterations, args.seed)}
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=2)
+        print(f"Wrote {args.output}")
+
+    if baseline is not None:
+        regressions = compare(baseline, report, args.threshold)
+        for scale, name, old, new in regressions:
+            print(f"REGRESSION [{scale}] {name}: p50 {old:.2f} ms -> {new:.2f} ms")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.2f}x against {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
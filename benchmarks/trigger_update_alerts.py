@@ -0,0 +1,275 @@
+"""Correctness check and timing benchmark for Update_Alerts_On_Job_Update.
+
+Seeds a scratch database with jobs that each have many applications (mixed
+statuses, every alert type), then replays the same sequence of job date edits
+once with the original cursor-based trigger and once with the set-based
+trigger from migrations.py. The resulting Alerts tables must be identical;
+the time taken by each edit is reported for both.
+
+Usage:
+    python benchmarks/trigger_update_alerts.py [--apps-per-job 10000] [--jobs 3]
+
+The scratch database (default: <DB_NAME>_trigger_bench) is dropped and
+recreated, so the configured user needs CREATE/DROP DATABASE privileges.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+import mysql.connector
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db import DB_CONFIG  # noqa: E402
+from migrations import UPDATE_ALERTS_ON_JOB_UPDATE  # noqa: E402
+
+SCHEMA = [
+    """CREATE TABLE Users (
+        user_id INT PRIMARY KEY AUTO_INCREMENT,
+        name VARCHAR(100) NOT NULL,
+        email VARCHAR(100) UNIQUE NOT NULL,
+        role ENUM('student', 'faculty', 'admin') NOT NULL,
+        password_hash VARCHAR(255) NOT NULL
+    )""",
+    """CREATE TABLE Job_Postings (
+        job_id INT PRIMARY KEY AUTO_INCREMENT,
+        company_name VARCHAR(150) NOT NULL,
+        role VARCHAR(100) NOT NULL,
+        description TEXT,
+        jd_link VARCHAR(255),
+        deadline_date DATE NOT NULL,
+        oa_date DATE,
+        interview_date DATE,
+        posted_by INT,
+        FOREIGN KEY (posted_by) REFERENCES Users(user_id)
+    )""",
+    """CREATE TABLE Applications (
+        application_id INT PRIMARY KEY AUTO_INCREMENT,
+        student_id INT NOT NULL,
+        job_id INT NOT NULL,
+        status ENUM('to_apply','applied', 'done', 'ignored') NOT NULL DEFAULT 'to_apply',
+        applied_on DATETIME DEFAULT NULL,
+        last_updated DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+        FOREIGN KEY (student_id) REFERENCES Users(user_id),
+        FOREIGN KEY (job_id) REFERENCES Job_Postings(job_id)
+    )""",
+    """CREATE TABLE Alerts (
+        alert_id INT PRIMARY KEY AUTO_INCREMENT,
+        student_id INT NOT NULL,
+        application_id INT NOT NULL,
+        alert_type ENUM('deadline', 'online_assessment', 'interview') NOT NULL,
+        alert_date DATE NOT NULL,
+        reminder_date DATE NOT NULL,
+        message VARCHAR(255) NOT NULL,
+        is_sent BOOLEAN DEFAULT FALSE,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (student_id) REFERENCES Users(user_id),
+        FOREIGN KEY (application_id) REFERENCES Applications(application_id),
+        UNIQUE KEY (application_id, alert_type)
+    )""",
+]
+
+# The original trigger from college_internship_tracker.sql, kept as the reference implementation
+LEGACY_TRIGGER = """
+CREATE TRIGGER Update_Alerts_On_Job_Update
+AFTER UPDATE ON Job_Postings
+FOR EACH ROW
+BEGIN
+    DECLARE v_application_id INT;
+    DECLARE done INT DEFAULT FALSE;
+
+    DECLARE app_cursor CURSOR FOR
+        SELECT application_id
+        FROM Applications
+        WHERE job_id = NEW.job_id
+          AND status IN ('to_apply', 'applied');
+
+    DECLARE CONTINUE HANDLER FOR NOT FOUND SET done = TRUE;
+
+    IF NEW.deadline_date <> OLD.deadline_date OR
+       NEW.oa_date <> OLD.oa_date OR
+       NEW.interview_date <> OLD.interview_date
+    THEN
+        OPEN app_cursor;
+
+        read_loop: LOOP
+            FETCH app_cursor INTO v_application_id;
+
+            IF done THEN
+                LEAVE read_loop;
+            END IF;
+
+            IF NEW.deadline_date <> OLD.deadline_date THEN
+                UPDATE Alerts
+                SET
+                    alert_date = NEW.deadline_date,
+                    reminder_date = DATE_SUB(NEW.deadline_date, INTERVAL 2 DAY),
+                    is_sent = FALSE
+                WHERE application_id = v_application_id AND alert_type = 'deadline';
+            END IF;
+
+            IF NEW.oa_date <> OLD.oa_date THEN
+                UPDATE Alerts
+                SET
+                    alert_date = NEW.oa_date,
+                    reminder_date = DATE_SUB(NEW.oa_date, INTERVAL 2 DAY),
+                    is_sent = FALSE
+                WHERE application_id = v_application_id AND alert_type = 'online_assessment';
+            END IF;
+
+            IF NEW.interview_date <> OLD.interview_date THEN
+                UPDATE Alerts
+                SET
+                    alert_date = NEW.interview_date,
+                    reminder_date = DATE_SUB(NEW.interview_date, INTERVAL 2 DAY),
+                    is_sent = FALSE
+                WHERE application_id = v_application_id AND alert_type = 'interview';
+            END IF;
+
+        END LOOP;
+
+        CLOSE app_cursor;
+    END IF;
+END
+"""
+
+# Job edits replayed against both triggers: (description, SET clause)
+EDITS = [
+    ("move deadline", "deadline_date = DATE_ADD(deadline_date, INTERVAL 3 DAY)"),
+    ("move OA", "oa_date = DATE_ADD(oa_date, INTERVAL 1 DAY)"),
+    ("move interview", "interview_date = DATE_ADD(interview_date, INTERVAL 5 DAY)"),
+    ("move all dates", "deadline_date = DATE_SUB(deadline_date, INTERVAL 1 DAY), "
+                       "oa_date = DATE_SUB(oa_date, INTERVAL 1 DAY), "
+                       "interview_date = DATE_SUB(interview_date, INTERVAL 1 DAY)"),
+    ("edit description only", "description = CONCAT(description, ' (updated)')"),
+]
+
+STATUSES = ['to_apply', 'applied', 'done', 'ignored']
+BATCH_SIZE = 5000
+
+
+def insert_batched(cursor, query, rows):
+    for start in range(0, len(rows), BATCH_SIZE):
+        cursor.executemany(query, rows[start:start + BATCH_SIZE])
+
+
+def seed(connection, jobs, apps_per_job, seed_value):
+    """Recreate the scratch tables and load a deterministic dataset"""
+    rng = random.Random(seed_value)
+    cursor = connection.cursor()
+    for table in ('Alerts', 'Applications', 'Job_Postings', 'Users'):
+        cursor.execute(f"DROP TABLE IF EXISTS {table}")
+    for statement in SCHEMA:
+        cursor.execute(statement)
+
+    students = [(f"Student {i}", f"student{i}@bench.edu", 'student', 'x') for i in range(apps_per_job)]
+    insert_batched(cursor, "INSERT INTO Users (name, email, role, password_hash) VALUES (%s, %s, %s, %s)",
+                   [("Bench Faculty", "faculty@bench.edu", 'faculty', 'x')] + students)
+
+    cursor.executemany(
+        "INSERT INTO Job_Postings (company_name, role, description, deadline_date, oa_date, interview_date, posted_by) "
+        "VALUES (%s, 'Intern', 'Benchmark job', '2030-01-15', '2030-01-20', '2030-02-01', 1)",
+        [(f"Company {j}",) for j in range(jobs)]
+    )
+
+    applications = []
+    for job_id in range(1, jobs + 1):
+        for student in range(apps_per_job):
+            applications.append((student + 2, job_id, rng.choice(STATUSES)))
+    insert_batched(cursor, "INSERT INTO Applications (student_id, job_id, status) VALUES (%s, %s, %s)",
+                   applications)
+
+    # One alert of every type per application (including inactive ones, which must stay untouched)
+    for alert_type, column in (('deadline', 'deadline_date'), ('online_assessment', 'oa_date'),
+                               ('interview', 'interview_date')):
+        cursor.execute(f"""
+            INSERT INTO Alerts (student_id, application_id, alert_type, alert_date, reminder_date, message, is_sent)
+            SELECT a.student_id, a.application_id, '{alert_type}', j.{column},
+                   DATE_SUB(j.{column}, INTERVAL 2 DAY), 'bench', (a.application_id % 3 = 0)
+            FROM Applications a JOIN Job_Postings j ON a.job_id = j.job_id
+        """)
+    connection.commit()
+    cursor.close()
+
+
+def install_trigger(connection, trigger_sql):
+    cursor = connection.cursor()
+    cursor.execute("DROP TRIGGER IF EXISTS Update_Alerts_On_Job_Update")
+    cursor.execute(trigger_sql)
+    cursor.close()
+
+
+def run_edits(connection, job_id):
+    """Apply every edit to one job, returning the elapsed seconds per edit"""
+    timings = []
+    cursor = connection.cursor()
+    for _, set_clause in EDITS:
+        start = time.perf_counter()
+        cursor.execute(f"UPDATE Job_Postings SET {set_clause} WHERE job_id = %s", (job_id,))
+        connection.commit()
+        timings.append(time.perf_counter() - start)
+    cursor.close()
+    return timings
+
+
+def snapshot_alerts(connection):
+    cursor = connection.cursor()
+    cursor.execute("""
+        SELECT alert_id, application_id, alert_type, alert_date, reminder_date, is_sent
+        FROM Alerts ORDER BY alert_id
+    """)
+    rows = cursor.fetchall()
+    cursor.close()
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--apps-per-job', type=int, default=10000)
+    parser.add_argument('--jobs', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--database', default=f"{DB_CONFIG['database']}_trigger_bench")
+    args = parser.parse_args(argv)
+
+    config = {key: value for key, value in DB_CONFIG.items() if key != 'database'}
+    connection = mysql.connector.connect(**config)
+    cursor = connection.cursor()
+    cursor.execute(f"DROP DATABASE IF EXISTS `{args.database}`")
+    cursor.execute(f"CREATE DATABASE `{args.database}`")
+    cursor.execute(f"USE `{args.database}`")
+    cursor.close()
+
+    results = {}
+    try:
+        for name, trigger_sql in (('cursor (legacy)', LEGACY_TRIGGER), ('set-based', UPDATE_ALERTS_ON_JOB_UPDATE)):
+            print(f"Seeding {args.jobs} jobs x {args.apps_per_job} applications for {name} trigger...")
+            seed(connection, args.jobs, args.apps_per_job, args.seed)
+            install_trigger(connection, trigger_sql)
+            timings = run_edits(connection, job_id=2)
+            results[name] = (timings, snapshot_alerts(connection))
+    finally:
+        cursor = connection.cursor()
+        cursor.execute(f"DROP DATABASE IF EXISTS `{args.database}`")
+        cursor.close()
+        connection.close()
+
+    (legacy_timings, legacy_alerts), (new_timings, new_alerts) = results.values()
+
+    print(f"\n{'edit':<25}{'cursor (ms)':>14}{'set-based (ms)':>17}{'speedup':>10}")
+    for (description, _), legacy, new in zip(EDITS, legacy_timings, new_timings):
+        speedup = f"{legacy / new:.1f}x" if new > 0 else "-"
+        print(f"{description:<25}{legacy * 1000:>14.1f}{new * 1000:>17.1f}{speedup:>10}")
+
+    if legacy_alerts != new_alerts:
+        mismatched = sum(1 for old, new in zip(legacy_alerts, new_alerts) if old != new)
+        print(f"\nFAIL: Alerts differ between triggers ({mismatched} rows, "
+              f"{len(legacy_alerts)} vs {len(new_alerts)} total)")
+        return 1
+    print(f"\nOK: both triggers produced identical Alerts ({len(new_alerts)} rows)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
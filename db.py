@@ -0,0 +1,916 @@
+"""Database access layer for the College Internship Tracker.
+
+Every query checks a connection out of a shared pool and returns it as soon
+as the statement finishes, so concurrent Streamlit sessions no longer queue
+behind one shared connection and a dropped connection only affects the call
+that was using it. When read replicas are configured (DB_REPLICA_HOSTS),
+reads are spread across them while writes and procedures stay on the primary.
+"""
+import contextvars
+import itertools
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeout
+from datetime import datetime
+from contextlib import contextmanager
+
+from mysql.connector import Error, errors, pooling
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Database Configuration - EDIT THESE VALUES
+DB_CONFIG = {
+    'host': os.getenv('DB_HOST'),
+    'database': os.getenv('DB_NAME'),
+    'user': os.getenv('DB_USER'),
+    'password': os.getenv('DB_PASSWORD')
+}
+
+# Pool Configuration
+POOL_NAME = 'internship_tracker'
+POOL_SIZE = min(int(os.getenv('DB_POOL_SIZE', '10')), pooling.CNX_POOL_MAXSIZE)
+POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '5'))
+
+# Query Cache Configuration
+QUERY_CACHE_TTL = float(os.getenv('QUERY_CACHE_TTL', '30'))
+QUERY_CACHE_MAX_ENTRIES = int(os.getenv('QUERY_CACHE_MAX_ENTRIES', '1024'))
+
+# Instrumentation Configuration
+SLOW_QUERY_MS = float(os.getenv('SLOW_QUERY_MS', '200'))
+QUERY_STATS_WINDOW = int(os.getenv('QUERY_STATS_WINDOW', '1000'))
+QUERY_LOG_PATH = os.getenv('QUERY_LOG_PATH')  # optional JSON-lines log of every statement
+
+# Concurrent Read Configuration
+QUERY_WORKERS = int(os.getenv('DB_QUERY_WORKERS', str(POOL_SIZE)))
+
+# Streaming Read Configuration
+STREAM_CHUNK_SIZE = int(os.getenv('DB_STREAM_CHUNK_SIZE', '5000'))
+
+# Read Replica Configuration (comma-separated host[:port] list; same database and credentials as the primary)
+REPLICA_HOSTS = [host.strip() for host in os.getenv('DB_REPLICA_HOSTS', '').split(',') if host.strip()]
+READ_YOUR_WRITES_SECONDS = float(os.getenv('READ_YOUR_WRITES_SECONDS', '5'))
+REPLICA_MAX_LAG_SECONDS = float(os.getenv('REPLICA_MAX_LAG_SECONDS', '30'))
+REPLICA_CHECK_INTERVAL = float(os.getenv('REPLICA_CHECK_INTERVAL', '5'))
+REPLICA_RETRY_SECONDS = float(os.getenv('REPLICA_RETRY_SECONDS', '30'))
+
+# Errors that mean the connection itself went away rather than the statement failing
+CONNECTION_ERRORS = (errors.OperationalError, errors.InterfaceError)
+
+
+class PoolMetrics:
+    """Thread-safe counters describing how the connection pool is used"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.reconnects = 0
+        self.in_use = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record_checkout(self, wait):
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def record_checkin(self):
+        with self._lock:
+            self.in_use -= 1
+
+    def record_failure(self):
+        with self._lock:
+            self.checkout_failures += 1
+
+    def record_reconnect(self):
+        with self._lock:
+            self.reconnects += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'checkouts': self.checkouts,
+                'checkout_failures': self.checkout_failures,
+                'reconnects': self.reconnects,
+                'in_use': self.in_use,
+                'avg_wait_ms': (self.total_wait / self.checkouts * 1000) if self.checkouts else 0.0,
+                'max_wait_ms': self.max_wait * 1000,
+            }
+
+
+class Replica:
+    """One read replica: its own connection pool, health, replication lag and read counter.
+
+    Lag is re-measured at most every REPLICA_CHECK_INTERVAL seconds, by whichever
+    thread routes a read first; a replica that cannot be reached, has stopped
+    replicating or lags more than REPLICA_MAX_LAG_SECONDS is skipped.
+    """
+
+    USABLE_STATES = ('unknown', 'ok', 'standalone')
+
+    def __init__(self, index, address):
+        host, _, port = address.partition(':')
+        self.name = address
+        self.pool_name = f"{POOL_NAME}_replica_{index}"
+        self.config = dict(DB_CONFIG, host=host, port=int(port or 3306))
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._check_lock = threading.Lock()
+        self.state = 'unknown'
+        self.lag = None
+        self.reads = 0
+        self.failures = 0
+        self.last_error = None
+        self.checked_at = 0.0
+        self.down_until = 0.0
+
+    def pool(self):
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = pooling.MySQLConnectionPool(
+                        pool_name=self.pool_name,
+                        pool_size=POOL_SIZE,
+                        pool_reset_session=True,
+                        **self.config
+                    )
+        return self._pool
+
+    def usable(self):
+        now = time.monotonic()
+        if now < self.down_until:
+            return False
+        if now - self.checked_at >= REPLICA_CHECK_INTERVAL:
+            self.check()
+        return self.state in self.USABLE_STATES
+
+    def check(self):
+        """Measure replication lag (threads that find a check already running keep the last result)"""
+        if not self._check_lock.acquire(blocking=False):
+            return
+        try:
+            self.checked_at = time.monotonic()
+            connection = self.pool().get_connection()
+            try:
+                cursor = connection.cursor(dictionary=True)
+                try:
+                    try:
+                        cursor.execute("SHOW REPLICA STATUS")
+                    except errors.ProgrammingError:
+                        cursor.execute("SHOW SLAVE STATUS")  # MySQL before 8.0.22, MariaDB before 10.5
+                    channels = cursor.fetchall()
+                finally:
+                    cursor.close()
+            finally:
+                connection.close()
+        except errors.PoolError:
+            pass  # every connection busy serving reads; check again next time
+        except errors.ProgrammingError as e:
+            # Typically missing REPLICATION CLIENT privilege: keep routing, lag unknown
+            self.state, self.lag, self.last_error = 'unknown', None, str(e)
+        except Error as e:
+            self.mark_down(e)
+        else:
+            lags = [row.get('Seconds_Behind_Source', row.get('Seconds_Behind_Master')) for row in channels]
+            if not channels:
+                # Not replicating from anything, e.g. the primary standing in for a replica in development
+                self.state, self.lag = 'standalone', 0
+            elif any(lag is None for lag in lags):
+                self.state, self.lag = 'stopped', None
+            else:
+                self.lag = max(lags)
+                self.state = 'ok' if self.lag <= REPLICA_MAX_LAG_SECONDS else 'lagging'
+        finally:
+            self._check_lock.release()
+
+    def mark_down(self, error):
+        """Take the replica out of rotation for REPLICA_RETRY_SECONDS"""
+        self.state, self.last_error = 'down', str(error)
+        self.failures += 1
+        self.down_until = time.monotonic() + REPLICA_RETRY_SECONDS
+        self.checked_at = 0.0
+        logger.warning(f"Read replica {self.name} unavailable, using the primary: {error}")
+
+    def get_connection(self):
+        """Check out a connection, or return None so the read falls back to the primary"""
+        start = time.monotonic()
+        try:
+            connection = self.pool().get_connection()
+        except errors.PoolError:
+            return None  # replica pool exhausted: spill over rather than wait
+        except Error as e:
+            self.mark_down(e)
+            return None
+        _local.pool_wait = getattr(_local, 'pool_wait', 0.0) + time.monotonic() - start
+        self.reads += 1
+        return connection
+
+    def snapshot(self):
+        return {
+            'replica': self.name,
+            'state': self.state,
+            'lag_s': self.lag,
+            'reads': self.reads,
+            'failures': self.failures,
+            'last_error': self.last_error,
+        }
+
+
+class RoutingMetrics:
+    """Where reads and writes were sent"""
+
+    ROUTES = ('writes', 'replica_reads', 'primary_reads', 'sticky_reads', 'fallback_reads')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = dict.fromkeys(self.ROUTES, 0)
+
+    def record(self, route):
+        with self._lock:
+            self.counts[route] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.counts)
+
+
+class QueryCache:
+    """Process-wide LRU cache of read results with TTL expiry and tag-based invalidation.
+
+    Each entry is tagged (e.g. 'jobs', 'student:1') so writes can drop exactly
+    the entries they affect. Tag generations guard against a read that started
+    before a write storing its stale result after the write invalidated it.
+    """
+
+    def __init__(self, ttl=QUERY_CACHE_TTL, max_entries=QUERY_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (expires_at, tags, rows)
+        self._tag_keys = {}            # tag -> set of keys
+        self._generations = {}         # tag -> invalidation counter
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(query, params):
+        return (' '.join(query.split()), tuple(params or ()))
+
+    def generation(self, tags):
+        with self._lock:
+            return tuple(self._generations.get(tag, 0) for tag in tags)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(entry[2])
+
+    def put(self, key, tags, rows, generation):
+        with self._lock:
+            if tuple(self._generations.get(tag, 0) for tag in tags) != generation:
+                return
+            self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, tags, list(rows))
+            for tag in tags:
+                self._tag_keys.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self, *tags):
+        with self._lock:
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+                for key in self._tag_keys.pop(tag, set()):
+                    if key in self._entries:
+                        self._remove(key)
+                        self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tag_keys.clear()
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[1]:
+            keys = self._tag_keys.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_keys[tag]
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits / lookups * 100) if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+            }
+
+
+_LITERALS = re.compile(r"'(?:[^'\\]|\\.)*'|\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_REPEATED_TUPLES = re.compile(r"(\([^()]*(?:\([^()]*\)[^()]*)*\))(?:\s*,\s*\1)+")
+
+
+def fingerprint(statement):
+    """Normalize a statement so calls that differ only in values group together"""
+    text = ' '.join(statement.split())
+    text = _LITERALS.sub('?', text).replace('%s', '?')
+    text = _PLACEHOLDER_LISTS.sub('(?, ...)', text)
+    return _REPEATED_TUPLES.sub(r'\1, ...', text)
+
+
+def _callers():
+    """Nearest calling function outside this module, and the outermost show_* dashboard view"""
+    # Statements run on a worker thread are attributed to the code that submitted them
+    submitted_by = getattr(_local, 'submitted_by', None)
+    if submitted_by is not None:
+        return submitted_by
+    caller = view = None
+    frame = sys._getframe(2)
+    while frame is not None:
+        code = frame.f_code
+        if code.co_filename != __file__:
+            if caller is None:
+                caller = code.co_name
+            if code.co_name.startswith('show_'):
+                view = code.co_name
+        frame = frame.f_back
+    return caller, view
+
+
+class QueryStats:
+    """Per-fingerprint timings with rolling percentiles, a slow-query log and optional JSON-lines export"""
+
+    def __init__(self, window=QUERY_STATS_WINDOW, slow_ms=SLOW_QUERY_MS, log_path=QUERY_LOG_PATH):
+        self.window = window
+        self.slow_ms = slow_ms
+        self.log_path = log_path
+        self._lock = threading.Lock()
+        self._log_lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._queries = {}
+            self.slow_queries = deque(maxlen=100)
+
+    def record(self, kind, statement, elapsed, rows=None, cache=None, error=False, pool_wait=0.0):
+        elapsed_ms = elapsed * 1000
+        key = fingerprint(statement)
+        caller, view = _callers()
+        entry = {
+            'ts': datetime.now().isoformat(timespec='milliseconds'),
+            'kind': kind,
+            'fingerprint': key,
+            'ms': round(elapsed_ms, 3),
+            'rows': rows,
+            'caller': caller,
+            'view': view,
+            'cache': cache,
+            'pool_wait_ms': round(pool_wait * 1000, 3),
+            'error': error,
+        }
+
+        with self._lock:
+            stats = self._queries.get(key)
+            if stats is None:
+                stats = self._queries[key] = {
+                    'kind': kind, 'calls': 0, 'cache_hits': 0, 'errors': 0, 'total_ms': 0.0,
+                    'rows': 0, 'samples': deque(maxlen=self.window), 'callers': set(),
+                }
+            stats['calls'] += 1
+            stats['callers'].add(view or caller)
+            if error:
+                stats['errors'] += 1
+            if cache == 'hit':
+                stats['cache_hits'] += 1
+            else:
+                # Only statements that reached the server count towards latency
+                stats['total_ms'] += elapsed_ms
+                stats['rows'] += rows or 0
+                stats['samples'].append(elapsed_ms)
+            if elapsed_ms >= self.slow_ms and cache != 'hit':
+                self.slow_queries.appendleft(entry)
+
+        if elapsed_ms >= self.slow_ms and cache != 'hit':
+            logger.warning(f"Slow {kind} ({elapsed_ms:.1f} ms, {rows} rows) from {view or caller}: {key}")
+        if self.log_path:
+            with self._log_lock, open(self.log_path, 'a') as log:
+                log.write(json.dumps(entry) + '\n')
+
+    @staticmethod
+    def _percentile(samples, pct):
+        if not samples:
+            return 0.0
+        return samples[min(len(samples) - 1, int(round(pct / 100 * (len(samples) - 1))))]
+
+    def summary(self):
+        """One row per fingerprint, slowest total time first"""
+        with self._lock:
+            rows = []
+            for key, stats in self._queries.items():
+                samples = sorted(stats['samples'])
+                executed = stats['calls'] - stats['cache_hits']
+                rows.append({
+                    'fingerprint': key,
+                    'kind': stats['kind'],
+                    'calls': stats['calls'],
+                    'cache_hits': stats['cache_hits'],
+                    'errors': stats['errors'],
+                    'total_ms': round(stats['total_ms'], 1),
+                    'p50_ms': round(self._percentile(samples, 50), 2),
+                    'p95_ms': round(self._percentile(samples, 95), 2),
+                    'p99_ms': round(self._percentile(samples, 99), 2),
+                    'avg_rows': round(stats['rows'] / executed, 1) if executed else 0,
+                    'callers': ', '.join(sorted(c for c in stats['callers'] if c)),
+                })
+        return sorted(rows, key=lambda row: row['total_ms'], reverse=True)
+
+
+pool_metrics = PoolMetrics()
+routing_metrics = RoutingMetrics()
+query_cache = QueryCache()
+query_stats = QueryStats()
+_caches = [query_cache]  # every cache invalidate_cache() reaches
+_local = threading.local()
+
+_replicas = [Replica(index, address) for index, address in enumerate(REPLICA_HOSTS)]
+_replica_turn = itertools.count()
+_session = contextvars.ContextVar('db_session', default=None)
+_last_writes = {}  # session -> monotonic time of its latest write
+_last_writes_lock = threading.Lock()
+
+_pool = None
+_pool_lock = threading.Lock()
+_executor = None
+_error_reporter = None
+
+
+def set_error_reporter(reporter):
+    """Register a callable that surfaces database errors to the user (e.g. st.error)"""
+    global _error_reporter
+    _error_reporter = reporter
+
+
+def report_error(message):
+    """Log a database error and pass it on to the registered reporter"""
+    logger.error(message)
+    if _error_reporter is not None:
+        _error_reporter(message)
+
+
+def get_pool():
+    """Create the connection pool on first use and return it"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = pooling.MySQLConnectionPool(
+                    pool_name=POOL_NAME,
+                    pool_size=POOL_SIZE,
+                    pool_reset_session=True,
+                    **DB_CONFIG
+                )
+    return _pool
+
+
+def reset_pool():
+    """Discard the pool so the next checkout connects with the current DB_CONFIG"""
+    global _pool
+    with _pool_lock:
+        _pool = None
+
+
+def configure_replicas(addresses):
+    """Replace the read replicas (host[:port] strings); an empty list sends every read to the primary"""
+    global _replicas
+    _replicas = [Replica(index, address) for index, address in enumerate(addresses)]
+
+
+def set_session(session_id):
+    """Identify the user session issuing queries in the current context, for read-your-writes routing"""
+    _session.set(session_id)
+
+
+def _note_write():
+    routing_metrics.record('writes')
+    session = _session.get()
+    if session is None or not _replicas:
+        return
+    now = time.monotonic()
+    with _last_writes_lock:
+        _last_writes[session] = now
+        if len(_last_writes) > 1000:
+            for stale in [key for key, at in _last_writes.items() if now - at >= READ_YOUR_WRITES_SECONDS]:
+                del _last_writes[stale]
+
+
+def _recently_wrote():
+    """True while the current session is inside its read-your-writes window"""
+    session = _session.get()
+    if session is None or not _replicas:
+        return False
+    last = _last_writes.get(session)
+    return last is not None and time.monotonic() - last < READ_YOUR_WRITES_SECONDS
+
+
+def _route_read():
+    """Replica for the next read, or None to use the primary"""
+    if not _replicas:
+        routing_metrics.record('primary_reads')
+        return None
+    if _recently_wrote():
+        routing_metrics.record('sticky_reads')
+        return None
+    for _ in range(len(_replicas)):
+        replica = _replicas[next(_replica_turn) % len(_replicas)]
+        if replica.usable():
+            return replica
+    routing_metrics.record('fallback_reads')
+    return None
+
+
+def read_staleness_bound():
+    """Seconds a routed read may trail the primary: 0 without replicas, else the lag a replica may reach unnoticed"""
+    if not _replicas:
+        return 0
+    return REPLICA_MAX_LAG_SECONDS + REPLICA_CHECK_INTERVAL
+
+
+def get_connection(timeout=POOL_TIMEOUT):
+    """Check a healthy connection out of the pool, waiting up to `timeout` seconds"""
+    start = time.monotonic()
+    while True:
+        try:
+            # The pool pings idle connections and reconnects stale ones on checkout
+            connection = get_pool().get_connection()
+            break
+        except errors.PoolError:
+            if time.monotonic() - start >= timeout:
+                pool_metrics.record_failure()
+                raise
+            time.sleep(0.01)
+        except Error:
+            pool_metrics.record_failure()
+            raise
+
+    wait = time.monotonic() - start
+    pool_metrics.record_checkout(wait)
+    _local.pool_wait = getattr(_local, 'pool_wait', 0.0) + wait
+    return connection
+
+
+def release_connection(connection):
+    """Return a connection to the pool"""
+    try:
+        connection.close()
+    except Error as e:
+        # A dead connection still goes back to the pool; it is reconnected on next checkout
+        logger.warning(f"Error returning connection to pool: {e}")
+    finally:
+        pool_metrics.record_checkin()
+
+
+@contextmanager
+def pooled_connection(read=False):
+    """Context manager that checks a connection out for the duration of a block.
+
+    With read=True the block may run on a read replica, unless none is usable
+    or the current session wrote within the last READ_YOUR_WRITES_SECONDS.
+    """
+    replica = _route_read() if read else None
+    connection = replica.get_connection() if replica is not None else None
+    if replica is not None:
+        routing_metrics.record('replica_reads' if connection is not None else 'fallback_reads')
+    if connection is None:
+        connection = get_connection()
+        try:
+            yield connection
+        finally:
+            release_connection(connection)
+        return
+
+    try:
+        yield connection
+    except CONNECTION_ERRORS as e:
+        replica.mark_down(e)
+        raise
+    finally:
+        try:
+            connection.close()
+        except Error as e:
+            logger.warning(f"Error returning connection to replica pool: {e}")
+
+
+@contextmanager
+def transaction():
+    """Run a block as one transaction on a pooled connection, yielding a dictionary cursor.
+
+    Commits when the block finishes and rolls back if it raises.
+    """
+    with pooled_connection() as connection:
+        cursor = connection.cursor(dictionary=True)
+        try:
+            yield cursor
+            connection.commit()
+            _note_write()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            cursor.close()
+
+
+def pool_stats():
+    """Return pool size and usage metrics"""
+    stats = pool_metrics.snapshot()
+    stats['pool_size'] = POOL_SIZE
+    stats['available'] = max(POOL_SIZE - stats['in_use'], 0)
+    return stats
+
+
+def replica_stats():
+    """Return read/write routing counters and the state and lag of each read replica"""
+    return {
+        'routing': routing_metrics.snapshot(),
+        'replicas': [replica.snapshot() for replica in _replicas],
+        'read_your_writes_s': READ_YOUR_WRITES_SECONDS,
+    }
+
+
+def create_cache(ttl, max_entries=QUERY_CACHE_MAX_ENTRIES):
+    """A further tagged cache (e.g. for rendered output) that invalidate_cache() also clears"""
+    cache = QueryCache(ttl, max_entries)
+    _caches.append(cache)
+    return cache
+
+
+def invalidate_cache(*tags):
+    """Drop every cached result carrying any of the given tags"""
+    for cache in _caches:
+        cache.invalidate(*tags)
+
+
+def cache_stats():
+    """Return query cache hit/miss counters"""
+    return query_cache.stats()
+
+
+def query_summary():
+    """Return per-query timing statistics, slowest total time first"""
+    return query_stats.summary()
+
+
+def slow_queries():
+    """Return the most recent statements slower than SLOW_QUERY_MS, newest first"""
+    return list(query_stats.slow_queries)
+
+
+def reset_query_stats():
+    query_stats.reset()
+
+
+def _record(kind, statement, started, result, cache=None):
+    rows = len(result) if isinstance(result, list) else None
+    pool_wait = getattr(_local, 'pool_wait', 0.0)
+    _local.pool_wait = 0.0
+    query_stats.record(kind, statement, time.perf_counter() - started, rows=rows, cache=cache,
+                       error=result is None or result is False, pool_wait=pool_wait)
+
+
+def execute_query(query, params=None, fetch=True, cache_tags=None):
+    """Execute a query and return results.
+
+    Reads passed `cache_tags` are served from the query cache when possible
+    and stored under those tags for later invalidation. Reads may be served
+    by a read replica; writes always go to the primary.
+    """
+    started = time.perf_counter()
+    _local.pool_wait = 0.0
+    _local.last_error = None
+    if fetch and cache_tags:
+        key = query_cache.make_key(query, params)
+        # Right after its own write a session reads from the primary, so skip entries
+        # another session may have filled from a lagging replica
+        rows = None if _recently_wrote() else query_cache.get(key)
+        if rows is not None:
+            _record('query', query, started, rows, cache='hit')
+            return rows
+        generation = query_cache.generation(cache_tags)
+        rows = _run_query(query, params, fetch)
+        if rows is not None:
+            query_cache.put(key, tuple(cache_tags), rows, generation)
+        _record('query', query, started, rows, cache='miss')
+        return rows
+    result = _run_query(query, params, fetch)
+    if not fetch and result:
+        _note_write()
+    _record('query', query, started, result)
+    return result
+
+
+def _run_query(query, params, fetch):
+    # Reads are safe to retry once on a fresh connection; writes are not
+    attempts = 2 if fetch else 1
+    for attempt in range(attempts):
+        try:
+            with pooled_connection(read=fetch) as connection:
+                cursor = connection.cursor(dictionary=True)
+                try:
+                    cursor.execute(query, params or ())
+                    if fetch:
+                        return cursor.fetchall()
+                    connection.commit()
+                    return True
+                finally:
+                    cursor.close()
+        except CONNECTION_ERRORS as e:
+            if attempt + 1 < attempts:
+                pool_metrics.record_reconnect()
+                continue
+            _local.last_error = e
+            report_error(f"Database query error: {e}")
+            return None
+        except Error as e:
+            _local.last_error = e
+            report_error(f"Database query error: {e}")
+            return None
+
+
+def _get_executor():
+    """Create the worker threads for concurrent reads on first use"""
+    global _executor
+    if _executor is None:
+        with _pool_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=QUERY_WORKERS, thread_name_prefix='db-query')
+    return _executor
+
+
+def _execute_submitted(submitted_by, kwargs):
+    _local.submitted_by = submitted_by
+    try:
+        return execute_query(**kwargs)
+    finally:
+        _local.submitted_by = None
+
+
+def execute_concurrently(statements, timeout=None):
+    """Run independent reads side by side, each on its own pooled connection.
+
+    `statements` maps a name to execute_query keyword arguments. Yields
+    (name, rows) in completion order, so callers can use each result as soon
+    as it arrives. A statement still running `timeout` seconds after
+    submission is logged and yielded with None, like a failed query; it
+    finishes in the background and its connection returns to the pool.
+    """
+    submitted_by = _callers()
+    # Each worker runs in a copy of this context so it keeps the caller's session for routing
+    futures = {
+        _get_executor().submit(contextvars.copy_context().run, _execute_submitted, submitted_by, kwargs): name
+        for name, kwargs in statements.items()
+    }
+    pending = set(futures)
+    try:
+        for future in as_completed(futures, timeout=timeout):
+            pending.discard(future)
+            yield futures[future], future.result()
+    except FuturesTimeout:
+        for future in pending:
+            if future.done():
+                yield futures[future], future.result()
+            else:
+                future.cancel()
+                logger.error(f"Query '{futures[future]}' timed out after {timeout:g}s")
+                yield futures[future], None
+
+
+def stream_query(query, params=None, chunk_size=STREAM_CHUNK_SIZE):
+    """Yield the rows of a large read as lists of at most `chunk_size` dicts.
+
+    Uses an unbuffered cursor, so rows are pulled from the server only as
+    chunks are consumed and memory stays bounded by one chunk. The connection
+    stays checked out until the generator is exhausted or closed; closing it
+    early reconnects the connection instead of reading the rest. Unlike
+    execute_query, errors are raised rather than reported: a consumer writing
+    a file must not mistake a broken stream for a complete one.
+    """
+    started = time.perf_counter()
+    _local.pool_wait = 0.0
+    total = 0
+    finished = False
+    try:
+        with pooled_connection(read=True) as connection:
+            cursor = connection.cursor(dictionary=True, buffered=False)
+            try:
+                cursor.execute(query, params or ())
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    total += len(rows)
+                    yield rows
+                finished = True
+            finally:
+                if not finished and connection.unread_result:
+                    # Abandoned part-way: the rest of the result may be huge, so drop it with the socket
+                    _reset_unread(connection)
+                else:
+                    cursor.close()
+    finally:
+        pool_wait = getattr(_local, 'pool_wait', 0.0)
+        _local.pool_wait = 0.0
+        query_stats.record('stream', query, time.perf_counter() - started, rows=total,
+                           error=not finished, pool_wait=pool_wait)
+
+
+def _reset_unread(connection):
+    """Reconnect a connection that has an unread result on it, without reading the result.
+
+    If the reconnect fails, the connection goes back to the pool closed and is
+    reconnected on its next checkout.
+    """
+    raw = getattr(connection, '_cnx', connection)  # the MySQLConnection behind a pooled one
+    raw.shutdown()
+    raw.unread_result = False
+    try:
+        raw.reconnect()
+        pool_metrics.record_reconnect()
+    except Error as e:
+        logger.warning(f"Could not reconnect after an abandoned stream: {e}")
+
+
+def call_procedure(proc_name, params, fetch=False):
+    """Call a stored procedure.
+
+    With `fetch`, returns the rows of the first result set the procedure
+    SELECTs (as dictionaries) instead of True. Returns False on error.
+    """
+    started = time.perf_counter()
+    _local.pool_wait = 0.0
+    _local.last_error = None
+    result = _run_procedure(proc_name, params, fetch)
+    _record('procedure', f"CALL {proc_name}", started, result)
+    return result
+
+
+def _run_procedure(proc_name, params, fetch):
+    try:
+        with pooled_connection() as connection:
+            cursor = connection.cursor()
+            try:
+                cursor.callproc(proc_name, params)
+                rows = True
+                if fetch:
+                    result = next(cursor.stored_results(), None)
+                    rows = [dict(zip(result.column_names, row)) for row in result.fetchall()] if result else []
+                connection.commit()
+                _note_write()
+                return rows
+            finally:
+                cursor.close()
+    except Error as e:
+        _local.last_error = e
+        report_error(f"Procedure error: {e}")
+        return False
+
+
+def last_error():
+    """The error that failed this thread's latest execute_query() or call_procedure(), or None"""
+    return getattr(_local, 'last_error', None)
+
+
+def get_server_info():
+    """Return the MySQL server version, raising if the database is unreachable"""
+    with pooled_connection() as connection:
+        return connection.get_server_info()
@@ -0,0 +1,99 @@
+"""Command-line maintenance tasks for the College Internship Tracker.
+
+Usage:
+    python manage.py migrate [--to VERSION]
+    python manage.py migrations
+    python manage.py explain VERSION
+    python manage.py rebuild-stats
+    python manage.py archive [--older-than-days 180] [--batch-size 100] [--max-batches N]
+    python manage.py archive-status
+"""
+import argparse
+import sys
+
+from archive import archive_expired, archive_status, ARCHIVE_AFTER_DAYS, ARCHIVE_BATCH_SIZE
+from migrations import (
+    migrate, migration_status, migration_plans, summarize_plan, rebuild_application_stats
+)
+
+
+def cmd_migrate(args):
+    applied = migrate(target=args.to)
+    if applied:
+        print(f"Applied {len(applied)} migration(s): {', '.join(map(str, applied))}")
+    else:
+        print("Schema is up to date.")
+
+
+def cmd_migrations(args):
+    for version, name, applied_at in migration_status():
+        state = f"applied {applied_at}" if applied_at else "pending"
+        print(f"{version:>4}  {name:<45} {state}")
+
+
+def cmd_explain(args):
+    plans = migration_plans(args.version)
+    if plans is None:
+        print(f"Migration {args.version} has not been applied.")
+        return 1
+    before, after = plans
+    for name in before:
+        print(f"{name}:")
+        print(f"  before: {summarize_plan(before[name])}")
+        print(f"  after:  {summarize_plan(after.get(name, {'error': 'not captured'}))}")
+
+
+def cmd_rebuild_stats(args):
+    rebuild_application_stats()
+    print("Analytics summary tables rebuilt.")
+
+
+def cmd_archive(args):
+    totals = archive_expired(args.older_than_days, args.batch_size, args.max_batches)
+    print("Archived " + ', '.join(f"{count} {table}" for table, count in totals.items()))
+
+
+def cmd_archive_status(args):
+    runs, counts = archive_status()
+    for table, row in counts.items():
+        print(f"{table:<14} live={row['live']:>10,} archived={row['archived']:>10,}")
+    for run in runs:
+        state = f"finished {run['finished_at']}" if run['finished_at'] else "unfinished (resumed by the next run)"
+        print(f"run {run['run_id']:>4}  cutoff {run['cutoff_date']}  {run['postings']} postings, "
+              f"{run['applications']} applications, {run['notes']} notes, {run['alerts']} alerts  {state}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="College Internship Tracker maintenance tasks")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    parser_migrate = commands.add_parser('migrate', help="apply pending schema migrations")
+    parser_migrate.add_argument('--to', type=int, default=None, help="stop after this version")
+    parser_migrate.set_defaults(func=cmd_migrate)
+
+    parser_status = commands.add_parser('migrations', help="list migrations and whether they are applied")
+    parser_status.set_defaults(func=cmd_migrations)
+
+    parser_explain = commands.add_parser('explain', help="show EXPLAIN plans recorded around a migration")
+    parser_explain.add_argument('version', type=int)
+    parser_explain.set_defaults(func=cmd_explain)
+
+    parser_stats = commands.add_parser('rebuild-stats', help="recompute the analytics summary tables")
+    parser_stats.set_defaults(func=cmd_rebuild_stats)
+
+    parser_archive = commands.add_parser('archive', help="move long-expired postings and their rows to the archive")
+    parser_archive.add_argument('--older-than-days', type=int, default=ARCHIVE_AFTER_DAYS,
+                                help="archive postings whose last event is older than this")
+    parser_archive.add_argument('--batch-size', type=int, default=ARCHIVE_BATCH_SIZE, help="postings per transaction")
+    parser_archive.add_argument('--max-batches', type=int, default=None, help="stop after this many batches")
+    parser_archive.set_defaults(func=cmd_archive)
+
+    parser_archive_status = commands.add_parser('archive-status', help="show archive runs and table sizes")
+    parser_archive_status.set_defaults(func=cmd_archive_status)
+
+    args = parser.parse_args(argv)
+    return args.func(args) or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
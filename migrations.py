@@ -0,0 +1,615 @@
+"""Versioned schema migrations for the College Internship Tracker.
+
+Migrations are applied once each, in version order, and recorded in
+Schema_Migrations together with EXPLAIN plans of the hot-path queries taken
+before and after the change. Every step is idempotent, so a migration that
+was interrupted half-way can simply be run again.
+
+Run from the app on startup, or from the command line:
+
+    python manage.py migrate
+"""
+import json
+
+from mysql.connector import Error
+
+from db import pooled_connection
+
+MIGRATIONS_TABLE = 'Schema_Migrations'
+MIGRATION_LOCK = 'college_internship_tracker_migrations'
+MIGRATION_LOCK_TIMEOUT = 60
+
+# Representative hot-path queries, EXPLAINed before and after every migration
+HOT_QUERIES = {
+    'set_application_status': (
+        "SELECT application_id FROM Applications WHERE student_id = %s AND job_id = %s",
+        (1, 1)
+    ),
+    'available_jobs': (
+        """SELECT j.job_id, a.application_id, a.status
+           FROM Job_Postings j
+           LEFT JOIN Applications a ON j.job_id = a.job_id AND a.student_id = %s
+           WHERE j.deadline_date >= CURDATE()
+           ORDER BY j.deadline_date ASC, j.job_id ASC
+           LIMIT 21""",
+        (1,)
+    ),
+    'latest_note': (
+        "SELECT note_text FROM Notes WHERE application_id = %s ORDER BY created_at DESC LIMIT 1",
+        (1,)
+    ),
+    'folder_notes': (
+        """SELECT note_id, note_text, created_at FROM Notes
+           WHERE folder_id = %s AND student_id = %s
+           ORDER BY created_at DESC, note_id DESC
+           LIMIT 21""",
+        (1, 1)
+    ),
+    'upcoming_deadlines': (
+        """SELECT a.application_id, j.deadline_date
+           FROM Applications a
+           JOIN Job_Postings j ON a.job_id = j.job_id
+           WHERE a.student_id = %s AND a.status IN ('applied', 'to_apply')
+           AND j.deadline_date >= CURDATE()
+           ORDER BY j.deadline_date ASC""",
+        (1,)
+    ),
+    'due_alerts': (
+        "SELECT alert_id FROM Alerts WHERE is_sent = FALSE AND reminder_date <= CURDATE()",
+        ()
+    ),
+    'applications_by_status': (
+        "SELECT status, COUNT(*) FROM Applications WHERE status = %s AND applied_on IS NOT NULL GROUP BY status",
+        ('applied',)
+    ),
+    'job_funnel': (
+        """SELECT job_id, COUNT(*), SUM(status = 'done')
+           FROM Applications
+           GROUP BY job_id""",
+        ()
+    ),
+    'job_search': (
+        """SELECT j.job_id FROM Job_Postings j
+           WHERE MATCH(j.company_name, j.role, j.description) AGAINST (%s IN NATURAL LANGUAGE MODE)
+           AND j.deadline_date >= CURDATE()
+           LIMIT 21""",
+        ('software intern',)
+    ),
+}
+
+
+class Migration:
+    """One schema change: an ordered list of SQL strings or callables taking a cursor"""
+
+    def __init__(self, version, name, steps):
+        self.version = version
+        self.name = name
+        self.steps = steps
+
+    def apply(self, cursor):
+        for step in self.steps:
+            if callable(step):
+                step(cursor)
+            else:
+                cursor.execute(step)
+
+
+# Idempotent step helpers
+def index_exists(cursor, table, index_name):
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s
+    """, (table, index_name))
+    return cursor.fetchone()[0] > 0
+
+
+def column_exists(cursor, table, column):
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.columns
+        WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s
+    """, (table, column))
+    return cursor.fetchone()[0] > 0
+
+
+def add_index(table, index_name, columns, unique=False, fulltext=False):
+    """Step that creates an index unless it already exists"""
+    def step(cursor):
+        if not index_exists(cursor, table, index_name):
+            kind = 'UNIQUE INDEX' if unique else 'FULLTEXT INDEX' if fulltext else 'INDEX'
+            cursor.execute(f"CREATE {kind} {index_name} ON {table} ({', '.join(columns)})")
+    return step
+
+
+def table_exists(cursor, table):
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.tables
+        WHERE table_schema = DATABASE() AND table_name = %s
+    """, (table,))
+    return cursor.fetchone()[0] > 0
+
+
+def add_column(table, column, definition):
+    """Step that adds a column unless it already exists.
+
+    A column added to an archived table is added to its _Archive copy too, so
+    archive.py keeps copying every column.
+    """
+    def step(cursor):
+        targets = [table]
+        if table in ARCHIVED_TABLES and table_exists(cursor, f"{table}_Archive"):
+            targets.append(f"{table}_Archive")
+        for target in targets:
+            if not column_exists(cursor, target, column):
+                cursor.execute(f"ALTER TABLE {target} ADD COLUMN {column} {definition}")
+    return step
+
+
+# Collapse duplicate (student_id, job_id) applications onto the oldest row so the
+# unique key can be created; notes move to the surviving row, the others' alerts are dropped
+DUPLICATE_APPLICATIONS = """
+    SELECT student_id, job_id, MIN(application_id) AS keep_id
+    FROM Applications
+    GROUP BY student_id, job_id
+    HAVING COUNT(*) > 1
+"""
+
+# Recompute the analytics summary tables from Applications (used for backfill and repair)
+REBUILD_STATS_STATEMENTS = [
+    "DELETE FROM Application_Stats_By_Company",
+    """INSERT INTO Application_Stats_By_Company (company_name, status, app_count)
+       SELECT j.company_name, a.status, COUNT(*)
+       FROM Applications a
+       JOIN Job_Postings j ON a.job_id = j.job_id
+       GROUP BY j.company_name, a.status""",
+    "DELETE FROM Application_Stats_By_Month",
+    """INSERT INTO Application_Stats_By_Month (month, status, app_count)
+       SELECT DATE_FORMAT(applied_on, '%Y-%m'), status, COUNT(*)
+       FROM Applications
+       WHERE applied_on IS NOT NULL
+       GROUP BY DATE_FORMAT(applied_on, '%Y-%m'), status""",
+]
+
+# Set-based replacement for the cursor loop in Update_Alerts_On_Job_Update: one
+# multi-row UPDATE ... JOIN per changed date column instead of up to three
+# single-row UPDATEs per active application
+UPDATE_ALERTS_ON_JOB_UPDATE = """
+CREATE TRIGGER Update_Alerts_On_Job_Update
+AFTER UPDATE ON Job_Postings
+FOR EACH ROW
+BEGIN
+    -- Update DEADLINE alerts if the date changed
+    IF NEW.deadline_date <> OLD.deadline_date THEN
+        UPDATE Alerts al
+        JOIN Applications a ON a.application_id = al.application_id
+        SET
+            al.alert_date = NEW.deadline_date,
+            al.reminder_date = DATE_SUB(NEW.deadline_date, INTERVAL 2 DAY),
+            al.is_sent = FALSE
+        WHERE a.job_id = NEW.job_id
+          AND a.status IN ('to_apply', 'applied')
+          AND al.alert_type = 'deadline';
+    END IF;
+
+    -- Update ONLINE ASSESSMENT alerts if the date changed
+    IF NEW.oa_date <> OLD.oa_date THEN
+        UPDATE Alerts al
+        JOIN Applications a ON a.application_id = al.application_id
+        SET
+            al.alert_date = NEW.oa_date,
+            al.reminder_date = DATE_SUB(NEW.oa_date, INTERVAL 2 DAY),
+            al.is_sent = FALSE
+        WHERE a.job_id = NEW.job_id
+          AND a.status IN ('to_apply', 'applied')
+          AND al.alert_type = 'online_assessment';
+    END IF;
+
+    -- Update INTERVIEW alerts if the date changed
+    IF NEW.interview_date <> OLD.interview_date THEN
+        UPDATE Alerts al
+        JOIN Applications a ON a.application_id = al.application_id
+        SET
+            al.alert_date = NEW.interview_date,
+            al.reminder_date = DATE_SUB(NEW.interview_date, INTERVAL 2 DAY),
+            al.is_sent = FALSE
+        WHERE a.job_id = NEW.job_id
+          AND a.status IN ('to_apply', 'applied')
+          AND al.alert_type = 'interview';
+    END IF;
+END
+"""
+
+# Files a note under p_folder_id if that folder is the student's, else under their first
+# folder, creating 'General Notes' when they have none; returns the folder used so the
+# caller can pass it next time
+ADD_NOTE_PROCEDURE = """
+CREATE PROCEDURE Add_Note (
+    IN p_application_id INT,
+    IN p_student_id INT,
+    IN p_folder_id INT,
+    IN p_note_text TEXT
+)
+BEGIN
+    DECLARE v_folder_id INT DEFAULT NULL;
+
+    IF p_folder_id IS NOT NULL THEN
+        SELECT folder_id INTO v_folder_id
+        FROM Note_Folders
+        WHERE folder_id = p_folder_id AND student_id = p_student_id;
+    END IF;
+
+    IF v_folder_id IS NULL THEN
+        SELECT MIN(folder_id) INTO v_folder_id FROM Note_Folders WHERE student_id = p_student_id;
+    END IF;
+
+    IF v_folder_id IS NULL THEN
+        INSERT INTO Note_Folders (student_id, folder_name) VALUES (p_student_id, 'General Notes');
+        SET v_folder_id = LAST_INSERT_ID();
+    END IF;
+
+    INSERT INTO Notes (application_id, student_id, folder_id, note_text)
+    VALUES (p_application_id, p_student_id, v_folder_id, p_note_text);
+
+    SELECT v_folder_id AS folder_id, LAST_INSERT_ID() AS note_id;
+END
+"""
+
+# Live tables archive.py moves expired seasons out of, parents first
+ARCHIVED_TABLES = ['Job_Postings', 'Applications', 'Notes', 'Alerts']
+
+MIGRATIONS = [
+    Migration(1, 'applications_unique_student_job', [
+        f"""UPDATE Notes n
+            JOIN Applications a ON n.application_id = a.application_id
+            JOIN ({DUPLICATE_APPLICATIONS}) d ON a.student_id = d.student_id AND a.job_id = d.job_id
+            SET n.application_id = d.keep_id
+            WHERE n.application_id <> d.keep_id""",
+        f"""DELETE al FROM Alerts al
+            JOIN Applications a ON al.application_id = a.application_id
+            JOIN ({DUPLICATE_APPLICATIONS}) d ON a.student_id = d.student_id AND a.job_id = d.job_id
+            WHERE al.application_id <> d.keep_id""",
+        f"""DELETE a FROM Applications a
+            JOIN ({DUPLICATE_APPLICATIONS}) d ON a.student_id = d.student_id AND a.job_id = d.job_id
+            WHERE a.application_id <> d.keep_id""",
+        add_index('Applications', 'uq_applications_student_job', ['student_id', 'job_id'], unique=True),
+    ]),
+    Migration(2, 'job_postings_deadline_index', [
+        add_index('Job_Postings', 'idx_job_postings_deadline', ['deadline_date']),
+    ]),
+    Migration(3, 'notes_application_created_index', [
+        add_index('Notes', 'idx_notes_application_created', ['application_id', 'created_at']),
+    ]),
+    Migration(4, 'alerts_due_index', [
+        add_index('Alerts', 'idx_alerts_sent_reminder', ['is_sent', 'reminder_date']),
+    ]),
+    Migration(5, 'applications_status_applied_index', [
+        add_index('Applications', 'idx_applications_status_applied', ['status', 'applied_on']),
+    ]),
+    # Point each application at its newest note so the feed joins one row instead of
+    # running a sorted subquery per job
+    Migration(6, 'applications_latest_note_pointer', [
+        add_column('Applications', 'latest_note_id', 'INT NULL DEFAULT NULL'),
+        """UPDATE Applications a
+           JOIN (
+               SELECT n.application_id, MAX(n.note_id) AS note_id
+               FROM Notes n
+               JOIN (
+                   SELECT application_id, MAX(created_at) AS created_at
+                   FROM Notes
+                   GROUP BY application_id
+               ) newest ON n.application_id = newest.application_id AND n.created_at = newest.created_at
+               GROUP BY n.application_id
+           ) latest ON a.application_id = latest.application_id
+           SET a.latest_note_id = latest.note_id,
+               a.last_updated = a.last_updated""",
+        "DROP TRIGGER IF EXISTS Notes_Latest_Pointer",
+        """CREATE TRIGGER Notes_Latest_Pointer
+           AFTER INSERT ON Notes
+           FOR EACH ROW
+           BEGIN
+               -- Only move the pointer forward, in case a note is inserted with a back-dated created_at
+               UPDATE Applications a
+               LEFT JOIN Notes cur ON cur.note_id = a.latest_note_id
+               SET a.latest_note_id = NEW.note_id
+               WHERE a.application_id = NEW.application_id
+                 AND (cur.note_id IS NULL
+                      OR NEW.created_at > cur.created_at
+                      OR (NEW.created_at = cur.created_at AND NEW.note_id > cur.note_id));
+           END""",
+    ]),
+    # Company x status and month x status counts kept current by triggers, so the
+    # analytics tab reads O(companies + months) rows instead of aggregating Applications
+    Migration(7, 'application_stats_summary_tables', [
+        """CREATE TABLE IF NOT EXISTS Application_Stats_By_Company (
+               company_name VARCHAR(150) NOT NULL,
+               status ENUM('to_apply', 'applied', 'done', 'ignored') NOT NULL,
+               app_count INT NOT NULL DEFAULT 0,
+               PRIMARY KEY (company_name, status)
+           )""",
+        """CREATE TABLE IF NOT EXISTS Application_Stats_By_Month (
+               month CHAR(7) NOT NULL,
+               status ENUM('to_apply', 'applied', 'done', 'ignored') NOT NULL,
+               app_count INT NOT NULL DEFAULT 0,
+               PRIMARY KEY (month, status)
+           )""",
+        "DROP TRIGGER IF EXISTS Stats_On_Application_Insert",
+        """CREATE TRIGGER Stats_On_Application_Insert
+           AFTER INSERT ON Applications
+           FOR EACH ROW
+           BEGIN
+               DECLARE v_company_name VARCHAR(150);
+
+               SELECT company_name INTO v_company_name FROM Job_Postings WHERE job_id = NEW.job_id;
+
+               INSERT INTO Application_Stats_By_Company (company_name, status, app_count)
+               VALUES (v_company_name, NEW.status, 1)
+               ON DUPLICATE KEY UPDATE app_count = app_count + 1;
+
+               IF NEW.applied_on IS NOT NULL THEN
+                   INSERT INTO Application_Stats_By_Month (month, status, app_count)
+                   VALUES (DATE_FORMAT(NEW.applied_on, '%Y-%m'), NEW.status, 1)
+                   ON DUPLICATE KEY UPDATE app_count = app_count + 1;
+               END IF;
+           END""",
+        "DROP TRIGGER IF EXISTS Stats_On_Application_Update",
+        """CREATE TRIGGER Stats_On_Application_Update
+           AFTER UPDATE ON Applications
+           FOR EACH ROW
+           BEGIN
+               DECLARE v_old_company VARCHAR(150);
+               DECLARE v_new_company VARCHAR(150);
+
+               -- Only proceed if a counted attribute changed
+               IF NEW.status <> OLD.status OR NEW.job_id <> OLD.job_id THEN
+                   SELECT company_name INTO v_old_company FROM Job_Postings WHERE job_id = OLD.job_id;
+                   SELECT company_name INTO v_new_company FROM Job_Postings WHERE job_id = NEW.job_id;
+
+                   UPDATE Application_Stats_By_Company
+                   SET app_count = app_count - 1
+                   WHERE company_name = v_old_company AND status = OLD.status;
+
+                   INSERT INTO Application_Stats_By_Company (company_name, status, app_count)
+                   VALUES (v_new_company, NEW.status, 1)
+                   ON DUPLICATE KEY UPDATE app_count = app_count + 1;
+               END IF;
+
+               IF NEW.status <> OLD.status OR NOT (NEW.applied_on <=> OLD.applied_on) THEN
+                   IF OLD.applied_on IS NOT NULL THEN
+                       UPDATE Application_Stats_By_Month
+                       SET app_count = app_count - 1
+                       WHERE month = DATE_FORMAT(OLD.applied_on, '%Y-%m') AND status = OLD.status;
+                   END IF;
+
+                   IF NEW.applied_on IS NOT NULL THEN
+                       INSERT INTO Application_Stats_By_Month (month, status, app_count)
+                       VALUES (DATE_FORMAT(NEW.applied_on, '%Y-%m'), NEW.status, 1)
+                       ON DUPLICATE KEY UPDATE app_count = app_count + 1;
+                   END IF;
+               END IF;
+           END""",
+        "DROP TRIGGER IF EXISTS Stats_On_Application_Delete",
+        """CREATE TRIGGER Stats_On_Application_Delete
+           AFTER DELETE ON Applications
+           FOR EACH ROW
+           BEGIN
+               UPDATE Application_Stats_By_Company s
+               JOIN Job_Postings j ON j.company_name = s.company_name
+               SET s.app_count = s.app_count - 1
+               WHERE j.job_id = OLD.job_id AND s.status = OLD.status;
+
+               IF OLD.applied_on IS NOT NULL THEN
+                   UPDATE Application_Stats_By_Month
+                   SET app_count = app_count - 1
+                   WHERE month = DATE_FORMAT(OLD.applied_on, '%Y-%m') AND status = OLD.status;
+               END IF;
+           END""",
+        # Renaming a company moves that job's counts to the new name
+        "DROP TRIGGER IF EXISTS Stats_On_Job_Update",
+        """CREATE TRIGGER Stats_On_Job_Update
+           AFTER UPDATE ON Job_Postings
+           FOR EACH ROW
+           BEGIN
+               IF NEW.company_name <> OLD.company_name THEN
+                   UPDATE Application_Stats_By_Company s
+                   JOIN (
+                       SELECT status, COUNT(*) AS moved
+                       FROM Applications
+                       WHERE job_id = NEW.job_id
+                       GROUP BY status
+                   ) c ON s.status = c.status
+                   SET s.app_count = s.app_count - c.moved
+                   WHERE s.company_name = OLD.company_name;
+
+                   INSERT INTO Application_Stats_By_Company (company_name, status, app_count)
+                   SELECT NEW.company_name, a.status, COUNT(*)
+                   FROM Applications a
+                   WHERE a.job_id = NEW.job_id
+                   GROUP BY a.status
+                   ON DUPLICATE KEY UPDATE app_count = app_count + VALUES(app_count);
+               END IF;
+           END""",
+        *REBUILD_STATS_STATEMENTS,
+    ]),
+    Migration(8, 'set_based_update_alerts_on_job_update', [
+        "DROP TRIGGER IF EXISTS Update_Alerts_On_Job_Update",
+        UPDATE_ALERTS_ON_JOB_UPDATE,
+    ]),
+    # Backs search_jobs; MATCH() must list exactly these columns to use it
+    Migration(9, 'job_postings_fulltext_search', [
+        add_index('Job_Postings', 'ft_job_postings_search', ['company_name', 'role', 'description'], fulltext=True),
+    ]),
+    # Covers the per-job status counts, so the job funnel reads the index instead of the table
+    Migration(10, 'applications_job_status_index', [
+        add_index('Applications', 'idx_applications_job_status', ['job_id', 'status']),
+    ]),
+    # Change feed for delta-sync refreshes: modification times on postings and applications,
+    # and a tombstone per deleted posting so sessions holding a copy can drop it
+    Migration(11, 'job_postings_change_feed', [
+        add_column('Job_Postings', 'last_updated',
+                   'DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP'),
+        add_index('Job_Postings', 'idx_job_postings_last_updated', ['last_updated']),
+        add_index('Applications', 'idx_applications_last_updated', ['last_updated']),
+        """CREATE TABLE IF NOT EXISTS Deleted_Job_Postings (
+               job_id INT PRIMARY KEY,
+               deleted_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+               INDEX idx_deleted_job_postings_deleted_at (deleted_at)
+           )""",
+        "DROP TRIGGER IF EXISTS Job_Postings_Tombstone",
+        """CREATE TRIGGER Job_Postings_Tombstone
+           AFTER DELETE ON Job_Postings
+           FOR EACH ROW
+           INSERT INTO Deleted_Job_Postings (job_id) VALUES (OLD.job_id)
+           ON DUPLICATE KEY UPDATE deleted_at = CURRENT_TIMESTAMP""",
+    ]),
+    # Archive copies of expired postings and everything hanging off them (filled by archive.py),
+    # plus summary tables holding the archived applications' analytics counts
+    Migration(12, 'archive_tables', [
+        *[step for table in ARCHIVED_TABLES for step in (
+            f"CREATE TABLE IF NOT EXISTS {table}_Archive LIKE {table}",
+            add_column(f"{table}_Archive", 'archived_at', 'DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP'),
+        )],
+        "CREATE TABLE IF NOT EXISTS Application_Stats_By_Company_Archive LIKE Application_Stats_By_Company",
+        "CREATE TABLE IF NOT EXISTS Application_Stats_By_Month_Archive LIKE Application_Stats_By_Month",
+        """CREATE TABLE IF NOT EXISTS Archive_Runs (
+               run_id INT PRIMARY KEY AUTO_INCREMENT,
+               cutoff_date DATE NOT NULL,
+               started_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+               finished_at DATETIME NULL,
+               postings INT NOT NULL DEFAULT 0,
+               applications INT NOT NULL DEFAULT 0,
+               notes INT NOT NULL DEFAULT 0,
+               alerts INT NOT NULL DEFAULT 0
+           )""",
+    ]),
+    # One CALL per note save instead of a folder lookup, an optional folder insert, a re-read
+    # and the note insert, and an index for paging a folder's notes newest first
+    Migration(13, 'add_note_procedure', [
+        "DROP PROCEDURE IF EXISTS Add_Note",
+        ADD_NOTE_PROCEDURE,
+        add_index('Notes', 'idx_notes_folder_created', ['folder_id', 'created_at']),
+    ]),
+]
+
+
+def ensure_migrations_table(cursor):
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {MIGRATIONS_TABLE} (
+            version INT PRIMARY KEY,
+            name VARCHAR(150) NOT NULL,
+            applied_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            explain_before MEDIUMTEXT,
+            explain_after MEDIUMTEXT
+        )
+    """)
+
+
+def applied_versions(cursor):
+    cursor.execute(f"SELECT version FROM {MIGRATIONS_TABLE}")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def capture_plans(connection):
+    """EXPLAIN every hot-path query; queries that cannot be planned yet record the error"""
+    plans = {}
+    cursor = connection.cursor(dictionary=True)
+    try:
+        for name, (query, params) in HOT_QUERIES.items():
+            try:
+                cursor.execute(f"EXPLAIN {query}", params)
+                plans[name] = cursor.fetchall()
+            except Error as e:
+                plans[name] = {'error': str(e)}
+    finally:
+        cursor.close()
+    return plans
+
+
+def summarize_plan(plan):
+    """One-line summary of an EXPLAIN result: access type, key and estimated rows per table"""
+    if isinstance(plan, dict):
+        return f"error: {plan['error']}"
+    return '; '.join(
+        f"{row.get('table')}: {row.get('type')} via {row.get('key') or 'no index'} (~{row.get('rows')} rows)"
+        for row in plan
+    )
+
+
+def migrate(target=None, log=print):
+    """Apply every pending migration up to `target` (default: all). Returns applied versions."""
+    applied = []
+    with pooled_connection() as connection:
+        cursor = connection.cursor()
+        try:
+            # Serialize concurrent app processes starting up against the same database
+            cursor.execute("SELECT GET_LOCK(%s, %s)", (MIGRATION_LOCK, MIGRATION_LOCK_TIMEOUT))
+            if cursor.fetchone()[0] != 1:
+                raise RuntimeError("Timed out waiting for the schema migration lock")
+            try:
+                ensure_migrations_table(cursor)
+                done = applied_versions(cursor)
+                for migration in MIGRATIONS:
+                    if migration.version in done or (target is not None and migration.version > target):
+                        continue
+                    log(f"Applying migration {migration.version}: {migration.name}")
+                    before = capture_plans(connection)
+                    migration.apply(cursor)
+                    connection.commit()
+                    after = capture_plans(connection)
+                    cursor.execute(
+                        f"INSERT INTO {MIGRATIONS_TABLE} (version, name, explain_before, explain_after) "
+                        "VALUES (%s, %s, %s, %s)",
+                        (migration.version, migration.name,
+                         json.dumps(before, default=str), json.dumps(after, default=str))
+                    )
+                    connection.commit()
+                    applied.append(migration.version)
+            finally:
+                cursor.execute("SELECT RELEASE_LOCK(%s)", (MIGRATION_LOCK,))
+                cursor.fetchall()
+        finally:
+            cursor.close()
+    return applied
+
+
+def rebuild_application_stats():
+    """Recompute the analytics summary tables from Applications in one transaction"""
+    with pooled_connection() as connection:
+        cursor = connection.cursor()
+        try:
+            for statement in REBUILD_STATS_STATEMENTS:
+                cursor.execute(statement)
+            connection.commit()
+        except Error:
+            connection.rollback()
+            raise
+        finally:
+            cursor.close()
+
+
+def migration_status():
+    """Return every known migration with its applied timestamp (None if pending)"""
+    with pooled_connection() as connection:
+        cursor = connection.cursor()
+        try:
+            ensure_migrations_table(cursor)
+            cursor.execute(f"SELECT version, applied_at FROM {MIGRATIONS_TABLE}")
+            applied_at = dict(cursor.fetchall())
+        finally:
+            cursor.close()
+    return [(m.version, m.name, applied_at.get(m.version)) for m in MIGRATIONS]
+
+
+def migration_plans(version):
+    """Return the (before, after) EXPLAIN plans recorded for an applied migration"""
+    with pooled_connection() as connection:
+        cursor = connection.cursor()
+        try:
+            cursor.execute(
+                f"SELECT explain_before, explain_after FROM {MIGRATIONS_TABLE} WHERE version = %s",
+                (version,)
+            )
+            row = cursor.fetchone()
+        finally:
+            cursor.close()
+    if row is None:
+        return None
+    return json.loads(row[0]), json.loads(row[1])
@@ -0,0 +1,1182 @@
+"""Data functions for the College Internship Tracker.
+
+Every read and write the dashboards perform lives here, on top of the pooled,
+cached access layer in db.py, so the Streamlit UI and command-line tools share
+one implementation.
+"""
+import csv
+import hashlib
+import os
+import re
+import tempfile
+import time
+import weakref
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+from mysql.connector import Error
+
+from db import (
+    execute_query, execute_concurrently, stream_query, call_procedure, invalidate_cache, transaction, report_error,
+    read_staleness_bound, create_cache, QueryCache, QUERY_CACHE_MAX_ENTRIES
+)
+
+# Query cache tags: job-list reads, application-wide aggregates, and one tag per student
+JOBS_TAG = 'jobs'
+APPLICATIONS_TAG = 'applications'
+
+def student_tag(student_id):
+    """Cache tag for reads that depend on one student's applications"""
+    return f'student:{student_id}'
+
+# Accounts
+def find_user(email, password):
+    """Users matching the login credentials (at most one), or None if the query failed"""
+    query = "SELECT user_id, name, email, role FROM Users WHERE email = %s AND password_hash = %s"
+    return execute_query(query, (email, password))
+
+def student_owns_application(student_id, application_id):
+    """Whether the application belongs to the student, or None if the query failed"""
+    query = "SELECT 1 as owned FROM Applications WHERE application_id = %s AND student_id = %s"
+    result = execute_query(query, (application_id, student_id))
+    if result is None:
+        return None
+    return bool(result)
+
+# Student Dashboard Functions
+def get_student_stats(student_id):
+    """Get statistics for student dashboard"""
+    stats = {
+        'total_jobs': 0,
+        'applied': 0,
+        'done': 0,
+        'to_apply': 0
+    }
+    
+    # Total available jobs
+    query = "SELECT COUNT(*) as count FROM Job_Postings WHERE deadline_date >= CURDATE()"
+    result = execute_query(query, cache_tags=(JOBS_TAG,))
+    if result:
+        stats['total_jobs'] = result[0]['count']
+    
+    # Student applications by status
+    query = """
+        SELECT status, COUNT(*) as count 
+        FROM Applications 
+        WHERE student_id = %s 
+        GROUP BY status
+    """
+    result = execute_query(query, (student_id,), cache_tags=(student_tag(student_id),))
+    if result:
+        for row in result:
+            stats[row['status']] = row['count']
+    
+    return stats
+
+def get_upcoming_deadlines(student_id):
+    """Get upcoming deadlines for student"""
+    query = """
+        SELECT 
+            a.application_id,
+            j.company_name,
+            j.role,
+            j.deadline_date,
+            j.oa_date,
+            j.interview_date,
+            a.status,
+            DATEDIFF(j.deadline_date, CURDATE()) as days_until
+        FROM Applications a
+        JOIN Job_Postings j ON a.job_id = j.job_id
+        WHERE a.student_id = %s 
+        AND a.status IN ('applied', 'to_apply')
+        AND j.deadline_date >= CURDATE()
+        ORDER BY j.deadline_date ASC
+    """
+    return execute_query(query, (student_id,), cache_tags=(JOBS_TAG, student_tag(student_id)))
+
+# Feed filters offered to students, mapped to their SQL condition on the student's application
+FEED_STATUS_FILTERS = {
+    'All': None,
+    'Not applied': "(a.status IS NULL OR a.status = 'to_apply')",
+    'Applied': "a.status = 'applied'",
+    'Completed': "a.status = 'done'",
+    'Ignored': "a.status = 'ignored'",
+}
+FEED_DEADLINE_WINDOWS = {'Any time': None, 'Next 7 days': 7, 'Next 14 days': 14, 'Next 30 days': 30}
+JOBS_PAGE_SIZE = 20
+
+def _like_pattern(text):
+    """Escape LIKE wildcards in user input and wrap it for a substring match"""
+    escaped = text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f"%{escaped}%"
+
+def _feed_conditions(filters, after):
+    """WHERE conditions and parameters for the feed filters and keyset cursor"""
+    filters = filters or {}
+    conditions = ["j.deadline_date >= CURDATE()"]
+    params = []
+    
+    if filters.get('company'):
+        conditions.append("j.company_name LIKE %s")
+        params.append(_like_pattern(filters['company']))
+    if filters.get('role'):
+        conditions.append("j.role LIKE %s")
+        params.append(_like_pattern(filters['role']))
+    if FEED_STATUS_FILTERS.get(filters.get('status')):
+        conditions.append(FEED_STATUS_FILTERS[filters['status']])
+    if filters.get('deadline_within') is not None:
+        conditions.append("j.deadline_date <= DATE_ADD(CURDATE(), INTERVAL %s DAY)")
+        params.append(filters['deadline_within'])
+    if after is not None:
+        conditions.append("(j.deadline_date > %s OR (j.deadline_date = %s AND j.job_id > %s))")
+        params.extend([after[0], after[0], after[1]])
+    
+    return conditions, params
+
+def _split_page(jobs, limit):
+    """Trim the extra look-ahead row and return (jobs, next_cursor)"""
+    if len(jobs) > limit:
+        jobs = jobs[:limit]
+        last = jobs[-1]
+        return jobs, (last['deadline_date'], last['job_id'])
+    return jobs, None
+
+def get_available_jobs(student_id, filters=None, after=None, limit=JOBS_PAGE_SIZE):
+    """Get one page of available jobs with application status.
+
+    Pages are keyed on (deadline_date, job_id): `after` is the pair from the
+    last row of the previous page. Returns (jobs, next_cursor), where
+    next_cursor is None on the last page.
+    """
+    conditions, params = _feed_conditions(filters, after)
+    
+    # Fetch one extra row to find out whether another page follows
+    query = f"""
+        SELECT 
+            j.*,
+            a.application_id,
+            a.status as app_status,
+            a.applied_on,
+            COALESCE(n.note_text, '') as latest_note
+        FROM Job_Postings j
+        LEFT JOIN Applications a ON j.job_id = a.job_id AND a.student_id = %s
+        LEFT JOIN Notes n ON n.note_id = a.latest_note_id
+        WHERE {' AND '.join(conditions)}
+        ORDER BY j.deadline_date ASC, j.job_id ASC
+        LIMIT %s
+    """
+    params = [student_id] + params + [limit + 1]
+    
+    jobs = execute_query(query, tuple(params), cache_tags=(JOBS_TAG, student_tag(student_id)))
+    if jobs is None:
+        return None, None
+    return _split_page(jobs, limit)
+
+SEARCH_MODES = {'Natural language': 'NATURAL LANGUAGE MODE', 'Boolean': 'BOOLEAN MODE'}
+
+def boolean_search_error(text):
+    """Why MySQL would reject `text` as a boolean-mode search, or None if it looks well formed"""
+    if text.count('"') % 2:
+        return 'a " phrase is not closed'
+    outside = re.sub(r'"[^"]*"', ' x ', text)  # operators inside a phrase are plain text
+    depth = 0
+    for char in outside:
+        depth += {'(': 1, ')': -1}.get(char, 0)
+        if depth < 0:
+            return "a ) has no matching ("
+    if depth:
+        return "a ( is not closed"
+    if re.search(r'[+\-~<>]+(?=\s|\)|$)', outside):
+        return "an operator (+ - ~ < >) has no word after it"
+    return None
+
+def search_jobs(student_id, text, mode='Natural language', filters=None, page=0, limit=JOBS_PAGE_SIZE):
+    """Full-text search over open jobs' company, role and description.
+
+    Uses the ft_job_postings_search index (migration 9). Boolean mode accepts
+    MySQL operators such as +python -unpaid "data science" intern*. Matches
+    are ranked by relevance, then by nearest deadline, and carry the same
+    per-student status columns as the feed. Relevance is not a stable key,
+    so pages are addressed by number. Returns (jobs, has_more).
+    """
+    conditions, params = _feed_conditions(filters, None)
+    match = f"MATCH(j.company_name, j.role, j.description) AGAINST (%s IN {SEARCH_MODES[mode]})"
+    
+    query = f"""
+        SELECT
+            j.*,
+            a.application_id,
+            a.status as app_status,
+            a.applied_on,
+            COALESCE(n.note_text, '') as latest_note,
+            {match} as relevance
+        FROM Job_Postings j
+        LEFT JOIN Applications a ON j.job_id = a.job_id AND a.student_id = %s
+        LEFT JOIN Notes n ON n.note_id = a.latest_note_id
+        WHERE {match} AND {' AND '.join(conditions)}
+        ORDER BY relevance DESC, j.deadline_date ASC, j.job_id ASC
+        LIMIT %s OFFSET %s
+    """
+    params = [text, student_id, text] + params + [limit + 1, page * limit]
+    
+    jobs = execute_query(query, tuple(params), cache_tags=(JOBS_TAG, student_tag(student_id)))
+    if jobs is None:
+        return None, False
+    return jobs[:limit], len(jobs) > limit
+
+def load_student_dashboard(student_id, filters=None, after=None, limit=JOBS_PAGE_SIZE):
+    """Load everything the student dashboard shows in a single round trip.
+
+    One UNION ALL query returns the open-job count, the student's status
+    counts, their upcoming deadlines and the current feed page, tagged by a
+    `section` column; pandas splits it back into the stats, deadline list and
+    feed that get_student_stats, get_upcoming_deadlines and get_available_jobs
+    would otherwise fetch in four separate trips.
+    Returns None if the query failed.
+    """
+    conditions, feed_params = _feed_conditions(filters, after)
+    
+    query = f"""
+        (SELECT 'feed' as section, j.job_id, j.company_name, j.role, j.description, j.jd_link,
+                j.deadline_date, j.oa_date, j.interview_date, j.posted_by,
+                a.application_id, a.status as app_status, a.applied_on,
+                COALESCE(n.note_text, '') as latest_note,
+                NULL as days_until, NULL as metric
+         FROM Job_Postings j
+         LEFT JOIN Applications a ON j.job_id = a.job_id AND a.student_id = %s
+         LEFT JOIN Notes n ON n.note_id = a.latest_note_id
+         WHERE {' AND '.join(conditions)}
+         ORDER BY j.deadline_date ASC, j.job_id ASC
+         LIMIT %s)
+        UNION ALL
+        (SELECT 'deadline', j.job_id, j.company_name, j.role, NULL, NULL,
+                j.deadline_date, j.oa_date, j.interview_date, NULL,
+                a.application_id, a.status, a.applied_on, NULL,
+                DATEDIFF(j.deadline_date, CURDATE()), NULL
+         FROM Applications a
+         JOIN Job_Postings j ON a.job_id = j.job_id
+         WHERE a.student_id = %s
+         AND a.status IN ('applied', 'to_apply')
+         AND j.deadline_date >= CURDATE())
+        UNION ALL
+        (SELECT 'status', NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL,
+                NULL, status, NULL, NULL, NULL, COUNT(*)
+         FROM Applications
+         WHERE student_id = %s
+         GROUP BY status)
+        UNION ALL
+        (SELECT 'open_jobs', NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL,
+                NULL, NULL, NULL, NULL, NULL, COUNT(*)
+         FROM Job_Postings
+         WHERE deadline_date >= CURDATE())
+    """
+    params = [student_id] + feed_params + [limit + 1, student_id, student_id]
+    
+    rows = execute_query(query, tuple(params), cache_tags=(JOBS_TAG, student_tag(student_id)))
+    if rows is None:
+        return None
+    
+    # object dtype keeps integer ids and NULLs (None) exactly as the driver returned them;
+    # the open_jobs row is always present, so the frame is never empty
+    df = pd.DataFrame(rows, dtype=object)
+    
+    def section(name):
+        return df[df['section'] == name]
+    
+    stats = {'total_jobs': 0, 'applied': 0, 'done': 0, 'to_apply': 0}
+    open_jobs = section('open_jobs')
+    if not open_jobs.empty:
+        stats['total_jobs'] = int(open_jobs['metric'].iloc[0])
+    for row in section('status').itertuples(index=False):
+        stats[row.app_status] = int(row.metric)
+    
+    deadline_columns = ['application_id', 'job_id', 'company_name', 'role', 'deadline_date', 'oa_date',
+                        'interview_date', 'app_status', 'days_until']
+    deadlines = (
+        section('deadline')
+        .sort_values('deadline_date', kind='stable')[deadline_columns]
+        .rename(columns={'app_status': 'status'})
+        .to_dict('records')
+    )
+    
+    feed_columns = ['job_id', 'company_name', 'role', 'description', 'jd_link', 'deadline_date', 'oa_date',
+                    'interview_date', 'posted_by', 'application_id', 'app_status', 'applied_on', 'latest_note']
+    feed = section('feed').sort_values(['deadline_date', 'job_id'], kind='stable')[feed_columns].to_dict('records')
+    jobs, next_cursor = _split_page(feed, limit)
+    
+    return {'stats': stats, 'deadlines': deadlines, 'jobs': jobs, 'next_cursor': next_cursor}
+
+# Delta sync: a session keeps its last-loaded rows plus the server time they were read at
+# (a snapshot) and on later reruns fetches only rows whose last_updated moved since then. Off by
+# default: a cold sync costs three round trips (changes, feed page, open-job count) where
+# load_student_dashboard needs one, so it only pays off for long sessions with many reruns
+DELTA_SYNC = os.getenv('DELTA_SYNC', '0') == '1'
+# Re-read this much history on every refresh: last_updated has one-second resolution and is set
+# when a statement runs, not when it commits. Merges are idempotent, so overlap only costs a few rows
+SYNC_OVERLAP_SECONDS = 2
+# Deleted-posting tombstones are pruned by archive.py once they are older than this (plus an hour's
+# slack), so an older snapshot could miss deletions and is reloaded in full instead
+SYNC_MAX_AGE_HOURS = float(os.getenv('SYNC_MAX_AGE_HOURS', '24'))
+
+def _current_snapshot(snapshot):
+    """`snapshot`, or None if it is too old to bring up to date with a delta query"""
+    if snapshot is None or time.monotonic() - snapshot.get('loaded_at', 0) >= SYNC_MAX_AGE_HOURS * 3600:
+        return None
+    return snapshot
+
+def _sync_since(snapshot):
+    """Lower bound on last_updated for the next delta query, or None for a full load"""
+    if snapshot is None:
+        return None
+    return snapshot['synced_at'] - timedelta(seconds=SYNC_OVERLAP_SECONDS + read_staleness_bound())
+
+def _tombstones_since(since):
+    """UNION ALL branch returning postings deleted since `since` (none on a full load), padded to `columns`"""
+    if since is None:
+        return "", []
+    return "UNION ALL (SELECT 'deleted', {columns} FROM Deleted_Job_Postings WHERE deleted_at >= %s)", [since]
+
+def _merge_changes(snapshot, key, rows):
+    """Fold a delta query's clock, changed and deleted rows into a copy of `snapshot`, keyed on `key`"""
+    merged = dict(snapshot['rows']) if snapshot else {}
+    changed = [row for row in rows if row['section'] == 'changed']
+    deleted = {row['job_id'] for row in rows if row['section'] == 'deleted'}
+    
+    # Deletions first: a changed row comes from the live table, so it wins over a tombstone for a reused id
+    if deleted:
+        merged = {k: row for k, row in merged.items() if row['job_id'] not in deleted}
+    for row in changed:
+        merged[row[key]] = {column: value for column, value in row.items() if column not in ('section', 'synced_at')}
+    
+    synced_at = next(row['synced_at'] for row in rows if row['section'] == 'clock')
+    return {'rows': merged, 'synced_at': synced_at, 'loaded_at': time.monotonic(),
+            'changed': len(changed) + len(deleted)}
+
+def sync_student_applications(student_id, snapshot=None):
+    """Bring a snapshot of the student's tracked applications up to date.
+
+    Without a snapshot every application is loaded; with one, only
+    applications (or their postings) modified since the snapshot was taken,
+    plus deleted postings, are read and merged in. Returns the new snapshot
+    ({'rows': {application_id: row}, 'synced_at', 'changed'}), or None if
+    the query failed.
+    """
+    snapshot = _current_snapshot(snapshot)
+    since = _sync_since(snapshot)
+    condition, params = "", [student_id]
+    if since is not None:
+        condition = "AND (a.last_updated >= %s OR j.last_updated >= %s)"
+        params += [since, since]
+    tombstones, tombstone_params = _tombstones_since(since)
+    
+    query = f"""
+        (SELECT 'clock' as section, NULL as application_id, NULL as job_id, NULL as company_name, NULL as role,
+                NULL as deadline_date, NULL as oa_date, NULL as interview_date, NULL as status,
+                NULL as applied_on, NOW() as synced_at)
+        UNION ALL
+        (SELECT 'changed', a.application_id, a.job_id, j.company_name, j.role,
+                j.deadline_date, j.oa_date, j.interview_date, a.status, a.applied_on, NULL
+         FROM Applications a
+         JOIN Job_Postings j ON a.job_id = j.job_id
+         WHERE a.student_id = %s {condition})
+        {tombstones.format(columns="NULL, job_id, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL")}
+    """
+    rows = execute_query(query, tuple(params + tombstone_params))
+    if rows is None:
+        return None
+    return _merge_changes(snapshot, 'application_id', rows)
+
+def sync_student_dashboard(student_id, snapshot=None, filters=None, after=None, limit=JOBS_PAGE_SIZE):
+    """Delta-sync counterpart of load_student_dashboard.
+
+    Status counts and upcoming deadlines are computed from the synced
+    application snapshot instead of being re-aggregated by MySQL, and the
+    open-job count and feed page come from the query cache when warm, so a
+    rerun with nothing changed reads one clock row from the database.
+    Returns load_student_dashboard's dict plus 'sync', the snapshot to pass
+    in next time, or None if a query failed.
+    """
+    sync = sync_student_applications(student_id, snapshot)
+    if sync is None:
+        return None
+    jobs, next_cursor = get_available_jobs(student_id, filters, after, limit)
+    if jobs is None:
+        return None
+    open_jobs = execute_query(
+        "SELECT COUNT(*) as count FROM Job_Postings WHERE deadline_date >= CURDATE()", cache_tags=(JOBS_TAG,)
+    )
+    if open_jobs is None:
+        return None
+    
+    stats = {'total_jobs': open_jobs[0]['count'], 'applied': 0, 'done': 0, 'to_apply': 0}
+    today = sync['synced_at'].date()
+    deadlines = []
+    for application in sync['rows'].values():
+        stats[application['status']] = stats.get(application['status'], 0) + 1
+        if application['status'] in ('applied', 'to_apply') and application['deadline_date'] >= today:
+            deadlines.append({
+                'application_id': application['application_id'],
+                'job_id': application['job_id'],
+                'company_name': application['company_name'],
+                'role': application['role'],
+                'deadline_date': application['deadline_date'],
+                'oa_date': application['oa_date'],
+                'interview_date': application['interview_date'],
+                'status': application['status'],
+                'days_until': (application['deadline_date'] - today).days,
+            })
+    deadlines.sort(key=lambda deadline: (deadline['deadline_date'], deadline['application_id']))
+    
+    return {'stats': stats, 'deadlines': deadlines, 'jobs': jobs, 'next_cursor': next_cursor, 'sync': sync}
+
+def set_application_status(student_id, job_id, status):
+    """Change a student's application status and drop the cached reads it affects"""
+    result = call_procedure('Set_Application_Status', [student_id, job_id, status])
+    if result:
+        invalidate_cache(student_tag(student_id), APPLICATIONS_TAG)
+    return result
+
+def set_application_statuses(student_id, job_ids, status):
+    """Set the same status on many of a student's applications in one statement and one commit.
+
+    Upserts on the (student_id, job_id) unique key with the same applied_on rules
+    as Set_Application_Status; new rows fire Alert_Generator_Insert and changed
+    rows fire Alert_Generator_Update, so alerts stay in step.
+    """
+    if status not in ('to_apply', 'applied', 'done', 'ignored'):
+        raise ValueError(f"Unknown application status: {status}")
+    if not job_ids:
+        return True
+    
+    applied_on = "NOW()" if status == 'applied' else "NULL"
+    values = ', '.join([f"(%s, %s, %s, {applied_on})"] * len(job_ids))
+    # applied_on is assigned before status so it still sees the old status
+    query = f"""
+        INSERT INTO Applications (student_id, job_id, status, applied_on)
+        VALUES {values}
+        ON DUPLICATE KEY UPDATE
+            applied_on = IF(VALUES(status) = 'applied' AND status <> 'applied', NOW(), applied_on),
+            status = VALUES(status)
+    """
+    params = [value for job_id in job_ids for value in (student_id, job_id, status)]
+    result = execute_query(query, tuple(params), fetch=False)
+    if result:
+        invalidate_cache(student_tag(student_id), APPLICATIONS_TAG)
+    return result
+
+def apply_to_job(student_id, job_id):
+    """Apply to a job"""
+    return set_application_status(student_id, job_id, 'applied')
+
+def ignore_job(student_id, job_id):
+    """Ignore a job"""
+    return set_application_status(student_id, job_id, 'ignored')
+
+def mark_as_done(student_id, job_id):
+    """Mark application as done"""
+    return set_application_status(student_id, job_id, 'done')
+
+def add_note(application_id, student_id, note_text, folder_id=None):
+    """Add a note to an application in one round trip.
+
+    Add_Note files it under `folder_id` when that is one of the student's
+    folders, else under their default folder (created on first use). Returns
+    the folder_id used, for the caller to pass next time, or None on error.
+    """
+    result = call_procedure('Add_Note', [application_id, student_id, folder_id, note_text], fetch=True)
+    if not result:
+        return None
+    invalidate_cache(student_tag(student_id))
+    return result[0]['folder_id']
+
+NOTES_PAGE_SIZE = 10
+
+def get_note_folders(student_id):
+    """The student's note folders with how many notes each holds"""
+    query = """
+        SELECT f.folder_id, f.folder_name, COUNT(n.note_id) as note_count
+        FROM Note_Folders f
+        LEFT JOIN Notes n ON n.folder_id = f.folder_id
+        WHERE f.student_id = %s
+        GROUP BY f.folder_id, f.folder_name
+        ORDER BY f.folder_id
+    """
+    return execute_query(query, (student_id,), cache_tags=(student_tag(student_id),))
+
+def _notes_page(condition, params, student_id, before, limit):
+    """One page of the student's notes matching `condition`, newest first.
+
+    Pages are keyed on (created_at, note_id): `before` is the pair from the
+    last row of the previous page. Returns (notes, next_cursor), where
+    next_cursor is None on the last page.
+    """
+    conditions = [condition, "n.student_id = %s"]
+    params = list(params) + [student_id]
+    if before is not None:
+        # The first term bounds the index range; the second breaks ties on created_at
+        conditions.append("n.created_at <= %s AND (n.created_at < %s OR n.note_id < %s)")
+        params.extend([before[0], before[0], before[1]])
+    
+    query = f"""
+        SELECT n.note_id, n.application_id, n.note_text, n.created_at, f.folder_name, j.company_name, j.role
+        FROM Notes n
+        JOIN Note_Folders f ON n.folder_id = f.folder_id
+        JOIN Applications a ON n.application_id = a.application_id
+        JOIN Job_Postings j ON a.job_id = j.job_id
+        WHERE {' AND '.join(conditions)}
+        ORDER BY n.created_at DESC, n.note_id DESC
+        LIMIT %s
+    """
+    notes = execute_query(query, tuple(params + [limit + 1]), cache_tags=(student_tag(student_id),))
+    if notes is None:
+        return None, None
+    if len(notes) > limit:
+        notes = notes[:limit]
+        return notes, (notes[-1]['created_at'], notes[-1]['note_id'])
+    return notes, None
+
+def get_application_notes(application_id, student_id, before=None, limit=NOTES_PAGE_SIZE):
+    """One page of an application's notes, newest first (walks idx_notes_application_created)"""
+    return _notes_page("n.application_id = %s", [application_id], student_id, before, limit)
+
+def get_folder_notes(folder_id, student_id, before=None, limit=NOTES_PAGE_SIZE):
+    """One page of the notes in one of the student's folders, newest first (walks idx_notes_folder_created)"""
+    return _notes_page("n.folder_id = %s", [folder_id], student_id, before, limit)
+
+# Faculty Dashboard Functions
+# Per-job application counts by status in one pass over Applications (covered by idx_applications_job_status)
+JOB_FUNNEL_COUNTS = """
+    SELECT
+        job_id,
+        COUNT(*) as total_apps,
+        CAST(SUM(status = 'to_apply') AS SIGNED) as to_apply,
+        CAST(SUM(status = 'applied') AS SIGNED) as applied,
+        CAST(SUM(status = 'done') AS SIGNED) as done,
+        CAST(SUM(status = 'ignored') AS SIGNED) as ignored
+    FROM Applications
+    GROUP BY job_id
+"""
+
+def get_all_jobs():
+    """Get all job postings"""
+    query = f"""
+        SELECT 
+            j.*,
+            u.name as posted_by_name,
+            COALESCE(f.total_apps, 0) as total_apps
+        FROM Job_Postings j
+        LEFT JOIN Users u ON j.posted_by = u.user_id
+        LEFT JOIN ({JOB_FUNNEL_COUNTS}) f ON f.job_id = j.job_id
+        ORDER BY j.deadline_date DESC
+    """
+    return execute_query(query, cache_tags=(JOBS_TAG, APPLICATIONS_TAG))
+
+def sync_all_jobs(snapshot=None):
+    """Bring a snapshot of every job posting, as listed by get_all_jobs, up to date.
+
+    After the first full load only postings edited since the snapshot, postings
+    whose applications changed (for their counts), and deleted postings are
+    read. Returns the new snapshot ({'rows': {job_id: row}, 'synced_at',
+    'changed'}), or None if the query failed.
+    """
+    snapshot = _current_snapshot(snapshot)
+    since = _sync_since(snapshot)
+    condition, params = "", []
+    if since is not None:
+        condition = """WHERE j.last_updated >= %s
+                       OR j.job_id IN (SELECT job_id FROM Applications WHERE last_updated >= %s)"""
+        params = [since, since]
+    tombstones, tombstone_params = _tombstones_since(since)
+    # A full load counts applications in one grouped pass; a delta only counts its handful of postings
+    if since is None:
+        total_apps, funnel = "COALESCE(f.total_apps, 0)", f"LEFT JOIN ({JOB_FUNNEL_COUNTS}) f ON f.job_id = j.job_id"
+    else:
+        total_apps, funnel = "(SELECT COUNT(*) FROM Applications c WHERE c.job_id = j.job_id)", ""
+    
+    query = f"""
+        (SELECT 'clock' as section, NULL as job_id, NULL as company_name, NULL as role, NULL as description,
+                NULL as jd_link, NULL as deadline_date, NULL as oa_date, NULL as interview_date,
+                NULL as posted_by, NULL as posted_by_name, NULL as total_apps, NOW() as synced_at)
+        UNION ALL
+        (SELECT 'changed', j.job_id, j.company_name, j.role, j.description, j.jd_link,
+                j.deadline_date, j.oa_date, j.interview_date, j.posted_by, u.name, {total_apps}, NULL
+         FROM Job_Postings j
+         LEFT JOIN Users u ON j.posted_by = u.user_id
+         {funnel}
+         {condition})
+        {tombstones.format(columns="job_id, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL")}
+    """
+    rows = execute_query(query, tuple(params + tombstone_params))
+    if rows is None:
+        return None
+    return _merge_changes(snapshot, 'job_id', rows)
+
+def get_job_funnel():
+    """Status funnel for every job posting.
+
+    Same figures as View_Job_Analytics (success ratio as in
+    Calculate_Success_Ratio: done / all tracked applications, in percent),
+    but for all jobs from a single grouped scan instead of four scans per job.
+    """
+    query = f"""
+        SELECT
+            j.job_id,
+            j.company_name,
+            j.role,
+            j.deadline_date,
+            COALESCE(f.total_apps, 0) as total_apps,
+            COALESCE(f.to_apply, 0) as to_apply,
+            COALESCE(f.applied, 0) as applied,
+            COALESCE(f.done, 0) as done,
+            COALESCE(f.ignored, 0) as ignored,
+            COALESCE(ROUND(f.done * 100.0 / f.total_apps, 2), 0) as success_ratio
+        FROM Job_Postings j
+        LEFT JOIN ({JOB_FUNNEL_COUNTS}) f ON f.job_id = j.job_id
+        ORDER BY j.deadline_date DESC, j.job_id DESC
+    """
+    return execute_query(query, cache_tags=(JOBS_TAG, APPLICATIONS_TAG))
+
+def create_job_posting(company_name, role, description, jd_link, deadline, oa_date, interview_date, posted_by):
+    """Create a new job posting"""
+    result = call_procedure('Create_Job_Posting', [
+        company_name, role, description, jd_link, deadline, oa_date, interview_date, posted_by
+    ])
+    if result:
+        invalidate_cache(JOBS_TAG)
+    return result
+
+def applicant_tags(job_ids):
+    """Cache tags of the students tracking any of these jobs, whose own reads (e.g. calendars) a job change affects"""
+    if not job_ids:
+        return []
+    placeholders = ', '.join(['%s'] * len(job_ids))
+    query = f"SELECT DISTINCT student_id FROM Applications WHERE job_id IN ({placeholders})"
+    rows = execute_query(query, tuple(job_ids)) or []
+    return [student_tag(row['student_id']) for row in rows]
+
+def update_job_posting(job_id, company_name, role, description, jd_link, deadline, oa_date, interview_date):
+    """Update an existing job posting"""
+    query = """
+        UPDATE Job_Postings 
+        SET company_name = %s, role = %s, description = %s, jd_link = %s,
+            deadline_date = %s, oa_date = %s, interview_date = %s
+        WHERE job_id = %s
+    """
+    result = execute_query(query, (company_name, role, description, jd_link, deadline, oa_date, interview_date, job_id), fetch=False)
+    if result:
+        invalidate_cache(JOBS_TAG, *applicant_tags([job_id]))
+    return result
+
+def delete_job_posting(job_id):
+    """Delete a job posting"""
+    # Looked up first: the applicants are gone with the posting
+    tags = applicant_tags([job_id])
+    query = "DELETE FROM Job_Postings WHERE job_id = %s"
+    result = execute_query(query, (job_id,), fetch=False)
+    if result:
+        invalidate_cache(JOBS_TAG, *tags)
+    return result
+
+# Bulk job import
+IMPORT_REQUIRED_COLUMNS = ['company_name', 'role', 'description', 'deadline_date', 'oa_date', 'interview_date']
+IMPORT_DATE_COLUMNS = ['deadline_date', 'oa_date', 'interview_date']
+IMPORT_BATCH_SIZE = 500
+
+def read_job_import_file(uploaded_file):
+    """Read an uploaded CSV/XLSX of job postings with normalized column names"""
+    if uploaded_file.name.lower().endswith(('.xlsx', '.xls')):
+        df = pd.read_excel(uploaded_file, dtype=str)
+    else:
+        df = pd.read_csv(uploaded_file, dtype=str)
+    df.columns = [str(col).strip().lower().replace(' ', '_') for col in df.columns]
+    return df
+
+def validate_job_import(df):
+    """Validate every row of an import in one vectorized pass.
+
+    Returns (valid_rows, errors): valid_rows is a DataFrame ready to insert,
+    errors has one row per problem with the spreadsheet row number.
+    """
+    missing_columns = [col for col in IMPORT_REQUIRED_COLUMNS if col not in df.columns]
+    if missing_columns:
+        errors = pd.DataFrame({'row': ['-'], 'error': [f"Missing column(s): {', '.join(missing_columns)}"]})
+        return df.iloc[0:0], errors
+    
+    df = df.copy()
+    if 'jd_link' not in df.columns:
+        df['jd_link'] = pd.NA
+    text_columns = ['company_name', 'role', 'description', 'jd_link']
+    for col in text_columns + IMPORT_DATE_COLUMNS:
+        df[col] = df[col].astype('string').str.strip().replace('', pd.NA)
+    
+    problems = []
+    
+    def flag(mask, message):
+        mask = mask.fillna(False).astype(bool)
+        if mask.any():
+            problems.append(pd.DataFrame({'index': df.index[mask], 'error': message}))
+    
+    for col in IMPORT_REQUIRED_COLUMNS:
+        flag(df[col].isna(), f"Missing {col}")
+    
+    parsed = {}
+    for col in IMPORT_DATE_COLUMNS:
+        parsed[col] = pd.to_datetime(df[col], errors='coerce')
+        flag(df[col].notna() & parsed[col].isna(), f"Invalid date in {col}")
+    
+    flag(parsed['deadline_date'] > parsed['oa_date'], "Deadline is after the OA date")
+    flag(parsed['oa_date'] > parsed['interview_date'], "OA date is after the interview date")
+    
+    for col in IMPORT_DATE_COLUMNS:
+        df[col] = parsed[col].dt.date
+    
+    # Keys compare case-insensitively, as MySQL's default collation does
+    key = ['company_name', 'role', 'deadline_date']
+    keys = df[key].astype(object)
+    for col in ['company_name', 'role']:
+        keys[col] = df[col].str.casefold().astype(object)
+    complete_key = keys.notna().all(axis=1)
+    
+    # Only rows that are otherwise valid can shadow a later row, so a rejected row never hides a good one
+    rejected = pd.concat(problems)['index'] if problems else []
+    candidates = complete_key & ~df.index.isin(rejected)
+    duplicated = keys[candidates].duplicated(keep='first').reindex(df.index, fill_value=False)
+    flag(duplicated, "Duplicate of an earlier row in the file")
+    
+    # Postings that already exist, fetched in one query for the companies in the file
+    companies = df['company_name'].dropna().unique().tolist()
+    if companies:
+        placeholders = ', '.join(['%s'] * len(companies))
+        query = f"SELECT company_name, role, deadline_date FROM Job_Postings WHERE company_name IN ({placeholders})"
+        existing = execute_query(query, tuple(companies))
+        if existing:
+            existing_keys = {
+                (row['company_name'].casefold(), row['role'].casefold(), row['deadline_date']) for row in existing
+            }
+            file_keys = pd.Series(list(map(tuple, keys.itertuples(index=False))), index=df.index)
+            flag(complete_key & file_keys.isin(existing_keys), "Job posting already exists")
+    
+    if problems:
+        errors = pd.concat(problems, ignore_index=True)
+        invalid = errors['index'].unique()
+        errors['row'] = errors['index'] + 2  # header is spreadsheet row 1
+        errors = errors[['row', 'error']].sort_values('row', kind='stable').reset_index(drop=True)
+    else:
+        invalid = []
+        errors = pd.DataFrame(columns=['row', 'error'])
+    
+    valid_rows = df.drop(index=invalid)[text_columns + IMPORT_DATE_COLUMNS].astype(object)
+    valid_rows = valid_rows.where(valid_rows.notna(), None)
+    return valid_rows, errors
+
+def import_job_postings(valid_rows, posted_by):
+    """Insert validated postings with batched multi-row inserts in a single transaction.
+
+    Returns the number of postings created, or None on failure.
+    """
+    rows = [
+        (r.company_name, r.role, r.description, r.jd_link, r.deadline_date, r.oa_date, r.interview_date, posted_by)
+        for r in valid_rows.itertuples(index=False)
+    ]
+    query = """
+        INSERT INTO Job_Postings (
+            company_name, role, description, jd_link, deadline_date,
+            oa_date, interview_date, posted_by
+        )
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+    """
+    try:
+        with transaction() as cursor:
+            # Same authorization rule as Create_Job_Posting, checked once for the whole file
+            cursor.execute("SELECT role FROM Users WHERE user_id = %s", (posted_by,))
+            user = cursor.fetchone()
+            if user is None or user['role'] not in ('faculty', 'admin'):
+                report_error("Error: Only faculty or admin can post new jobs.")
+                return None
+            for start in range(0, len(rows), IMPORT_BATCH_SIZE):
+                cursor.executemany(query, rows[start:start + IMPORT_BATCH_SIZE])
+    except Error as e:
+        report_error(f"Import failed, no postings were created: {e}")
+        return None
+    
+    invalidate_cache(JOBS_TAG)
+    return len(rows)
+
+# Export Functions
+# Each export: streaming query, row count query for progress, and (column, type) pairs in query order
+EXPORTS = {
+    'Applications': (
+        """
+        SELECT a.application_id, u.name as student_name, u.email as student_email,
+               j.company_name, j.role, a.status, a.applied_on, j.deadline_date,
+               a.last_updated, n.note_text as latest_note
+        FROM Applications a
+        JOIN Users u ON a.student_id = u.user_id
+        JOIN Job_Postings j ON a.job_id = j.job_id
+        LEFT JOIN Notes n ON n.note_id = a.latest_note_id
+        ORDER BY a.application_id
+        """,
+        "SELECT COUNT(*) as count FROM Applications",
+        [('application_id', 'int'), ('student_name', 'str'), ('student_email', 'str'), ('company_name', 'str'),
+         ('role', 'str'), ('status', 'str'), ('applied_on', 'datetime'), ('deadline_date', 'date'),
+         ('last_updated', 'datetime'), ('latest_note', 'str')],
+    ),
+    'Applications by company': (
+        """
+        SELECT company_name, status, app_count
+        FROM Application_Stats_By_Company
+        WHERE app_count > 0
+        ORDER BY company_name, status
+        """,
+        "SELECT COUNT(*) as count FROM Application_Stats_By_Company WHERE app_count > 0",
+        [('company_name', 'str'), ('status', 'str'), ('app_count', 'int')],
+    ),
+    'Applications by month': (
+        """
+        SELECT month, status, app_count
+        FROM Application_Stats_By_Month
+        WHERE app_count > 0
+        ORDER BY month, status
+        """,
+        "SELECT COUNT(*) as count FROM Application_Stats_By_Month WHERE app_count > 0",
+        [('month', 'str'), ('status', 'str'), ('app_count', 'int')],
+    ),
+}
+EXPORT_FORMATS = {'CSV': ('csv', 'text/csv'), 'Parquet': ('parquet', 'application/vnd.apache.parquet')}
+
+# Export files live here; ones older than EXPORT_MAX_AGE_HOURS are swept when the next export starts
+EXPORT_DIR = os.getenv('EXPORT_DIR') or os.path.join(tempfile.gettempdir(), 'internship_tracker_exports')
+EXPORT_MAX_AGE_HOURS = float(os.getenv('EXPORT_MAX_AGE_HOURS', '6'))
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+class ExportFile:
+    """A finished export on disk.
+
+    The file is deleted by discard(), or when the object is garbage collected
+    (with the session state holding it, once the session ends). Files left
+    behind by a crash are removed by sweep_exports().
+    """
+    
+    def __init__(self, path, rows, name, mime):
+        self.path = path
+        self.rows = rows
+        self.name = name
+        self.mime = mime
+        self._remove = weakref.finalize(self, _remove_file, path)
+    
+    def exists(self):
+        return os.path.exists(self.path)
+    
+    def read(self):
+        """The file's contents; meant to be called only when a download is requested"""
+        with open(self.path, 'rb') as data:
+            return data.read()
+    
+    def discard(self):
+        self._remove()
+
+def sweep_exports(max_age_hours=EXPORT_MAX_AGE_HOURS):
+    """Delete export files older than max_age_hours; returns how many were removed"""
+    cutoff = time.time() - max_age_hours * 3600
+    removed = 0
+    try:
+        entries = list(os.scandir(EXPORT_DIR))
+    except FileNotFoundError:
+        return 0
+    for entry in entries:
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                removed += 1
+        except FileNotFoundError:
+            pass
+    return removed
+
+def export_to_file(export, file_format, on_progress=None):
+    """Stream an export into a CSV or Parquet file in EXPORT_DIR, one chunk at a time.
+
+    Rows never accumulate in memory: each chunk from stream_query is written
+    and dropped before the next is fetched. on_progress(written, total) is
+    called after every chunk. Returns an ExportFile, which owns the file.
+    Raises mysql.connector.Error if the stream fails, and ImportError for
+    Parquet without pyarrow installed.
+    """
+    query, count_query, columns = EXPORTS[export]
+    extension, mime = EXPORT_FORMATS[file_format]
+    names = [name for name, _ in columns]
+    
+    if extension == 'parquet':
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        # Fixed column types, so chunks whose values happen to be all NULL still match
+        types = {'int': pa.int64(), 'str': pa.string(), 'date': pa.date32(), 'datetime': pa.timestamp('us')}
+        schema = pa.schema([(name, types[kind]) for name, kind in columns])
+    
+    count = execute_query(count_query)
+    total = count[0]['count'] if count else 0
+    
+    sweep_exports()
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    slug = export.lower().replace(' ', '_')
+    fd, path = tempfile.mkstemp(prefix=f"{slug}_", suffix=f'.{extension}', dir=EXPORT_DIR)
+    written = 0
+    try:
+        if extension == 'csv':
+            with os.fdopen(fd, 'w', newline='', encoding='utf-8') as output:
+                writer = csv.DictWriter(output, fieldnames=names)
+                writer.writeheader()
+                for chunk in stream_query(query):
+                    writer.writerows(chunk)
+                    written += len(chunk)
+                    if on_progress:
+                        on_progress(written, total)
+        else:
+            os.close(fd)
+            with pq.ParquetWriter(path, schema) as writer:
+                for chunk in stream_query(query):
+                    writer.write_table(pa.Table.from_pylist(chunk, schema=schema))
+                    written += len(chunk)
+                    if on_progress:
+                        on_progress(written, total)
+    except BaseException:
+        os.remove(path)
+        raise
+    
+    return ExportFile(path, written, f"{slug}_{datetime.now():%Y%m%d_%H%M}.{extension}", mime)
+
+# Analytics Functions
+ANALYTICS_TIMEOUT = float(os.getenv('ANALYTICS_TIMEOUT', '10'))
+
+# Independent aggregations over the trigger-maintained summary tables, keyed by result name.
+# MAX_EXECUTION_TIME stops a timed-out read on the server too (MySQL; ignored by MariaDB).
+ANALYTICS_QUERIES = {
+    # Applications by company; companies with postings but no applications count as 0, as they
+    # did before the summary tables (which only get a row once a company has an application)
+    'by_company': ("""
+        SELECT /*+ MAX_EXECUTION_TIME({timeout_ms}) */ company_name, CAST(SUM(app_count) AS SIGNED) as app_count
+        FROM (SELECT company_name, app_count, 0 as posted FROM {company_stats} s
+              UNION ALL
+              SELECT DISTINCT company_name, 0, 1 FROM {postings} p) c
+        GROUP BY company_name
+        HAVING app_count > 0 OR MAX(posted) = 1
+        ORDER BY app_count DESC
+        LIMIT 10
+    """, (JOBS_TAG, APPLICATIONS_TAG)),
+    # Application status distribution
+    'by_status': ("""
+        SELECT /*+ MAX_EXECUTION_TIME({timeout_ms}) */ status, CAST(SUM(app_count) AS SIGNED) as count
+        FROM {company_stats} s
+        GROUP BY status
+        HAVING count > 0
+    """, (APPLICATIONS_TAG,)),
+    # Timeline data
+    'timeline': ("""
+        SELECT /*+ MAX_EXECUTION_TIME({timeout_ms}) */ month, CAST(SUM(app_count) AS SIGNED) as count
+        FROM {month_stats} s
+        GROUP BY month
+        HAVING count > 0
+        ORDER BY month
+    """, (APPLICATIONS_TAG,)),
+}
+
+# Summary tables read by the analytics queries: live only, or live plus the seasons archive.py moved out
+ANALYTICS_SOURCES = {
+    False: {'company_stats': 'Application_Stats_By_Company', 'month_stats': 'Application_Stats_By_Month',
+            'postings': 'Job_Postings'},
+    True: {
+        'postings': "(SELECT company_name FROM Job_Postings UNION ALL SELECT company_name FROM Job_Postings_Archive)",
+        'company_stats': """(SELECT * FROM Application_Stats_By_Company
+                             UNION ALL SELECT * FROM Application_Stats_By_Company_Archive)""",
+        'month_stats': """(SELECT * FROM Application_Stats_By_Month
+                           UNION ALL SELECT * FROM Application_Stats_By_Month_Archive)""",
+    },
+}
+
+def iter_analytics_data(user_id, timeout=ANALYTICS_TIMEOUT, include_archived=False):
+    """Run the analytics queries concurrently and yield (name, rows) as each one finishes.
+
+    rows is None for a query that failed or ran past `timeout` seconds, so the
+    dashboard can draw every other chart regardless. With include_archived the
+    figures also count applications from archived seasons.
+    """
+    statements = {
+        name: {
+            'query': query.format(timeout_ms=int(timeout * 1000), **ANALYTICS_SOURCES[include_archived]),
+            'cache_tags': tags,
+        }
+        for name, (query, tags) in ANALYTICS_QUERIES.items()
+    }
+    yield from execute_concurrently(statements, timeout=timeout)
+
+def get_analytics_data(user_id, include_archived=False):
+    """Get analytics data for faculty/admin from the trigger-maintained summary tables"""
+    return dict(iter_analytics_data(user_id, include_archived=include_archived))
+
+# Calendar feeds (iCalendar) built from the trigger-maintained Alerts table.
+# Calendar clients poll constantly, so rendered feeds are kept longer than query results.
+# Writes in this process invalidate them by tag; writes made by another process (app.py,
+# archive.py) are caught by a cheap version query run before a cached feed is served
+CALENDAR_CACHE_TTL = float(os.getenv('CALENDAR_CACHE_TTL', '300'))
+calendar_cache = create_cache(CALENDAR_CACHE_TTL, QUERY_CACHE_MAX_ENTRIES)
+CALENDAR_PRODID = '-//College Internship Tracker//Alerts//EN'
+ALERT_EVENT_LABELS = {'deadline': 'Deadline', 'online_assessment': 'Online assessment', 'interview': 'Interview'}
+
+def _ics_text(value):
+    """Escape a value for an iCalendar TEXT property"""
+    return (str(value).replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+            .replace('\r\n', '\\n').replace('\n', '\\n'))
+
+def _ics_fold(line):
+    """Fold a content line to 75 octets per line, as RFC 5545 requires"""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line
+    parts = []
+    while encoded:
+        cut = min(len(encoded), 75 if not parts else 74)
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1  # never split a UTF-8 sequence
+        parts.append(encoded[:cut].decode('utf-8'))
+        encoded = encoded[cut:]
+    return '\r\n '.join(parts)
+
+def _render_calendar(name, events, stamp):
+    """iCalendar text for `events`: dicts with uid, date, summary and optional description, reminder_days"""
+    lines = ['BEGIN:VCALENDAR', 'VERSION:2.0', f'PRODID:{CALENDAR_PRODID}', 'CALSCALE:GREGORIAN',
+             'METHOD:PUBLISH', f'X-WR-CALNAME:{_ics_text(name)}']
+    for event in events:
+        lines += [
+            'BEGIN:VEVENT',
+            f"UID:{event['uid']}",
+            f"DTSTAMP:{stamp:%Y%m%dT%H%M%SZ}",
+            f"DTSTART;VALUE=DATE:{event['date']:%Y%m%d}",
+            f"DTEND;VALUE=DATE:{event['date'] + timedelta(days=1):%Y%m%d}",
+            f"SUMMARY:{_ics_text(event['summary'])}",
+        ]
+        if event.get('description'):
+            lines.append(f"DESCRIPTION:{_ics_text(event['description'])}")
+        if event.get('reminder_days'):
+            lines += ['BEGIN:VALARM', 'ACTION:DISPLAY', f"DESCRIPTION:{_ics_text(event['summary'])}",
+                      f"TRIGGER:-P{event['reminder_days']}D", 'END:VALARM']
+        lines.append('END:VEVENT')
+    lines.append('END:VCALENDAR')
+    return '\r\n'.join(_ics_fold(line) for line in lines) + '\r\n'
+
+# key -> (etag, last_modified) of the latest build. Untagged and not registered with
+# invalidate_cache(), so it outlives the feeds themselves; bounded like any other cache
+_calendar_versions = QueryCache(CALENDAR_CACHE_TTL * 24, QUERY_CACHE_MAX_ENTRIES)
+
+def _cached_calendar(key, tags, name, load_version, load_events):
+    """Rendered feed for `key`, from calendar_cache or built with load_events().
+
+    load_version() returns a row that changes whenever the feed's source rows
+    do, from any process; a cached feed is served only while it matches.
+    Returns {'body', 'etag', 'last_modified'} or None if a query failed.
+    last_modified only moves when a rebuild actually changes the feed.
+    """
+    version = load_version()
+    if version is None:
+        return None
+    cached = calendar_cache.get(key)
+    if cached and cached[0][0] == version:
+        return cached[0][1]
+    generation = calendar_cache.generation(tags)
+    events = load_events()
+    if events is None:
+        return None
+    
+    # DTSTAMP is left out of the ETag so an unchanged rebuild keeps the ETag clients already hold
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    etag = hashlib.sha256(repr(events).encode()).hexdigest()[:32]
+    previous = _calendar_versions.get(key)
+    last_modified = previous[0][1] if previous and previous[0][0] == etag else now
+    _calendar_versions.put(key, (), [(etag, last_modified)], ())
+    feed = {'body': _render_calendar(name, events, now), 'etag': f'"{etag}"', 'last_modified': last_modified}
+    calendar_cache.put(key, tags, [(version, feed)], generation)
+    return feed
+
+def get_student_calendar(student_id):
+    """A student's deadline, OA and interview alerts as an iCalendar feed (see _cached_calendar)"""
+    def load_version():
+        # Alerts follow their application's status and their job's dates (triggers), and
+        # archiving or deleting a posting removes the student's application with it
+        query = """
+            SELECT COUNT(*) as applications, MAX(a.last_updated) as applications_updated,
+                   MAX(j.last_updated) as jobs_updated
+            FROM Applications a
+            JOIN Job_Postings j ON j.job_id = a.job_id
+            WHERE a.student_id = %s
+        """
+        result = execute_query(query, (student_id,))
+        return result[0] if result else None
+    
+    def load_events():
+        query = """
+            SELECT al.alert_id, al.alert_type, al.alert_date, al.reminder_date, al.message,
+                   a.status, j.company_name, j.role, j.jd_link
+            FROM Alerts al
+            JOIN Applications a ON a.application_id = al.application_id
+            JOIN Job_Postings j ON j.job_id = a.job_id
+            WHERE al.student_id = %s
+            AND a.status IN ('to_apply', 'applied')
+            ORDER BY al.alert_date, al.alert_id
+        """
+        alerts = execute_query(query, (student_id,))
+        if alerts is None:
+            return None
+        return [{
+            'uid': f"alert-{alert['alert_id']}@college-internship-tracker",
+            'date': alert['alert_date'],
+            'summary': alert['message'],
+            'description': '\n'.join(filter(None, [
+                f"{ALERT_EVENT_LABELS[alert['alert_type']]} for {alert['role']} at {alert['company_name']}",
+                f"Application status: {alert['status']}",
+                alert['jd_link'],
+            ])),
+            'reminder_days': (alert['alert_date'] - alert['reminder_date']).days,
+        } for alert in alerts]
+    
+    # Only the student's own applications are in the feed; job edits reach it through their student tags
+    return _cached_calendar(('student', student_id), (student_tag(student_id),), "Internship deadlines",
+                            load_version, load_events)
+
+def get_faculty_calendar():
+    """Every posting's deadline, OA and interview dates with how many students track each, as iCalendar"""
+    def load_version():
+        # Indexed MAX() lookups; deleted and archived postings leave a tombstone
+        query = """
+            SELECT (SELECT MAX(last_updated) FROM Job_Postings) as jobs_updated,
+                   (SELECT MAX(last_updated) FROM Applications) as applications_updated,
+                   (SELECT MAX(deleted_at) FROM Deleted_Job_Postings) as jobs_deleted
+        """
+        result = execute_query(query)
+        return result[0] if result else None
+    
+    def load_events():
+        query = """
+            SELECT j.job_id, al.alert_type, al.alert_date, j.company_name, j.role, j.jd_link,
+                   COUNT(*) as students
+            FROM Alerts al
+            JOIN Applications a ON a.application_id = al.application_id
+            JOIN Job_Postings j ON j.job_id = a.job_id
+            WHERE a.status IN ('to_apply', 'applied')
+            GROUP BY j.job_id, al.alert_type, al.alert_date, j.company_name, j.role, j.jd_link
+            ORDER BY al.alert_date, j.job_id
+        """
+        events = execute_query(query)
+        if events is None:
+            return None
+        return [{
+            'uid': f"job-{event['job_id']}-{event['alert_type']}@college-internship-tracker",
+            'date': event['alert_date'],
+            'summary': f"{ALERT_EVENT_LABELS[event['alert_type']]}: {event['role']} at {event['company_name']}",
+            'description': '\n'.join(filter(None, [f"{event['students']} students tracking", event['jd_link']])),
+        } for event in events]
+    
+    return _cached_calendar(('faculty',), (JOBS_TAG, APPLICATIONS_TAG), "Internship calendar",
+                            load_version, load_events)
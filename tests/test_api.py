@@ -0,0 +1,75 @@
+from datetime import datetime, timezone
+
+import pytest
+from starlette.requests import Request
+
+import api
+
+
+def request(headers=None, query_string=b''):
+    return Request({
+        'type': 'http', 'method': 'GET', 'path': '/', 'query_string': query_string,
+        'headers': [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()],
+    })
+
+
+STUDENT = {'user_id': 7, 'role': 'student', 'name': 'Asha'}
+
+
+def test_token_round_trip():
+    token, claims = api.issue_token(STUDENT)
+    assert api.verify_token(token) == claims
+    assert claims['sub'] == 7 and claims['scope'] == 'api'
+
+
+def test_tampered_claims_are_rejected():
+    token, claims = api.issue_token(STUDENT)
+    forged, _ = api.issue_token({**STUDENT, 'role': 'admin'})
+    # Admin claims with the student token's signature
+    assert api.verify_token(f"{forged.split('.')[0]}.{token.split('.')[1]}") is None
+
+
+def test_tampered_signature_is_rejected():
+    token, _ = api.issue_token(STUDENT)
+    payload, signature = token.split('.')
+    flipped = ('A' if signature[0] != 'A' else 'B') + signature[1:]
+    assert api.verify_token(f"{payload}.{flipped}") is None
+    assert api.verify_token(payload) is None
+
+
+def test_expired_token_is_rejected(monkeypatch):
+    token, claims = api.issue_token(STUDENT, ttl=60)
+    monkeypatch.setattr(api.time, 'time', lambda: claims['exp'] + 1)
+    assert api.verify_token(token) is None
+
+
+def test_calendar_token_only_opens_the_calendar(monkeypatch):
+    monkeypatch.setattr(api, 'set_session', lambda session: None)
+    token, _ = api.issue_token(STUDENT, scope='calendar')
+    calendar = request(query_string=f'token={token}'.encode())
+    assert api.authenticate(calendar, api.STUDENT_ROLES, scopes=('api', 'calendar'))['sub'] == 7
+    with pytest.raises(api.ApiError) as error:
+        api.authenticate(request({'Authorization': f'Bearer {token}'}), api.STUDENT_ROLES)
+    assert error.value.status == 401
+
+
+def test_matching_if_none_match_answers_304():
+    data = {'deadlines': [{'job_id': 1, 'deadline_date': datetime(2026, 3, 1)}]}
+    first = api.cached_json_response(request(), data)
+    assert first.status_code == 200
+    etag = first.headers['etag']
+
+    assert api.cached_json_response(request({'If-None-Match': etag}), data).status_code == 304
+    assert api.cached_json_response(request({'If-None-Match': f'"other", W/{etag}'}), data).status_code == 304
+    assert api.cached_json_response(request({'If-None-Match': '"other"'}), data).status_code == 200
+
+
+def test_calendar_response_honours_etag_and_last_modified():
+    feed = {'body': 'BEGIN:VCALENDAR\r\nEND:VCALENDAR\r\n', 'etag': '"abc"',
+            'last_modified': datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)}
+    assert api.calendar_response(request({'If-None-Match': '"abc"'}), feed).status_code == 304
+    assert api.calendar_response(request({'If-None-Match': '"old"'}), feed).status_code == 200
+    since = 'Sun, 01 Mar 2026 12:00:00 GMT'
+    assert api.calendar_response(request({'If-Modified-Since': since}), feed).status_code == 304
+    # If-None-Match wins over If-Modified-Since
+    assert api.calendar_response(request({'If-None-Match': '"old"', 'If-Modified-Since': since}), feed).status_code == 200
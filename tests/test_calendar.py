@@ -0,0 +1,46 @@
+from datetime import date, datetime, timezone
+
+from queries import _ics_fold, _ics_text, _render_calendar
+
+
+def octets(line):
+    return len(line.encode('utf-8'))
+
+
+def test_short_lines_are_left_alone():
+    line = 'SUMMARY:' + 'x' * 67
+    assert octets(line) == 75
+    assert _ics_fold(line) == line
+
+
+def test_long_lines_fold_at_75_octets():
+    line = 'DESCRIPTION:' + 'a' * 200
+    parts = _ics_fold(line).split('\r\n')
+    assert octets(parts[0]) == 75
+    assert all(part.startswith(' ') and octets(part) <= 75 for part in parts[1:])
+    assert parts[0] + ''.join(part[1:] for part in parts[1:]) == line
+
+
+def test_folding_never_splits_a_multi_byte_character():
+    line = 'SUMMARY:' + 'é' * 40 + '日本語' * 20
+    parts = _ics_fold(line).split('\r\n')
+    assert all(octets(part) <= 75 for part in parts)  # decoding each part would fail on a split sequence
+    assert parts[0] + ''.join(part[1:] for part in parts[1:]) == line
+
+
+def test_text_escaping():
+    assert _ics_text('Intern, Backend; C:\\dev') == 'Intern\\, Backend\\; C:\\\\dev'
+    assert _ics_text('line one\r\nline two\nline three') == 'line one\\nline two\\nline three'
+
+
+def test_rendered_calendar_uses_crlf_and_all_day_events():
+    stamp = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+    body = _render_calendar('Deadlines', [{
+        'uid': 'alert-1@test', 'date': date(2026, 3, 10), 'summary': 'Apply, now', 'reminder_days': 2,
+    }], stamp)
+    lines = body.split('\r\n')
+    assert body.endswith('\r\n') and '\n' not in body.replace('\r\n', '')
+    assert 'DTSTART;VALUE=DATE:20260310' in lines
+    assert 'DTEND;VALUE=DATE:20260311' in lines
+    assert 'SUMMARY:Apply\\, now' in lines
+    assert 'TRIGGER:-P2D' in lines
@@ -0,0 +1,75 @@
+import time
+from datetime import datetime
+
+import queries
+from queries import _merge_changes
+
+CLOCK = datetime(2026, 3, 1, 12, 0)
+
+
+def clock():
+    return {'section': 'clock', 'job_id': None, 'synced_at': CLOCK}
+
+
+def changed(job_id, **values):
+    return {'section': 'changed', 'job_id': job_id, 'synced_at': None, **values}
+
+
+def deleted(job_id):
+    return {'section': 'deleted', 'job_id': job_id, 'synced_at': None}
+
+
+def snapshot(*rows):
+    return {'rows': {row['job_id']: row for row in rows}, 'synced_at': datetime(2026, 3, 1, 11, 0)}
+
+
+def test_first_load_takes_every_changed_row():
+    result = _merge_changes(None, 'job_id', [clock(), changed(1, role='Intern'), changed(2, role='Analyst')])
+    assert result['rows'] == {1: {'job_id': 1, 'role': 'Intern'}, 2: {'job_id': 2, 'role': 'Analyst'}}
+    assert result['synced_at'] == CLOCK
+    assert result['changed'] == 2
+
+
+def test_changes_replace_rows_and_tombstones_drop_them():
+    previous = snapshot({'job_id': 1, 'role': 'Intern'}, {'job_id': 2, 'role': 'Analyst'})
+    result = _merge_changes(previous, 'job_id', [clock(), changed(1, role='Senior intern'), deleted(2)])
+    assert result['rows'] == {1: {'job_id': 1, 'role': 'Senior intern'}}
+    assert result['changed'] == 2
+
+
+def test_live_row_wins_over_a_tombstone_for_the_same_id():
+    previous = snapshot({'job_id': 3, 'role': 'Old posting'})
+    # The tombstone comes after the live row in the result, but the live table is the truth
+    result = _merge_changes(previous, 'job_id', [clock(), changed(3, role='New posting'), deleted(3)])
+    assert result['rows'] == {3: {'job_id': 3, 'role': 'New posting'}}
+
+
+def test_application_snapshots_drop_rows_of_deleted_postings():
+    previous = {'rows': {10: {'application_id': 10, 'job_id': 1}, 11: {'application_id': 11, 'job_id': 2}},
+                'synced_at': datetime(2026, 3, 1, 11, 0)}
+    result = _merge_changes(previous, 'application_id', [clock(), deleted(1)])
+    assert result['rows'] == {11: {'application_id': 11, 'job_id': 2}}
+
+
+def test_snapshot_passed_in_is_not_modified():
+    previous = snapshot({'job_id': 1, 'role': 'Intern'})
+    _merge_changes(previous, 'job_id', [clock(), deleted(1)])
+    assert previous['rows'] == {1: {'job_id': 1, 'role': 'Intern'}}
+
+
+def test_snapshot_older_than_the_tombstone_window_is_reloaded_in_full(monkeypatch):
+    queries_run = []
+
+    def execute_query(query, params=None):
+        queries_run.append(query)
+        return [clock(), changed(2, role='Analyst')]
+    monkeypatch.setattr(queries, 'execute_query', execute_query)
+    monkeypatch.setattr(queries, 'read_staleness_bound', lambda: 0)
+
+    recent = {**snapshot({'job_id': 1, 'role': 'Intern'}), 'loaded_at': time.monotonic()}
+    assert set(queries.sync_all_jobs(recent)['rows']) == {1, 2}
+    assert 'Deleted_Job_Postings' in queries_run[-1]
+
+    stale = {**recent, 'loaded_at': time.monotonic() - queries.SYNC_MAX_AGE_HOURS * 3600}
+    assert set(queries.sync_all_jobs(stale)['rows']) == {2}
+    assert 'Deleted_Job_Postings' not in queries_run[-1]
@@ -0,0 +1,25 @@
+from db import fingerprint
+
+
+def test_in_lists_of_any_length_collapse():
+    short = fingerprint("SELECT * FROM Applications WHERE job_id IN (%s, %s)")
+    long = fingerprint("SELECT * FROM Applications WHERE job_id IN (%s, %s, %s, %s, %s)")
+    assert short == long == "SELECT * FROM Applications WHERE job_id IN (?, ...)"
+
+
+def test_literals_and_whitespace_are_normalized():
+    assert fingerprint("SELECT name\n  FROM Users WHERE email = 'a@b.edu' AND user_id = 42") == (
+        "SELECT name FROM Users WHERE email = ? AND user_id = ?"
+    )
+
+
+def test_multi_row_values_collapse_to_one_row():
+    one = fingerprint("INSERT INTO Alerts (student_id, message) VALUES (%s, %s)")
+    many = fingerprint("INSERT INTO Alerts (student_id, message) VALUES (%s, %s), (%s, %s), (%s, %s)")
+    assert one == "INSERT INTO Alerts (student_id, message) VALUES (?, ...)"
+    assert many == "INSERT INTO Alerts (student_id, message) VALUES (?, ...), ..."
+
+
+def test_rows_with_nested_calls_collapse():
+    statement = "INSERT INTO Notes (application_id, created_at) VALUES (%s, NOW()), (%s, NOW()), (%s, NOW())"
+    assert fingerprint(statement) == "INSERT INTO Notes (application_id, created_at) VALUES (?, NOW()), ..."
@@ -0,0 +1,64 @@
+import db
+from db import QueryCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(db.time, 'monotonic', clock)
+    cache = QueryCache(ttl=30, max_entries=10)
+    cache.put('jobs', ('jobs',), [{'job_id': 1}], cache.generation(('jobs',)))
+
+    clock.now += 29
+    assert cache.get('jobs') == [{'job_id': 1}]
+    clock.now += 2
+    assert cache.get('jobs') is None
+    assert cache.stats()['entries'] == 0
+
+
+def test_least_recently_used_entry_is_evicted_first():
+    cache = QueryCache(ttl=60, max_entries=2)
+    cache.put('a', (), [1], ())
+    cache.put('b', (), [2], ())
+    cache.get('a')
+    cache.put('c', (), [3], ())
+
+    assert cache.get('b') is None
+    assert cache.get('a') == [1]
+    assert cache.get('c') == [3]
+    assert cache.stats()['evictions'] == 1
+
+
+def test_invalidation_drops_only_entries_with_the_tag():
+    cache = QueryCache(ttl=60, max_entries=10)
+    cache.put('feed', ('jobs', 'student:1'), [1], cache.generation(('jobs', 'student:1')))
+    cache.put('stats', ('student:2',), [2], cache.generation(('student:2',)))
+
+    cache.invalidate('student:1')
+    assert cache.get('feed') is None
+    assert cache.get('stats') == [2]
+
+
+def test_read_started_before_an_invalidation_is_not_stored():
+    cache = QueryCache(ttl=60, max_entries=10)
+    generation = cache.generation(('jobs',))
+    cache.invalidate('jobs')  # a write lands while the read is in flight
+    cache.put('feed', ('jobs',), [{'job_id': 1}], generation)
+    assert cache.get('feed') is None
+
+    cache.put('feed', ('jobs',), [{'job_id': 2}], cache.generation(('jobs',)))
+    assert cache.get('feed') == [{'job_id': 2}]
+
+
+def test_returned_rows_are_a_copy():
+    cache = QueryCache(ttl=60, max_entries=10)
+    cache.put('feed', (), [1, 2], ())
+    cache.get('feed').append(3)
+    assert cache.get('feed') == [1, 2]
@@ -0,0 +1,24 @@
+import pytest
+
+import queries
+
+
+@pytest.mark.parametrize('text', [
+    '+python -unpaid "data science" intern*',
+    'e-commerce',
+    '(+backend -php) <remote >onsite',
+    '"c++ (embedded)"',
+])
+def test_well_formed_boolean_searches_pass(text):
+    assert queries.boolean_search_error(text) is None
+
+
+@pytest.mark.parametrize('text, problem', [
+    ('"data science', 'phrase is not closed'),
+    ('(python intern', '( is not closed'),
+    ('python)', ') has no matching ('),
+    ('python +', 'has no word after it'),
+    ('(python -)', 'has no word after it'),
+])
+def test_malformed_boolean_searches_are_caught(text, problem):
+    assert problem in queries.boolean_search_error(text)
@@ -0,0 +1,72 @@
+from datetime import date
+
+import queries
+
+COLUMNS = ['section', 'job_id', 'company_name', 'role', 'description', 'jd_link', 'deadline_date', 'oa_date',
+           'interview_date', 'posted_by', 'application_id', 'app_status', 'applied_on', 'latest_note',
+           'days_until', 'metric']
+
+
+def row(section, **values):
+    return {column: values.get(column) for column in COLUMNS} | {'section': section}
+
+
+def feed(job_id, deadline, **values):
+    return row('feed', job_id=job_id, company_name=f'Company {job_id}', role='Intern',
+               deadline_date=deadline, latest_note='', **values)
+
+
+def stub_query(monkeypatch, rows):
+    calls = []
+
+    def execute_query(query, params=None, cache_tags=None):
+        calls.append(params)
+        return rows
+    monkeypatch.setattr(queries, 'execute_query', execute_query)
+    return calls
+
+
+def test_sections_are_split_back_into_stats_deadlines_and_feed(monkeypatch):
+    calls = stub_query(monkeypatch, [
+        feed(2, date(2026, 3, 5), application_id=20, app_status='applied'),
+        feed(1, date(2026, 3, 1)),
+        row('deadline', job_id=2, company_name='Company 2', role='Intern', deadline_date=date(2026, 3, 5),
+            application_id=20, app_status='applied', days_until=4),
+        row('status', app_status='applied', metric=3),
+        row('status', app_status='done', metric=1),
+        row('open_jobs', metric=12),
+    ])
+    dashboard = queries.load_student_dashboard(5, limit=10)
+
+    assert len(calls) == 1
+    assert dashboard['stats'] == {'total_jobs': 12, 'applied': 3, 'done': 1, 'to_apply': 0}
+    assert dashboard['deadlines'] == [{
+        'application_id': 20, 'job_id': 2, 'company_name': 'Company 2', 'role': 'Intern',
+        'deadline_date': date(2026, 3, 5), 'oa_date': None, 'interview_date': None, 'status': 'applied',
+        'days_until': 4,
+    }]
+    # UNION ALL does not keep each branch's ORDER BY, so the feed is re-sorted
+    assert [job['job_id'] for job in dashboard['jobs']] == [1, 2]
+    assert 'section' not in dashboard['jobs'][0] and 'metric' not in dashboard['jobs'][0]
+    assert dashboard['next_cursor'] is None
+
+
+def test_look_ahead_row_becomes_the_next_cursor(monkeypatch):
+    stub_query(monkeypatch, [
+        feed(1, date(2026, 3, 1)), feed(2, date(2026, 3, 2)), feed(3, date(2026, 3, 3)), row('open_jobs', metric=3),
+    ])
+    dashboard = queries.load_student_dashboard(5, limit=2)
+    assert [job['job_id'] for job in dashboard['jobs']] == [1, 2]
+    assert dashboard['next_cursor'] == (date(2026, 3, 2), 2)
+
+
+def test_student_without_applications_gets_zero_counts(monkeypatch):
+    stub_query(monkeypatch, [row('open_jobs', metric=0)])
+    dashboard = queries.load_student_dashboard(5)
+    assert dashboard == {'stats': {'total_jobs': 0, 'applied': 0, 'done': 0, 'to_apply': 0},
+                         'deadlines': [], 'jobs': [], 'next_cursor': None}
+
+
+def test_failed_query_returns_none(monkeypatch):
+    stub_query(monkeypatch, None)
+    assert queries.load_student_dashboard(5) is None
@@ -0,0 +1,34 @@
+from datetime import date
+
+import pandas as pd
+
+import queries
+
+
+def import_frame(rows):
+    columns = ['company_name', 'role', 'description', 'deadline_date', 'oa_date', 'interview_date']
+    return pd.DataFrame(rows, columns=columns, dtype=str)
+
+
+def test_invalid_row_does_not_hide_a_later_valid_duplicate(monkeypatch):
+    monkeypatch.setattr(queries, 'execute_query', lambda query, params=None: [])
+    df = import_frame([
+        ['Acme', 'Intern', 'd', '2026-03-10', '2026-03-01', '2026-03-20'],  # deadline after OA
+        ['Acme', 'Intern', 'd', '2026-03-10', '2026-03-15', '2026-03-20'],
+        ['Acme', 'Intern', 'd', '2026-03-10', '2026-03-15', '2026-03-20'],
+    ])
+    valid_rows, errors = queries.validate_job_import(df)
+    assert list(valid_rows.index) == [1]
+    assert errors.to_dict('records') == [
+        {'row': 2, 'error': "Deadline is after the OA date"},
+        {'row': 4, 'error': "Duplicate of an earlier row in the file"},
+    ]
+
+
+def test_existing_posting_matches_regardless_of_case(monkeypatch):
+    existing = [{'company_name': 'ACME', 'role': 'intern', 'deadline_date': date(2026, 3, 10)}]
+    monkeypatch.setattr(queries, 'execute_query', lambda query, params=None: existing)
+    df = import_frame([['Acme', 'Intern', 'd', '2026-03-10', '2026-03-15', '2026-03-20']])
+    valid_rows, errors = queries.validate_job_import(df)
+    assert valid_rows.empty
+    assert errors['error'].tolist() == ["Job posting already exists"]